@@ -0,0 +1,48 @@
+"""
+Compares correlation matrices answered by `CorrelationStats` with `DataFrame.corr()`
+on period windows of wide monthly frames, as when dragging the playground's period slider.
+
+Usage: python benchmarks/correlation_benchmark.py
+"""
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.utils.correlation import CorrelationStats
+
+
+def gen_monthly_df(num_months, num_columns, nan_ratio=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(num_months, num_columns)),
+                      columns=[f'column {i}' for i in range(num_columns)],
+                      index=pd.date_range('1700-01-01', periods=num_months, freq='MS', name='period'))
+    df[rng.random(df.shape) < nan_ratio] = np.nan
+    return df
+
+
+def gen_windows(df, num_windows, seed=0):
+    rng = np.random.default_rng(seed)
+    windows = []
+    for _ in range(num_windows):
+        start, end = sorted(rng.choice(len(df), 2, replace=False))
+        windows.append((df.index[start], df.index[end]))
+    return windows
+
+
+if __name__ == "__main__":
+    num_windows = 20
+    for num_months, num_columns in [(360, 10), (1200, 20), (3600, 30), (6000, 40)]:
+        df = gen_monthly_df(num_months, num_columns)
+        windows = gen_windows(df, num_windows)
+        build_time = timeit.timeit(lambda: CorrelationStats(df), number=1)
+        stats = CorrelationStats(df)
+        for start, end in windows:
+            pd.testing.assert_frame_equal(df.loc[start:end].corr(), stats.corr_between(start, end), check_names=False)
+        corr_time = timeit.timeit(lambda: [df.loc[start:end].corr() for start, end in windows], number=1) / num_windows
+        stats_time = timeit.timeit(lambda: [stats.corr_between(start, end) for start, end in windows], number=1) / num_windows
+        print(f"{num_months:>5} months x {num_columns:>2} columns | build {build_time * 1000:>8.2f}ms"
+              f" | corr {corr_time * 1000:>8.2f}ms | prefix sums {stats_time * 1000:>6.2f}ms | {corr_time / stats_time:>6.1f}x")
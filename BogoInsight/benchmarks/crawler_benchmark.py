@@ -0,0 +1,168 @@
+"""
+Times `crawl()` and `process()` of each crawler on recorded responses, without network access.
+Results are appended to `benchmarks/results/crawler_benchmark.jsonl`, and compared with the previous run
+so that regressions show up.
+
+Usage:
+    python benchmarks/crawler_benchmark.py --record          # record live responses first
+    python benchmarks/crawler_benchmark.py [--only HiborCrawler ...] [--repeat 3] [--check]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.crawlers.fetch_service import DEFAULT_FIXTURES_DIR, MissingFixture, fetch_service
+from BogoInsight.crawlers.refresh import discover_crawlers
+from BogoInsight.crawlers.rvd_workbook_reader import rvd_workbook_reader
+from BogoInsight.utils.logger import logger
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), 'results', 'crawler_benchmark.jsonl')
+# slowdown against the previous run reported as a regression, ignoring differences below MIN_REGRESSION_TIME seconds
+REGRESSION_THRESHOLD = 0.2
+MIN_REGRESSION_TIME = 0.005
+
+
+def record_responses(crawler_classes):
+    """
+    Runs `crawl()` of each crawler against the live sources, saving their responses as fixtures.
+    """
+    fetch_service.mode = 'record'
+    fetch_service.clear()
+    for crawler_cls in crawler_classes:
+        try:
+            crawler_cls().crawl()
+            logger.info(f"Recorded responses of {crawler_cls.__name__}.")
+        except Exception as e:
+            logger.error(f"Failed to record responses of {crawler_cls.__name__}: {e}")
+    fetch_service.clear()
+
+
+def benchmark_crawler(crawler_cls, repeat, data_dir):
+    """
+    Returns the best crawl and process times of a crawler over `repeat` runs on recorded responses.
+    """
+    result = {'status': 'success', 'crawl_time': None, 'process_time': None, 'rows': None, 'error': None}
+    try:
+        for _ in range(repeat):
+            # responses are read from the fixtures and parsed on each run, not kept from the previous one
+            fetch_service.clear()
+            rvd_workbook_reader.clear()
+            crawler = crawler_cls()
+            crawler.data_dir = data_dir
+            start = time.perf_counter()
+            crawler.crawl()
+            crawl_time = time.perf_counter() - start
+            start = time.perf_counter()
+            crawler.process()
+            process_time = time.perf_counter() - start
+            result['crawl_time'] = min(crawl_time, result['crawl_time'] or crawl_time)
+            result['process_time'] = min(process_time, result['process_time'] or process_time)
+        result['rows'] = len(crawler.processed_data) if crawler.processed_data is not None else None
+    except MissingFixture as e:
+        result['status'] = 'missing'
+        result['error'] = str(e)
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = repr(e)
+    return result
+
+
+def load_previous_run(results_file=RESULTS_FILE):
+    if not os.path.exists(results_file):
+        return None
+    with open(results_file, 'r') as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def save_run(run, results_file=RESULTS_FILE):
+    os.makedirs(os.path.dirname(results_file), exist_ok=True)
+    with open(results_file, 'a') as f:
+        f.write(json.dumps(run) + '\n')
+
+
+def find_regressions(results, previous_results):
+    """
+    Returns the names of crawlers whose total time grew by more than `REGRESSION_THRESHOLD` since the previous run.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = previous_results.get(name)
+        if result['status'] != 'success' or not previous or previous['status'] != 'success':
+            continue
+        total = result['crawl_time'] + result['process_time']
+        previous_total = previous['crawl_time'] + previous['process_time']
+        if total - previous_total > max(previous_total * REGRESSION_THRESHOLD, MIN_REGRESSION_TIME):
+            regressions.append(name)
+    return regressions
+
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, previous_results, regressions):
+    for name, result in results.items():
+        if result['status'] != 'success':
+            print(f"[{result['status']:>7}] {name:<32} {result['error']}")
+            continue
+        line = (f"[{result['status']:>7}] {name:<32} crawl {result['crawl_time'] * 1000:>9.1f}ms"
+                f" | process {result['process_time'] * 1000:>9.1f}ms | {result['rows']} rows")
+        previous = previous_results.get(name)
+        if previous and previous['status'] == 'success':
+            previous_total = previous['crawl_time'] + previous['process_time']
+            change = (result['crawl_time'] + result['process_time']) / previous_total - 1 if previous_total else 0
+            line += f" | {change:+.0%} vs previous" + (' REGRESSION' if name in regressions else '')
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark crawlers on recorded responses.')
+    parser.add_argument('--only', nargs='*', help='crawler class names to run, e.g. HiborCrawler')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each crawler, the best is kept')
+    parser.add_argument('--record', action='store_true', help='record live responses before benchmarking')
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR, help='directory of the recorded responses')
+    parser.add_argument('--results-file', default=RESULTS_FILE, help='file the results are appended to')
+    parser.add_argument('--no-save', action='store_true', help="don't append the results")
+    parser.add_argument('--check', action='store_true', help='exit with an error if any crawler regressed')
+    args = parser.parse_args()
+
+    crawler_classes = discover_crawlers()
+    if args.only:
+        crawler_classes = [cls for cls in crawler_classes if cls.__name__ in args.only]
+
+    fetch_service.fixtures_dir = args.fixtures_dir
+    if args.record:
+        record_responses(crawler_classes)
+    fetch_service.mode = 'replay'
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        results = {cls.__name__: benchmark_crawler(cls, args.repeat, data_dir) for cls in crawler_classes}
+
+    previous_run = load_previous_run(args.results_file)
+    previous_results = previous_run['results'] if previous_run else {}
+    regressions = find_regressions(results, previous_results)
+    print_results(results, previous_results, regressions)
+
+    if not args.no_save:
+        save_run({
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': get_commit(),
+            'python': platform.python_version(),
+            'repeat': args.repeat,
+            'results': results,
+        }, args.results_file)
+    if args.check and regressions:
+        sys.exit(f"Regressions in {', '.join(regressions)}")
@@ -0,0 +1,56 @@
+"""
+Compares the H plan mortgage rate computed by the derived metric engine
+with the previous row-wise `apply`, on long monthly series.
+
+Usage: python benchmarks/derived_metrics_benchmark.py
+"""
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.pipelines.hk_house_price_panel import PANEL_METRICS
+from BogoInsight.utils.derived_metrics import compute_metrics
+
+BLR_COLUMN = 'best lending rate (% p.a.)'
+HIBOR_COLUMN = 'HIBOR 1M (% p.a.)'
+H_PLAN_COLUMN = 'H plan mortgage rate (% p.a.)'
+
+# the metric the panel computes, so that the benchmark follows its definition
+H_PLAN_METRICS = [metric for metric in PANEL_METRICS if metric['name'] == H_PLAN_COLUMN]
+
+
+def gen_monthly_df(num_months, nan_ratio=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        BLR_COLUMN: rng.uniform(5, 10, num_months),
+        HIBOR_COLUMN: rng.uniform(0, 6, num_months),
+    }, index=pd.date_range('1700-01-01', periods=num_months, freq='MS', name='period'))
+    # sources cover different time ranges, leaving gaps after joining
+    for column in df.columns:
+        df.loc[rng.random(num_months) < nan_ratio, column] = np.nan
+    return df
+
+
+def h_plan_by_apply(df):
+    return df[[BLR_COLUMN, HIBOR_COLUMN]].apply(
+        lambda x: min(x[BLR_COLUMN] - 1.75, x[HIBOR_COLUMN] + 1.3) if pd.notnull(x[BLR_COLUMN]) and pd.notnull(x[HIBOR_COLUMN]) else np.nan,
+        axis=1)
+
+
+def h_plan_by_engine(df):
+    return compute_metrics(df, H_PLAN_METRICS)[H_PLAN_COLUMN]
+
+
+if __name__ == "__main__":
+    for num_months in [360, 1200, 3600, 6000]:
+        df = gen_monthly_df(num_months)
+        pd.testing.assert_series_equal(h_plan_by_apply(df), h_plan_by_engine(df), check_names=False)
+        number = max(1, 6000 // num_months)
+        apply_time = timeit.timeit(lambda: h_plan_by_apply(df), number=number) / number
+        engine_time = timeit.timeit(lambda: h_plan_by_engine(df), number=number) / number
+        print(f"{num_months:>7} months | apply {apply_time * 1000:>10.2f}ms | engine {engine_time * 1000:>8.2f}ms"
+              f" | {apply_time / engine_time:>7.1f}x")
@@ -0,0 +1,155 @@
+"""
+Compares the scoped lxml parsing of `crawlers/html_parser.py` with parsing whole pages
+with BeautifulSoup's `html.parser` and reading tables with `pd.read_html(str(table))`,
+on saved copies of the Wikipedia pages of the NVIDIA GPU, LLM and football knockout crawlers.
+
+Usage:
+    python benchmarks/html_parser_benchmark.py --save   # download the pages into benchmarks/fixtures
+    python benchmarks/html_parser_benchmark.py
+"""
+import argparse
+import os
+import sys
+import timeit
+from io import StringIO
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.crawlers.html_parser import find_section_table, get_section_html, parse_section, parse_soup, read_table
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+GPU_SECTIONS = ['GeForce_10_series', 'Volta_series', 'RTX_20_series', 'RTX_30_series', 'RTX_40_series', 'Tesla']
+LLM_SECTIONS = ['List']
+KNOCKOUT_SECTIONS = ['Knockout_stage', 'Knockout_phase']
+
+
+def get_fixtures():
+    """
+    Returns the pages to benchmark, as dicts of `file`, `url`, and `tables` (ids of sections to read a table from)
+    or `knockout` for football pages.
+    """
+    # imported here, only needed to save the pages
+    from BogoInsight.crawlers.football_knockout_crawler import FootballKnockoutCrawler
+    from BogoInsight.crawlers.llm_spec_crawler import LLMSpecsCrawler
+    from BogoInsight.crawlers.nvidia_gpu_spec_crawler import NvidiaGPUSpecsCrawler
+
+    fixtures = [
+        {'file': 'nvidia_gpu_specs.html', 'url': NvidiaGPUSpecsCrawler.URL, 'tables': GPU_SECTIONS},
+        {'file': 'llm_specs.html', 'url': LLMSpecsCrawler.URL, 'tables': LLM_SECTIONS},
+    ]
+    for tournament_data in FootballKnockoutCrawler.TOURNAMENT_CONFIG.values():
+        for game in tournament_data['games']:
+            fixtures.append({'file': f"football_{game['data_url'].rsplit('/', 1)[-1]}.html", 'url': game['data_url'], 'knockout': True})
+    return fixtures
+
+
+def save_fixtures(fixtures_dir):
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for fixture in get_fixtures():
+        r = requests.get(fixture['url'], timeout=30)
+        r.raise_for_status()
+        with open(os.path.join(fixtures_dir, fixture['file']), 'w', encoding='utf-8') as f:
+            f.write(r.text)
+        print(f"Saved {fixture['url']} to {fixture['file']}")
+
+
+def _get_heading_block(heading):
+    # the heading itself, or its wrapper in newer MediaWiki markup
+    if heading.name == 'span' or 'mw-heading' in heading.parent.get('class', []):
+        return heading.parent
+    return heading
+
+
+def _get_knockout_boxes(heading_block):
+    boxes = []
+    for sibling in heading_block.find_next_siblings():
+        if 'mw-heading2' in sibling.get('class', []) or sibling.name == 'h2':
+            break
+        if sibling.get('class') == ['footballbox']:
+            boxes.append(sibling.get_text(' ', strip=True))
+    return boxes
+
+
+def _parse_page_before(page_html):
+    soup = BeautifulSoup(page_html, 'html.parser')
+    for sup in soup.find_all('sup'):
+        sup.extract()
+    return soup
+
+
+def read_tables_before(page_html, section_ids):
+    soup = _parse_page_before(page_html)
+    tables = []
+    for section_id in section_ids:
+        table_html = _get_heading_block(soup.find(id=section_id)).find_next_sibling('table')
+        tables.append(pd.read_html(StringIO(str(table_html)))[0])
+    return tables
+
+
+def read_tables_after(page_html, section_ids):
+    return [read_table(find_section_table(parse_section(page_html, section_id), section_id)) for section_id in section_ids]
+
+
+def read_knockout_before(page_html):
+    soup = _parse_page_before(page_html)
+    heading = soup.find('h2', {'id': KNOCKOUT_SECTIONS[0]}) or soup.find('h2', {'id': KNOCKOUT_SECTIONS[1]})
+    return _get_knockout_boxes(_get_heading_block(heading))
+
+
+def read_knockout_after(page_html):
+    soup = parse_soup(get_section_html(page_html, KNOCKOUT_SECTIONS[0]) or get_section_html(page_html, KNOCKOUT_SECTIONS[1]))
+    heading = soup.find('h2', {'id': KNOCKOUT_SECTIONS[0]}) or soup.find('h2', {'id': KNOCKOUT_SECTIONS[1]})
+    return _get_knockout_boxes(_get_heading_block(heading))
+
+
+def benchmark_page(page_html, section_ids=None, number=3):
+    """
+    Checks that both ways give the same result, and returns their average times in seconds.
+    """
+    if section_ids:
+        before = lambda: read_tables_before(page_html, section_ids)
+        after = lambda: read_tables_after(page_html, section_ids)
+        for expected, result in zip(before(), after()):
+            pd.testing.assert_frame_equal(expected, result)
+    else:
+        before = lambda: read_knockout_before(page_html)
+        after = lambda: read_knockout_after(page_html)
+        assert before() == after()
+    return timeit.timeit(before, number=number) / number, timeit.timeit(after, number=number) / number
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark HTML parsing of the Wikipedia crawlers.')
+    parser.add_argument('--save', action='store_true', help='download the pages before benchmarking')
+    parser.add_argument('--fixtures-dir', default=FIXTURES_DIR, help='directory of the saved pages')
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.fixtures_dir)
+    if not os.path.isdir(args.fixtures_dir):
+        sys.exit(f"No saved pages in {args.fixtures_dir}, run with --save first.")
+
+    total_before = total_after = 0
+    for file in sorted(os.listdir(args.fixtures_dir)):
+        if not file.endswith('.html'):
+            continue
+        with open(os.path.join(args.fixtures_dir, file), 'r', encoding='utf-8') as f:
+            page_html = f.read()
+        if file.startswith('nvidia_gpu_specs'):
+            section_ids = GPU_SECTIONS
+        elif file.startswith('llm_specs'):
+            section_ids = LLM_SECTIONS
+        else:
+            section_ids = None
+        before_time, after_time = benchmark_page(page_html, section_ids)
+        total_before += before_time
+        total_after += after_time
+        print(f"{file:<36} {len(page_html) / 1024:>7.0f}KB | before {before_time * 1000:>8.1f}ms"
+              f" | after {after_time * 1000:>7.1f}ms | {before_time / after_time:>5.1f}x")
+    if total_after:
+        print(f"{'total':<36} {'':>9} | before {total_before * 1000:>8.1f}ms"
+              f" | after {total_after * 1000:>7.1f}ms | {total_before / total_after:>5.1f}x")
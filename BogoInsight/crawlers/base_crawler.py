@@ -1,5 +1,21 @@
 import datetime
+import json
 import os
+import pandas as pd
+
+from BogoInsight.crawlers.fetch_service import fetch_service
+from BogoInsight.crawlers.network_policy import DEFAULT_POLICY
+from BogoInsight.utils.catalog import record_export
+from BogoInsight.utils.logger import logger
+
+# default export directory, i.e. BogoInsight/data
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data'))
+
+
+class SourceUnchanged(Exception):
+    """
+    Raised by `crawl()` when the source has not changed since the latest export.
+    """
 
 
 class BaseCrawler:
@@ -7,6 +23,9 @@ class BaseCrawler:
     Base class for all crawlers.
     """
 
+    # timeouts, retries and deadline of the crawler's network calls, see `network_policy`
+    NETWORK_POLICY = DEFAULT_POLICY
+
     def __init__(self, topic: str, desc: str, tags: list, source_desc: str):
         self.topic = topic
         self.desc = desc
@@ -15,6 +34,16 @@ class BaseCrawler:
         
         self.raw_data = None
         self.processed_data = None
+        
+        self.data_dir = DATA_DIR
+        # skip crawling when the source is unchanged since the latest export
+        self.skip_unchanged = False
+        # only crawl data newer than the latest export, for crawlers that support it
+        self.incremental = False
+        # deadline of the network calls of the current crawl, see `start_deadline()`
+        self.deadline = None
+        # validators of the conditional responses fetched, by URL, saved with the export made from them
+        self._validators = {}
 
     def crawl(self):
         """
@@ -37,6 +66,117 @@ class BaseCrawler:
             os.makedirs(os.path.dirname(path))
         self.processed_data.to_csv(path)
     
+    def export_parquet(self, path: str):
+        """
+        Exports the processed data to a Parquet file, preserving dtypes and the index.
+        """
+        assert self.processed_data is not None, "No data to export."
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        df = self.processed_data.copy()
+        # columns mixing strings and numbers can't be stored as a single type,
+        # keep them as strings, the same as they would be read back from CSV
+        for col in df.columns[df.dtypes == object]:
+            if pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        df.to_parquet(path)
+    
+    def export(self, path: str):
+        """
+        Exports the processed data to a CSV file, plus a Parquet file next to it for faster typed loading.
+        The Parquet file is skipped if no Parquet engine is installed.
+        The validators of the conditional responses fetched are saved next to them,
+        and the export is then recorded in the data catalog.
+        """
+        self.export_csv(path)
+        try:
+            self.export_parquet(f'{os.path.splitext(path)[0]}.parquet')
+        except ImportError as e:
+            logger.warning(f"Skipped Parquet export for {self.topic}: {e}")
+        self._save_validators(path)
+        try:
+            record_export(path, self.processed_data)
+        except Exception as e:
+            logger.warning(f"Failed to record {self.topic} in the data catalog: {e}")
+    
+    def start_deadline(self, limit=None):
+        """
+        Starts the deadline of the network calls of a crawl, from the `NETWORK_POLICY`,
+        and no later than the `limit` Deadline, e.g. of a whole refresh.
+        """
+        self.deadline = self.NETWORK_POLICY.start_deadline(limit)
+    
+    def fetch(self, url, method='GET', **kwargs):
+        """
+        Fetches a URL through the shared fetch service, under the crawler's `NETWORK_POLICY`.
+        Identical requests within a refresh run are only sent once.
+        """
+        r = fetch_service.fetch(url, method=method, policy=self.NETWORK_POLICY, deadline=self.deadline, **kwargs)
+        if getattr(r, 'validator', None):
+            self._validators[r.url] = r.validator
+        return r
+    
+    def fetch_call(self, name, func, *args, **kwargs):
+        """
+        Calls a source not fetched over plain HTTP, e.g. a gradio client, through the shared fetch service,
+        so that it's recorded and replayed the same as fetches, under the crawler's `NETWORK_POLICY`.
+        """
+        return fetch_service.call(name, func, *args, policy=self.NETWORK_POLICY, deadline=self.deadline, **kwargs)
+    
+    def _check_unchanged(self, *responses):
+        """
+        Raises `SourceUnchanged` if skipping is enabled, all responses are 304s served from the HTTP cache,
+        and the latest export was made from the same validators, so that a source whose previous
+        crawl failed after its download is still exported.
+        """
+        if not self.skip_unchanged or not responses:
+            return
+        if not all(getattr(r, 'not_modified', False) for r in responses):
+            return
+        latest_path = self._get_latest_export_path()
+        if latest_path is None:
+            return
+        exported_validators = self._load_validators(latest_path)
+        if all(exported_validators.get(r.url) == r.validator for r in responses):
+            logger.info(f"Source unchanged for {self.topic}, skipping.")
+            raise SourceUnchanged(self.topic)
+    
+    @staticmethod
+    def _get_validators_path(path):
+        return f'{os.path.splitext(path)[0]}.validators.json'
+    
+    def _save_validators(self, path):
+        validators_path = self._get_validators_path(path)
+        if not self._validators:
+            # don't leave those of an earlier export to the same path
+            if os.path.exists(validators_path):
+                os.remove(validators_path)
+            return
+        with open(validators_path, 'w') as f:
+            json.dump(self._validators, f)
+    
+    def _load_validators(self, path):
+        """
+        Returns the validators saved with the export at `path`, or an empty dict if there are none.
+        """
+        try:
+            with open(self._get_validators_path(path), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _get_latest_export_path(self):
+        """
+        Returns the path of the latest exported version, or None if there is none.
+        """
+        export_dir = os.path.join(self.data_dir, os.path.dirname(self._gen_default_export_name()))
+        if not os.path.isdir(export_dir):
+            return None
+        files = [file for file in os.listdir(export_dir) if file.endswith('.csv')]
+        if not files:
+            return None
+        return os.path.join(export_dir, max(files))
+    
     def _handle_crawl_failure(self, req):
         """
         Handles the failure of a request.
@@ -0,0 +1,146 @@
+"""
+Client of the Census and Statistics Department (C&SD) web table API.
+
+Queries are sent through the shared fetch service, rate limited across all crawlers and retried under
+the caller's network policy, and many of them can be sent concurrently with `query_many()`. The `dataSet` of a response is parsed
+column by column into typed arrays, i.e. a numeric `figure` and a datetime `period`, ready to be pivoted.
+"""
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from BogoInsight.crawlers.fetch_service import fetch_service
+
+URL = "https://www.censtatd.gov.hk/api/post.php"
+DEFAULT_MAX_WORKERS = 4
+# requests per second sent to the API, shared by all queries
+DEFAULT_RATE_LIMIT = 4
+# formats of periods by their length, i.e. years of yearly figures and months of the others
+PERIOD_FORMATS = {4: '%Y', 6: '%Y%m'}
+
+
+class CenstatdError(Exception):
+    """
+    Raised when a query fails after all retries of its policy, or its response has no `dataSet`.
+    """
+
+
+class RateLimiter:
+    """
+    Spaces out calls of `wait()` from all threads by at least 1 / `rate` seconds.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self._next_time = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _get_columns(records):
+    """
+    Returns the keys of the records and the values of each key, as tuples.
+    Missing values are None, the same as `pd.DataFrame(records)`.
+    """
+    keys = list(records[0])
+    if len(keys) > 1 and all(len(record) == len(keys) for record in records):
+        try:
+            # fast path, all records have the same keys
+            return keys, list(zip(*map(itemgetter(*keys), records)))
+        except KeyError:
+            pass
+    keys = list(dict.fromkeys(itertools.chain.from_iterable(records)))
+    return keys, [tuple(record.get(key) for record in records) for key in keys]
+
+def _parse_figures(values):
+    figures = np.array(values)
+    if figures.dtype.kind not in 'iuf':
+        # missing or textual figures, e.g. '' or None
+        figures = pd.to_numeric(np.array(values, dtype=object), errors='coerce')
+    return figures
+
+def _parse_periods(values):
+    # periods repeat for every series, only parse each distinct one
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    uniques = pd.Index(uniques, dtype=object)
+    periods = pd.Series(pd.NaT, index=range(len(uniques)), dtype='datetime64[ns]')
+    lengths = uniques.str.len()
+    for length in lengths.unique():
+        mask = lengths == length
+        periods[mask] = pd.to_datetime(uniques[mask], format=PERIOD_FORMATS.get(length, '%Y%m'))
+    return pd.DatetimeIndex(periods).take(codes, allow_fill=True, fill_value=pd.NaT)
+
+def parse_dataset(records):
+    """
+    Parses the `dataSet` records of a response into a DataFrame with a column per key,
+    `figure` as numbers and `period` as datetimes, see `PERIOD_FORMATS`. Other columns are kept as strings.
+    """
+    if not records:
+        return pd.DataFrame()
+    keys, values = _get_columns(records)
+    columns = {}
+    for key, column_values in zip(keys, values):
+        if key == 'figure':
+            columns[key] = _parse_figures(column_values)
+        elif key == 'period':
+            columns[key] = _parse_periods(column_values)
+        else:
+            columns[key] = np.array(column_values, dtype=object)
+    return pd.DataFrame(columns, copy=False)
+
+
+class CenstatdClient:
+    """
+    Sends C&SD table queries, see the module docstring.
+    """
+
+    def __init__(self, url=URL, max_workers=DEFAULT_MAX_WORKERS, rate_limit=DEFAULT_RATE_LIMIT):
+        self.url = url
+        self.max_workers = max_workers
+        self._rate_limiter = RateLimiter(rate_limit)
+
+    def query(self, parameters, policy=None, deadline=None):
+        """
+        Sends a query, e.g. `{'id': '340-45022', 'lang': 'en', 'cv': {...}, 'sv': {...}, 'period': {...}}`,
+        and returns its parsed `dataSet`, see `parse_dataset()`.
+        `policy` and `deadline` are those of the fetch service, see `network_policy`.
+        """
+        r = self._post({'query': json.dumps(parameters)}, policy, deadline)
+        try:
+            records = r.json()['dataSet']
+        except (ValueError, KeyError, TypeError) as e:
+            raise CenstatdError(f"No dataSet in response for table {parameters.get('id')}: {r.text[:200]}") from e
+        return parse_dataset(records)
+
+    def query_many(self, queries, policy=None, deadline=None):
+        """
+        Sends queries concurrently, and returns their parsed `dataSet`s in order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='censtatd') as executor:
+            return list(executor.map(lambda parameters: self.query(parameters, policy, deadline), queries))
+
+    def _post(self, data, policy, deadline):
+        # recorded responses are replayed without waiting, retries are spaced by the policy's backoff
+        if fetch_service.mode != 'replay':
+            self._rate_limiter.wait()
+        r = fetch_service.fetch(self.url, method='POST', data=data, policy=policy, deadline=deadline)
+        if r.status_code != 200:
+            raise CenstatdError(f"C&SD query failed with status code {r.status_code}: {r.text[:200]}")
+        return r
+
+
+# shared instance for all C&SD crawlers, so that the rate limit applies to all of them
+censtatd_client = CenstatdClient()
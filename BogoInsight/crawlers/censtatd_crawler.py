@@ -0,0 +1,68 @@
+import copy
+import os
+import sys
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.censtatd_client import censtatd_client
+from BogoInsight.utils.logger import logger
+
+class CenstatdCrawler(BaseCrawler):
+    """
+    Base class for crawlers of the Census and Statistics Department (C&SD) web table API.
+
+    Subclasses define the query in `PARAMETERS` and implement `process()`, pivoting `raw_data`,
+    the DataFrame of the query's `dataSet` with typed `figure` and `period` columns (see `censtatd_client`).
+    In incremental mode, only periods after the latest export (minus an overlap window to catch revisions) are requested,
+    and `_merge_incremental()` merges the result into the exported series.
+    """
+
+    PARAMETERS = {}
+
+    # number of months before the latest exported period to re-fetch in incremental mode
+    INCREMENTAL_OVERLAP_MONTHS = 12
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.previous_data = None
+
+    def crawl(self):
+        self.raw_data = censtatd_client.query(self._build_parameters(), self.NETWORK_POLICY, self.deadline)
+        logger.info(f"Successfully crawled data for {self.topic}, {len(self.raw_data)} records found.")
+
+    def _build_parameters(self):
+        """
+        Returns the query parameters, with `period.start` moved forward in incremental mode.
+        """
+        parameters = copy.deepcopy(self.PARAMETERS)
+        self.previous_data = None
+        if not self.incremental:
+            return parameters
+        latest_path = self._get_latest_export_path()
+        if latest_path is None:
+            logger.info(f"No previous export for {self.topic}, crawling full history.")
+            return parameters
+        previous_data = pd.read_csv(latest_path, index_col='period', parse_dates=['period'])
+        if previous_data.empty:
+            return parameters
+        start = previous_data.index.max() - pd.DateOffset(months=self.INCREMENTAL_OVERLAP_MONTHS)
+        parameters['period'] = {'start': start.strftime('%Y%m')}
+        self.previous_data = previous_data
+        logger.info(f"Incremental crawl for {self.topic} from {parameters['period']['start']}.")
+        return parameters
+
+    def _merge_incremental(self, df):
+        """
+        Merges newly processed data into the previously exported series.
+        Fetched values take precedence, previous values fill in the rest.
+        """
+        if self.previous_data is None:
+            return df
+        merged = df.combine_first(self.previous_data)
+        columns = list(df.columns) + [c for c in self.previous_data.columns if c not in df.columns]
+        merged = merged[columns].sort_index()
+        merged.index.name = df.index.name
+        merged.columns.name = df.columns.name
+        return merged
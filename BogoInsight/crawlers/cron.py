@@ -0,0 +1,100 @@
+"""
+Minimal cron expression parser for `DataSource.auto_update_schedule`.
+
+Supports the standard 5 fields (minute, hour, day of month, month, day of week),
+each being `*`, a number, a range `a-b`, a step `*/n` or `a-b/n`, or a comma separated list of those,
+plus the aliases below. Day of week is 0-6 from Sunday, 7 is also Sunday.
+As in cron, if both day of month and day of week are restricted, a day matching either one is due.
+"""
+import datetime
+
+ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+
+# (min, max) of each field
+FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+FIELD_NAMES = ['minute', 'hour', 'day of month', 'month', 'day of week']
+
+
+def _parse_field(field, min_value, max_value, name):
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+            if step <= 0:
+                raise ValueError(f"Invalid step in {name} field: {field}")
+        if part == '*':
+            start, end = min_value, max_value
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = int(part)
+            # `a/n` means from a to the max
+            end = max_value if step > 1 else start
+        if start < min_value or end > max_value or start > end:
+            raise ValueError(f"Value out of range in {name} field: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    A parsed cron expression.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = ALIASES.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            _parse_field(field, *FIELD_RANGES[i], FIELD_NAMES[i]) for i, field in enumerate(fields)
+        ]
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        self.days_restricted = fields[2] != '*'
+        self.weekdays_restricted = fields[4] != '*'
+
+    def _matches_day(self, dt):
+        # cron counts weekdays from Sunday, Python from Monday
+        day_match = dt.day in self.days
+        weekday_match = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def matches(self, dt: datetime.datetime):
+        return (dt.minute in self.minutes and dt.hour in self.hours and dt.month in self.months
+                and self._matches_day(dt))
+
+    def next_after(self, dt: datetime.datetime):
+        """
+        Returns the first due time strictly after `dt`, to the minute.
+        """
+        dt = dt.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        # give up after 5 years, e.g. for 30 Feb
+        limit = dt + datetime.timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+            elif not self._matches_day(dt):
+                dt = dt.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + datetime.timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += datetime.timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from BogoInsight.crawlers.network_policy import DEFAULT_POLICY, call_with_timeout
+from BogoInsight.utils.logger import logger
+
+DEFAULT_POOL_MAXSIZE = 10
+# on-disk cache for conditional requests, i.e. BogoInsight/.cache/http
+DEFAULT_HTTP_CACHE_DIR = os.getenv(
+    'BOGO_HTTP_CACHE_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../.cache/http'))
+)
+
+# 'live' sends requests, 'record' also saves every response to the fixtures directory,
+# and 'replay' serves saved responses without any network access
+FETCH_MODES = ['live', 'record', 'replay']
+DEFAULT_FETCH_MODE = os.getenv('BOGO_FETCH_MODE', 'live')
+# recorded responses, i.e. BogoInsight/benchmarks/fixtures/http
+DEFAULT_FIXTURES_DIR = os.getenv(
+    'BOGO_FIXTURES_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '../benchmarks/fixtures/http'))
+)
+
+
+class MissingFixture(Exception):
+    """
+    Raised in replay mode when a request or call has not been recorded.
+    """
+
+
+class FetchService:
+    """
+    Shared HTTP fetch layer for crawlers.
+
+    Keeps one keep-alive session per host, merges identical in-flight requests,
+    and keeps successful responses in memory until `clear()` is called (i.e. for one refresh run),
+    so that each identical URL + payload is only downloaded once.
+    
+    Conditional requests store the body with its ETag / Last-Modified on disk,
+    and a 304 response is served from there with `not_modified` set to True.
+    Their responses carry the validator they were served under as `validator`,
+    so that crawlers can tell which one their latest export was made from.
+
+    In 'record' mode every response is also saved to `fixtures_dir`, which 'replay' mode serves them from,
+    so that crawlers can run offline, e.g. for benchmarks. Conditional requests are sent in full in both modes.
+
+    Requests and calls are sent under a `NetworkPolicy` (timeouts, retries, deadline and circuit breaking),
+    the default one unless given.
+    """
+
+    def __init__(self, pool_maxsize=DEFAULT_POOL_MAXSIZE, cache_dir=DEFAULT_HTTP_CACHE_DIR,
+                 mode=DEFAULT_FETCH_MODE, fixtures_dir=DEFAULT_FIXTURES_DIR):
+        if mode not in FETCH_MODES:
+            raise ValueError(f"Invalid fetch mode {mode}, expected one of {FETCH_MODES}")
+        self.pool_maxsize = pool_maxsize
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self._sessions = {}
+        self._responses = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url, method='GET', params=None, data=None, headers=None, timeout=None,
+              use_cache=True, conditional=False, policy=None, deadline=None):
+        """
+        Sends a request and returns the `requests.Response`, with its body already loaded.
+        With `conditional`, the request is validated against the on-disk cache.
+        `timeout` overrides the policy's timeout per attempt, and `deadline` bounds all attempts.
+        """
+        send_kwargs = {'policy': policy or DEFAULT_POLICY, 'deadline': deadline, 'timeout': timeout}
+        method = method.upper()
+        key = self._make_key(method, url, params, data)
+        with self._lock:
+            if use_cache and key in self._responses:
+                return self._responses[key]
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._in_flight[key] = future
+        if not is_owner:
+            logger.debug(f"Waiting for in-flight request: {method} {url}")
+            return future.result()
+
+        try:
+            if self.mode == 'replay':
+                r = self._replay(key, url)
+            elif conditional and self.mode == 'live':
+                r = self._conditional_request(key, method, url, params, data, headers, **send_kwargs)
+            else:
+                r = self._request(method, url, params, data, headers, **send_kwargs)
+                if self.mode == 'record':
+                    self._record(key, r)
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if use_cache and r.status_code == 200:
+                self._responses[key] = r
+        future.set_result(r)
+        return r
+
+    def _request(self, method, url, params, data, headers, policy, deadline, timeout):
+        session = self._get_session(url)
+
+        def send(attempt_timeout):
+            r = session.request(method, url, params=params, data=data, headers=headers, timeout=attempt_timeout)
+            # load the body now, so that the response can be shared between threads
+            r.content
+            return r
+
+        r = policy.execute(urlsplit(url).netloc, send, deadline, timeout)
+        r.not_modified = False
+        return r
+
+    def _conditional_request(self, key, method, url, params, data, headers, **send_kwargs):
+        cache_path = os.path.join(self.cache_dir, hashlib.sha1(repr(key).encode()).hexdigest())
+        meta = None
+        if os.path.exists(f'{cache_path}.json') and os.path.exists(f'{cache_path}.body'):
+            with open(f'{cache_path}.json', 'r') as f:
+                meta = json.load(f)
+        headers = dict(headers or {})
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        r = self._request(method, url, params, data, headers, **send_kwargs)
+        if r.status_code == 304 and meta is not None:
+            logger.info(f"Not modified, using cached body: {url}")
+            with open(f'{cache_path}.body', 'rb') as f:
+                content = f.read()
+            cached = requests.Response()
+            cached.status_code = 200
+            cached.url = r.url
+            cached.headers.update(meta.get('headers', {}))
+            cached.encoding = meta.get('encoding')
+            cached._content = content
+            cached.not_modified = True
+            cached.validator = {'etag': meta.get('etag'), 'last_modified': meta.get('last_modified')}
+            return cached
+        
+        etag, last_modified = r.headers.get('ETag'), r.headers.get('Last-Modified')
+        if r.status_code == 200 and (etag or last_modified):
+            r.validator = {'etag': etag, 'last_modified': last_modified}
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write body first, then metadata, so that a partial write is never used
+            with open(f'{cache_path}.body.tmp', 'wb') as f:
+                f.write(r.content)
+            os.replace(f'{cache_path}.body.tmp', f'{cache_path}.body')
+            with open(f'{cache_path}.json.tmp', 'w') as f:
+                json.dump({
+                    'url': url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'encoding': r.encoding,
+                    'headers': {k: v for k, v in r.headers.items() if k.lower() == 'content-type'},
+                }, f)
+            os.replace(f'{cache_path}.json.tmp', f'{cache_path}.json')
+        return r
+
+    def call(self, name, func, *args, policy=None, deadline=None, **kwargs):
+        """
+        Returns `func(*args, **kwargs)`, for sources not fetched over plain HTTP, e.g. a gradio client.
+        The result is recorded and replayed under `name` and the arguments like a response, so it must be JSON serializable.
+        Each attempt is abandoned after the policy's timeout, and `name` is the host of the circuit breaker.
+        """
+        key = ('CALL', name, json.dumps(args, default=str), json.dumps(kwargs, sort_keys=True, default=str))
+        if self.mode == 'replay':
+            with open(self._get_fixture_path(key, 'json'), 'r') as f:
+                return json.load(f)['result']
+        policy = policy or DEFAULT_POLICY
+        result = policy.execute(name, lambda timeout: call_with_timeout(func, timeout, *args, **kwargs), deadline)
+        if self.mode == 'record':
+            self._write_fixture(key, {'name': name, 'result': result})
+        return result
+
+    def _get_fixture_path(self, key, ext):
+        path = os.path.join(self.fixtures_dir, f'{hashlib.sha1(repr(key).encode()).hexdigest()}.{ext}')
+        if self.mode == 'replay' and not os.path.exists(path):
+            raise MissingFixture(f"No recorded response for {key[0]} {key[1]} in {self.fixtures_dir}")
+        return path
+
+    def _write_fixture(self, key, meta, content=None):
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        if content is not None:
+            body_path = self._get_fixture_path(key, 'body')
+            with open(f'{body_path}.tmp', 'wb') as f:
+                f.write(content)
+            os.replace(f'{body_path}.tmp', body_path)
+        meta_path = self._get_fixture_path(key, 'json')
+        with open(f'{meta_path}.tmp', 'w') as f:
+            json.dump(meta, f, default=str)
+        os.replace(f'{meta_path}.tmp', meta_path)
+
+    def _record(self, key, r):
+        self._write_fixture(key, {
+            'method': key[0],
+            'url': key[1],
+            'status_code': r.status_code,
+            'encoding': r.encoding,
+            'headers': dict(r.headers),
+        }, r.content)
+
+    def _replay(self, key, url):
+        with open(self._get_fixture_path(key, 'json'), 'r') as f:
+            meta = json.load(f)
+        with open(self._get_fixture_path(key, 'body'), 'rb') as f:
+            content = f.read()
+        r = requests.Response()
+        r.status_code = meta['status_code']
+        r.url = url
+        r.headers.update(meta['headers'])
+        r.encoding = meta['encoding']
+        r._content = content
+        r.not_modified = False
+        return r
+
+    def clear(self):
+        """
+        Drops all response bodies kept in memory.
+        """
+        with self._lock:
+            self._responses.clear()
+
+    def close(self):
+        """
+        Drops all response bodies and closes all sessions.
+        """
+        with self._lock:
+            self._responses.clear()
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+    def _get_session(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+        return session
+
+    @staticmethod
+    def _make_key(method, url, params, data):
+        return (method, url,
+                json.dumps(params, sort_keys=True, default=str),
+                json.dumps(data, sort_keys=True, default=str))
+
+
+# shared instance for all crawlers
+fetch_service = FetchService()
@@ -6,7 +6,7 @@ from io import BytesIO
 import pandas as pd
 import numpy as np
 import shutil
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import NavigableString
 import unicodedata
 from datetime import datetime
 print(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
@@ -14,6 +14,7 @@ print(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.html_parser import get_section_html, parse_soup
 from BogoInsight.utils.logger import logger
 
 class FootballKnockoutCrawler(BaseCrawler):
@@ -116,16 +117,22 @@ class FootballKnockoutCrawler(BaseCrawler):
     def crawl(self):
         match_data = pd.DataFrame()
         
+        # download all pages first, so that parsing can be skipped when none of them changed
+        responses = {}
         for tournament, tournament_data in self.TOURNAMENT_CONFIG.items():
             for game in tournament_data['games']:
                 print(f'Crawling data for {tournament} - {game["game_name"]}...')
-                r = requests.get(game['data_url'], timeout=20)
+                r = self.fetch(game['data_url'], conditional=True)
                 if r.status_code != 200:
                     self._handle_crawl_failure(r)
-                soup = BeautifulSoup(r.text, 'html.parser')
-                # Remove all reference link anchors
-                for sup in soup.find_all('sup'):
-                    sup.extract()
+                responses[game['data_url']] = r
+        self._check_unchanged(*responses.values())
+        
+        for tournament, tournament_data in self.TOURNAMENT_CONFIG.items():
+            for game in tournament_data['games']:
+                r = responses[game['data_url']]
+                # Parse the knockout section only, without reference link anchors
+                soup = parse_soup(get_section_html(r.text, 'Knockout_stage') or get_section_html(r.text, 'Knockout_phase'))
                 # Find the section by title
                 section = soup.find('h2', {'id': 'Knockout_stage'})
                 if section is None:
@@ -250,4 +257,4 @@ if __name__ == "__main__":
     if os.path.exists(output_base):
         shutil.rmtree(output_base)
     # output
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
@@ -7,12 +7,10 @@ print(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.censtatd_crawler import CenstatdCrawler
 from BogoInsight.utils.logger import logger
 
-class HKForeignInvestmentCrawler(BaseCrawler):
-    
-    URL = "https://www.censtatd.gov.hk/api/post.php"
+class HKForeignInvestmentCrawler(CenstatdCrawler):
     
     PARAMETERS ={
         "id": "315-38011",
@@ -43,6 +41,9 @@ class HKForeignInvestmentCrawler(BaseCrawler):
         },
     }
     
+    # yearly figures are revised for a few years after release
+    INCREMENTAL_OVERLAP_MONTHS = 36
+    
     # a dictionary to map 'sv' values to their descriptions
     SV_MAP = {
         'DI_POS_IDI': 'year end direct investment position',
@@ -74,25 +75,13 @@ class HKForeignInvestmentCrawler(BaseCrawler):
             """
         )
 
-    def crawl(self):
-        data = {'query': json.dumps(self.PARAMETERS)}
-        r = requests.post(self.URL, data=data, timeout=20)
-        if r.status_code != 200:
-            self._handle_crawl_failure(r)
-        self.raw_data = r.json()['dataSet']
-        logger.info(f"Successfully crawled data for {self.topic}, {len(self.raw_data)} records found.")
-        
     def process(self):
-        assert type(self.raw_data) == list, "Raw data is not in the correct format."
+        assert isinstance(self.raw_data, pd.DataFrame), "Raw data is not of type pd.DataFrame."
 
-        # Assuming self.raw_data is your list of dictionaries
-        df = pd.DataFrame(self.raw_data)
+        df = self.raw_data.copy()
         
         print(df['sv'].unique())
         print(df['svDesc'].unique())
-
-        # Convert 'period' to datetime
-        df['period'] = pd.to_datetime(df['period'], format='%Y')
         
         # Replace 'sv' values with their descriptions
         df['sv'] = df['sv'].map(self.SV_MAP)
@@ -110,11 +99,11 @@ class HKForeignInvestmentCrawler(BaseCrawler):
         df_pivot = df.pivot(index='period', columns='data_type', values='figure')
 
         # Now df_pivot is the transformed DataFrame in wide format
-        self.processed_data = df_pivot
+        self.processed_data = self._merge_incremental(df_pivot)
         
 if __name__ == "__main__":
     crawler = HKForeignInvestmentCrawler()
     crawler.crawl()
     crawler.process()
     print(crawler.processed_data.head())
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
@@ -2,7 +2,6 @@ import requests
 import json
 import sys
 import os
-from io import BytesIO
 import pandas as pd
 import numpy as np
 import shutil
@@ -10,12 +9,13 @@ print(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.rvd_workbook_reader import RVDCrawler
 from BogoInsight.utils.logger import logger
 
-class HKHouseRentalIndexCrawler(BaseCrawler):
+class HKHouseRentalIndexCrawler(RVDCrawler):
     
     URL = "https://www.rvd.gov.hk/doc/en/statistics/his_data_3.xls"
+    SHEETS = ['Monthly  按月']
     
     COLUMN_NAMES = [
         'year', 
@@ -46,17 +46,17 @@ class HKHouseRentalIndexCrawler(BaseCrawler):
 
 
     def crawl(self):
-        r = requests.get(self.URL, timeout=20)
+        r = self.fetch(self.URL, conditional=True)
         if r.status_code != 200:
             self._handle_crawl_failure(r)
-        data = pd.read_excel(BytesIO(r.content), 
-                             sheet_name='Monthly  按月', 
-                             header=None,
-                             names=self.COLUMN_NAMES, 
-                             usecols='B,F,I,L,O,R,U,X,AA,AD', 
-                             dtype={'month': int},
-                             skiprows=7,
-                             skipfooter=6)
+        self._check_unchanged(r)
+        data = self.read_sheet(r, 
+                               sheet_name=self.SHEETS[0], 
+                               names=self.COLUMN_NAMES, 
+                               usecols='B,F,I,L,O,R,U,X,AA,AD', 
+                               dtype={'month': int},
+                               skiprows=7,
+                               skipfooter=6)
         data['year'].replace(' ', np.nan, inplace=True)
         data['year'].fillna(method='ffill', inplace=True)
         data['year'] = data['year'].astype(int)  # Convert 'year' to integer after filling NaNs
@@ -88,4 +88,4 @@ if __name__ == "__main__":
     if os.path.exists(output_base):
         shutil.rmtree(output_base)
     # output
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
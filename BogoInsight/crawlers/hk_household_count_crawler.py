@@ -7,12 +7,10 @@ print(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.censtatd_crawler import CenstatdCrawler
 from BogoInsight.utils.logger import logger
 
-class HKHouseholdCountCrawler(BaseCrawler):
-    
-    URL = "https://www.censtatd.gov.hk/api/post.php"
+class HKHouseholdCountCrawler(CenstatdCrawler):
     
     PARAMETERS ={
         "id": "130-06604",
@@ -81,19 +79,10 @@ class HKHouseholdCountCrawler(BaseCrawler):
             """
         )
 
-    def crawl(self):
-        data = {'query': json.dumps(self.PARAMETERS)}
-        r = requests.post(self.URL, data=data, timeout=20)
-        if r.status_code != 200:
-            self._handle_crawl_failure(r)
-        self.raw_data = r.json()['dataSet']
-        logger.info(f"Successfully crawled data for {self.topic}, {len(self.raw_data)} records found.")
-        
     def process(self):
-        assert type(self.raw_data) == list, "Raw data is not in the correct format."
+        assert isinstance(self.raw_data, pd.DataFrame), "Raw data is not of type pd.DataFrame."
 
-        # Assuming self.raw_data is your list of dictionaries
-        df = pd.DataFrame(self.raw_data)
+        df = self.raw_data.copy()
         
         print(df.head(10))
         
@@ -102,9 +91,6 @@ class HKHouseholdCountCrawler(BaseCrawler):
         # remove data with 'freq' == 'Y'
         df = df[df['freq'] != 'Y']
         
-        # Convert 'period' to datetime
-        df['period'] = pd.to_datetime(df['period'], format='%Y%m')
-        
         # only keep quarter data
         df['month'] = df['period'].dt.month
         df = df[df['month'].isin([3, 6, 9, 12])]
@@ -129,11 +115,11 @@ class HKHouseholdCountCrawler(BaseCrawler):
         df_pivot['household growth rate (%)'] = df_pivot["household growth rate (%)"].round(2)
 
         # Now df_pivot is the transformed DataFrame in wide format
-        self.processed_data = df_pivot
+        self.processed_data = self._merge_incremental(df_pivot)
         
 if __name__ == "__main__":
     crawler = HKHouseholdCountCrawler()
     crawler.crawl()
     crawler.process()
     print(crawler.processed_data.head())
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Scoped HTML parsing for the Wikipedia crawlers.
+
+Instead of parsing a whole page, `get_section_html()` cuts the raw HTML of one section,
+from its heading to the next heading of the same or a higher level, and only that part is parsed,
+with lxml's compiled parser. Tables are read from the parsed nodes by `read_table()`,
+with the same result as `pd.read_html()` but without serializing them back to strings.
+"""
+import re
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+_HEADING_OPEN = re.compile(r'<h([1-6])[\s>]')
+# newer MediaWiki markup wraps headings, e.g. <div class="mw-heading mw-heading2"><h2 id="...">
+_HEADING_WRAPPER_OPEN = re.compile(r'<div[^>]*class="mw-heading[^"]*"[^>]*>\s*$')
+# same as pandas.io.html
+_WHITESPACE = re.compile(r'[\r\n]+|\s{2,}')
+
+
+def _find_heading_start(page_html, pos):
+    # start of the last heading tag opened before pos
+    start = page_html.rfind('<h', 0, pos)
+    while start != -1 and not _HEADING_OPEN.match(page_html, start):
+        start = page_html.rfind('<h', 0, start)
+    return start
+
+def _find_block_start(page_html, heading_start):
+    # start of the heading's wrapper, if any
+    window_start = max(heading_start - 200, 0)
+    wrapper = _HEADING_WRAPPER_OPEN.search(page_html, window_start, heading_start)
+    return wrapper.start() if wrapper else heading_start
+
+def get_section_html(page_html, heading_id):
+    """
+    Returns the raw HTML of the section whose heading, or an element in it, has the id `heading_id`,
+    up to the next heading of the same or a higher level. Returns None if there's no such id.
+    """
+    id_match = re.search(r'\sid="%s"' % re.escape(heading_id), page_html)
+    if id_match is None:
+        return None
+    heading_start = _find_heading_start(page_html, id_match.start())
+    if heading_start == -1:
+        return None
+    level = int(_HEADING_OPEN.match(page_html, heading_start).group(1))
+    next_heading = re.compile(r'<h([1-%d])[\s>]' % level).search(page_html, id_match.end())
+    end = _find_block_start(page_html, next_heading.start()) if next_heading else len(page_html)
+    return page_html[_find_block_start(page_html, heading_start):end]
+
+def parse_fragment(fragment_html):
+    """
+    Parses an HTML fragment with lxml into a `<div>` holding its elements, without reference marks (`<sup>`).
+    """
+    root = lxml_html.fragment_fromstring(fragment_html, create_parent='div')
+    etree.strip_elements(root, 'sup', with_tail=False)
+    return root
+
+def parse_section(page_html, heading_id):
+    """
+    Parses the section of `heading_id` only, see `get_section_html()`. Returns None if there's no such section.
+    """
+    section_html = get_section_html(page_html, heading_id)
+    return None if section_html is None else parse_fragment(section_html)
+
+def parse_soup(fragment_html):
+    """
+    Parses an HTML fragment into a BeautifulSoup tree using lxml, without reference marks (`<sup>`),
+    for crawlers navigating it with BeautifulSoup.
+    """
+    soup = BeautifulSoup(fragment_html, 'lxml')
+    for sup in soup.find_all('sup'):
+        sup.extract()
+    return soup
+
+def find_section_table(section, heading_id):
+    """
+    Returns the first table following the heading of `heading_id` in a parsed section, or None.
+    """
+    heading = section.get_element_by_id(heading_id, None)
+    if heading is None:
+        return None
+    # the block following which the section's content starts, i.e. the heading itself or its wrapper
+    if heading.tag == 'span' or 'mw-heading' in (heading.getparent().get('class') or ''):
+        heading = heading.getparent()
+    for sibling in heading.itersiblings():
+        if sibling.tag == 'table':
+            return sibling
+    return None
+
+def _parse_cells(row):
+    return row.xpath('./td|./th')
+
+def _get_rows(table):
+    # same lookups as pandas.io.html for lxml
+    header_rows = []
+    for thead in table.xpath('.//thead'):
+        header_rows.extend(thead.xpath('./tr'))
+        if thead.xpath('./td|./th'):
+            header_rows.append(thead)
+    body_rows = table.xpath('.//tbody//tr') + table.xpath('./tr')
+    footer_rows = table.xpath('./tfoot//tr')
+    if not header_rows:
+        # without <thead>, the top rows of only <th> are the header
+        while body_rows and all(cell.tag == 'th' for cell in _parse_cells(body_rows[0])):
+            header_rows.append(body_rows.pop(0))
+    return header_rows, body_rows, footer_rows
+
+def _get_text(cell):
+    return _WHITESPACE.sub(' ', cell.text_content().strip())
+
+def _expand_spans(rows):
+    """
+    Returns the texts of the rows, with cells spanning several rows or columns repeated in each of them.
+    """
+    all_texts = []
+    # cells spanning into the next rows, as (column index, text, rows left)
+    remainder = []
+    for row in rows:
+        texts = []
+        next_remainder = []
+        index = 0
+        for cell in _parse_cells(row):
+            while remainder and remainder[0][0] <= index:
+                prev_index, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+                index += 1
+            text = _get_text(cell)
+            rowspan = int(cell.get('rowspan') or 1)
+            colspan = int(cell.get('colspan') or 1)
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+        for prev_index, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+        all_texts.append(texts)
+        remainder = next_remainder
+    # rows only made of cells spanning from above
+    while remainder:
+        all_texts.append([text for _, text, _ in remainder])
+        remainder = [(i, text, rowspan - 1) for i, text, rowspan in remainder if rowspan > 1]
+    return all_texts
+
+def read_table(table, thousands=','):
+    """
+    Reads a parsed `<table>` into a DataFrame, the same as `pd.read_html()` would, including
+    header detection, row and column spans, and type inference. Hidden cells are left out.
+    The table is modified in place.
+    """
+    for element in table.xpath('.//style'):
+        element.drop_tree()
+    for element in table.xpath('.//*[@style]'):
+        if 'display:none' in element.get('style', '').replace(' ', ''):
+            element.drop_tree()
+    for br in table.xpath('.//br'):
+        br.tail = '\n' + (br.tail or '')
+
+    header_rows, body_rows, footer_rows = _get_rows(table)
+    head = _expand_spans(header_rows)
+    body = _expand_spans(body_rows)
+    foot = _expand_spans(footer_rows)
+    header = None
+    if head:
+        body = head + body
+        if len(head) == 1:
+            header = 0
+        else:
+            # ignore all-empty-text rows
+            header = [i for i, row in enumerate(head) if any(text for text in row)]
+    body += foot
+    if not body:
+        raise EmptyDataError('Empty table')
+    # pad ragged rows
+    width = max(len(row) for row in body)
+    body = [row + [''] * (width - len(row)) for row in body]
+    with TextParser(body, header=header, thousands=thousands) as parser:
+        return parser.read()
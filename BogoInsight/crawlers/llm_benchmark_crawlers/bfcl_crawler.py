@@ -3,6 +3,7 @@ import json
 import sys
 import os
 import pandas as pd
+from io import BytesIO
 from gradio_client import Client
 from bs4 import BeautifulSoup
 
@@ -54,7 +55,10 @@ class BFCLCrawler(BaseCrawler):
         )
         
     def crawl(self):
-        df = pd.read_csv(self.URL)
+        r = self.fetch(self.URL)
+        if r.status_code != 200:
+            self._handle_crawl_failure(r)
+        df = pd.read_csv(BytesIO(r.content))
         
         # Keep only the 'Model' and 'Arena Elo' columns, and rename them
         df = df[['Model', 'Overall Acc', 'Cost ($ Per 1k Function Calls)', 'Latency Mean (s)']].rename(
@@ -86,5 +90,5 @@ if __name__ == "__main__":
     if os.path.exists(output_base):
         shutil.rmtree(output_base)
     # output
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
     
\ No newline at end of file
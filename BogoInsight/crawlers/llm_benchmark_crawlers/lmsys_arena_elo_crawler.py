@@ -9,12 +9,16 @@ from bs4 import BeautifulSoup
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 
 from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.network_policy import NetworkPolicy
 from BogoInsight.utils.logger import logger
 
 class LMSYSArenaEloCrawler(BaseCrawler):
     
     URL = "https://lmsys-chatbot-arena-leaderboard.hf.space/"
     
+    # the gradio client blocks without a timeout of its own, and fails with its own errors
+    NETWORK_POLICY = NetworkPolicy(timeout=120, max_retries=1, deadline=300, retry_exceptions=(Exception,))
+    
     MODEL_NAME_MAP = {
         'GPT-4o-2024-05-13': 'GPT-4o',
         'GPT-4-Turbo-2024-04-09': 'GPT-4 Turbo 2024-04-09',
@@ -83,8 +87,9 @@ class LMSYSArenaEloCrawler(BaseCrawler):
         )
         
     def crawl(self):
-        client = Client("lmsys/chatbot-arena-leaderboard")
-        result = client.predict(
+        result = self.fetch_call(
+            "lmsys/chatbot-arena-leaderboard",
+            lambda **kwargs: Client("lmsys/chatbot-arena-leaderboard").predict(**kwargs),
             category="Overall",
             api_name="/update_leaderboard_and_plots"
         )
@@ -119,5 +124,5 @@ if __name__ == "__main__":
     if os.path.exists(output_base):
         shutil.rmtree(output_base)
     # output
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
     
\ No newline at end of file
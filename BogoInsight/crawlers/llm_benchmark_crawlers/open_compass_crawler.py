@@ -98,7 +98,9 @@ class OpenCompassCrawler(BaseCrawler):
         
     def crawl(self):
         # open compass ranking
-        response = requests.get(self.OPEN_COMPASS_RANKING_URL)
+        response = self.fetch(self.OPEN_COMPASS_RANKING_URL)
+        if response.status_code != 200:
+            self._handle_crawl_failure(response)
         data = response.json()
         df_open_compass = pd.DataFrame(data['OverallTable'])
         df_open_compass = df_open_compass[['model', 'Average', 'Average_CN', 'Average_EN']].rename(
@@ -114,7 +116,9 @@ class OpenCompassCrawler(BaseCrawler):
         print(df_open_compass.head())
         
         # vision ranking
-        response = requests.get(self.VISION_RANKING_URL)
+        response = self.fetch(self.VISION_RANKING_URL)
+        if response.status_code != 200:
+            self._handle_crawl_failure(response)
         data = response.json()['Main']
         for item in data:
             item['name'] = item['Method'][0]
@@ -131,7 +135,9 @@ class OpenCompassCrawler(BaseCrawler):
         print(df_vision.head())
         
         # community benchmark ranking
-        response = requests.get(self.COMMUNITY_RANKING_URL)
+        response = self.fetch(self.COMMUNITY_RANKING_URL)
+        if response.status_code != 200:
+            self._handle_crawl_failure(response)
         data = response.json()
         df_comm = pd.DataFrame()
         for key in ['MMLU', 'DROP', 'MATH', 'HumanEval', ]:
@@ -171,5 +177,5 @@ if __name__ == "__main__":
     if os.path.exists(output_base):
         shutil.rmtree(output_base)
     # output
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
     
\ No newline at end of file
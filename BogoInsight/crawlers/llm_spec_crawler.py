@@ -6,13 +6,13 @@ from io import BytesIO
 import pandas as pd
 import numpy as np
 import shutil
-from bs4 import BeautifulSoup
 import unicodedata
 print(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.html_parser import find_section_table, parse_section, read_table
 from BogoInsight.crawlers.llm_benchmark_crawlers import (
     LMSYSArenaEloCrawler, OpenCompassCrawler, BFCLCrawler
 )
@@ -22,7 +22,7 @@ class LLMSpecsCrawler(BaseCrawler):
     
     URL = "https://en.wikipedia.org/wiki/Large_language_model"
     
-    ADDITIONAL_DATA_XLSX = "llm_additional_data.xlsx"
+    ADDITIONAL_DATA_XLSX = os.path.join(os.path.dirname(__file__), "llm_additional_data.xlsx")
     
     COLUMN_NAME_MAP = {
         'Name': 'name',
@@ -79,22 +79,17 @@ class LLMSpecsCrawler(BaseCrawler):
 
 
     def crawl(self):
-        r = requests.get(self.URL, timeout=20)
+        r = self.fetch(self.URL, conditional=True)
         if r.status_code != 200:
             self._handle_crawl_failure(r)
-        soup = BeautifulSoup(r.text, 'html.parser')
-        # Remove all reference link anchors
-        for sup in soup.find_all('sup'):
-            sup.extract()
-            
-        # Find the section by title
-        section = soup.find('h2', {'id': 'List'}).parent
+        # Parse the section by title, without reference link anchors
+        section = parse_section(r.text, 'List')
         
         # Find the first table in the section
-        table_html = section.find_next_sibling('table')
+        table_html = find_section_table(section, 'List')
 
         # Convert the HTML table to a pandas DataFrame
-        table = pd.read_html(str(table_html))[0]
+        table = read_table(table_html)
         
         # Replace all \xa0 characters with a space
         table = table.replace('\xa0', ' ', regex=True)
@@ -181,6 +176,8 @@ class LLMSpecsCrawler(BaseCrawler):
         ]
         for crawler in crawlers:
             print(f'\nMerging benchmark from {crawler.topic}...')
+            # within what's left of this crawl's deadline
+            crawler.start_deadline(self.deadline)
             crawler.crawl()
             crawler.process()
             df = df.combine_first(crawler.processed_data)
@@ -208,4 +205,4 @@ if __name__ == "__main__":
     if os.path.exists(output_base):
         shutil.rmtree(output_base)
     # output
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
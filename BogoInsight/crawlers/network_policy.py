@@ -0,0 +1,201 @@
+"""
+Timeouts, retries, deadlines and circuit breaking of crawler network calls.
+
+Each crawler class sets its `NETWORK_POLICY`, which the fetch service applies to every attempt:
+a timeout per attempt, retries of connection errors and transient statuses with jittered exponential backoff,
+and a total deadline for one crawl. Hosts failing repeatedly are skipped by a circuit breaker shared by all crawlers,
+so that a degraded source fails fast instead of stalling a whole refresh.
+"""
+import random
+import threading
+import time
+
+import requests
+
+from BogoInsight.utils.logger import logger
+
+# seconds per attempt
+DEFAULT_TIMEOUT = 20
+DEFAULT_MAX_RETRIES = 2
+# seconds before the first retry, doubled on each following one up to DEFAULT_MAX_BACKOFF, then jittered
+DEFAULT_BACKOFF = 1
+DEFAULT_MAX_BACKOFF = 30
+# seconds for all network calls of one crawl
+DEFAULT_DEADLINE = 600
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+# consecutive failures after which a host is skipped for DEFAULT_RESET_TIMEOUT seconds
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a crawl runs out of its total time for network calls.
+    """
+
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of calling a host that failed too many times in a row.
+    """
+
+
+class Deadline:
+    """
+    Point in time after which no more network calls are made, or no limit if `seconds` is None.
+    """
+
+    def __init__(self, seconds=None):
+        self.end = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self):
+        return None if self.end is None else self.end - time.monotonic()
+
+    def check(self, name):
+        if self.end is not None and self.remaining() <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before calling {name}")
+
+    def limit(self, seconds):
+        """
+        Returns `seconds` capped to the remaining time.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        return remaining if seconds is None else min(seconds, remaining)
+
+
+class CircuitBreaker:
+    """
+    Counts consecutive failures per host. After `failure_threshold` of them, calls to the host raise `CircuitOpen`
+    for `reset_timeout` seconds, then one call at a time is let through until one succeeds.
+    """
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def check(self, host, reset_timeout):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or state['opened_at'] is None:
+                return
+            if time.monotonic() - state['opened_at'] < reset_timeout:
+                raise CircuitOpen(f"Skipped {host} after {state['failures']} consecutive failures")
+            # half open, let this call through and hold the others until it fails again
+            state['opened_at'] = time.monotonic()
+
+    def record_success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def record_failure(self, host, failure_threshold):
+        with self._lock:
+            state = self._hosts.setdefault(host, {'failures': 0, 'opened_at': None})
+            state['failures'] += 1
+            if state['failures'] >= failure_threshold:
+                if state['opened_at'] is None:
+                    logger.warning(f"Circuit opened for {host} after {state['failures']} consecutive failures.")
+                state['opened_at'] = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+# shared by all crawlers, as several of them call the same hosts
+circuit_breaker = CircuitBreaker()
+
+
+def call_with_timeout(func, timeout, *args, **kwargs):
+    """
+    Returns `func(*args, **kwargs)`, or raises `TimeoutError` if it takes longer than `timeout` seconds,
+    for blocking calls without a timeout of their own, e.g. a gradio client.
+    The call is left running in a daemon thread on timeout.
+    """
+    if timeout is None:
+        return func(*args, **kwargs)
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"Call timed out after {timeout:.1f}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+class NetworkPolicy:
+    """
+    Timeouts, retries and deadline of the network calls of a crawler, see the module docstring.
+    `retry_exceptions` are the errors retried, besides responses with `retry_status_codes`.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, deadline=DEFAULT_DEADLINE, retry_status_codes=RETRY_STATUS_CODES,
+                 retry_exceptions=(requests.RequestException, TimeoutError),
+                 failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.retry_status_codes = retry_status_codes
+        self.retry_exceptions = retry_exceptions
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def start_deadline(self, limit=None):
+        """
+        Returns the `Deadline` of a crawl starting now, no later than the `limit` Deadline if given.
+        """
+        seconds = self.deadline if limit is None else limit.limit(self.deadline)
+        return Deadline(seconds)
+
+    def get_delay(self, attempt):
+        # full jitter, so that crawlers retrying the same host spread out
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def execute(self, host, send, deadline=None, timeout=None):
+        """
+        Returns `send(timeout)`, e.g. a `requests.Response`, retrying it under the policy.
+        The last response is returned if its status is still one of `retry_status_codes` after all retries,
+        and the last error is raised otherwise.
+        """
+        deadline = deadline or Deadline()
+        timeout = timeout or self.timeout
+        for attempt in range(self.max_retries + 1):
+            deadline.check(host)
+            circuit_breaker.check(host, self.reset_timeout)
+            response = error = None
+            try:
+                response = send(deadline.limit(timeout))
+            except self.retry_exceptions as e:
+                error = e
+            if error is None and getattr(response, 'status_code', None) not in self.retry_status_codes:
+                circuit_breaker.record_success(host)
+                return response
+            circuit_breaker.record_failure(host, self.failure_threshold)
+            reason = repr(error) if error is not None else f"status code {response.status_code}"
+            delay = self.get_delay(attempt)
+            remaining = deadline.remaining()
+            if attempt == self.max_retries or (remaining is not None and delay >= remaining):
+                logger.warning(f"Call to {host} failed with {reason}, giving up after {attempt + 1} attempts.")
+                break
+            logger.warning(f"Call to {host} failed with {reason}, retrying in {delay:.1f}s.")
+            time.sleep(delay)
+        if error is not None:
+            raise error
+        return response
+
+
+# used for crawlers without a policy of their own
+DEFAULT_POLICY = NetworkPolicy()
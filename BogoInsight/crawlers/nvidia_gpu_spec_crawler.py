@@ -6,13 +6,13 @@ from io import BytesIO
 import pandas as pd
 import numpy as np
 import shutil
-from bs4 import BeautifulSoup
 import unicodedata
 print(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.crawlers.html_parser import find_section_table, parse_section, read_table
 from BogoInsight.utils.logger import logger
 
 class NvidiaGPUSpecsCrawler(BaseCrawler):
@@ -87,17 +87,14 @@ class NvidiaGPUSpecsCrawler(BaseCrawler):
 
 
     def crawl(self):
-        r = requests.get(self.URL, timeout=20)
+        r = self.fetch(self.URL, conditional=True)
         if r.status_code != 200:
             self._handle_crawl_failure(r)
-        soup = BeautifulSoup(r.text, 'html.parser')
-        # Remove all reference link anchors
-        for sup in soup.find_all('sup'):
-            sup.extract()
+        self._check_unchanged(r)
         
-        # Select different series of GPUs
+        # Select different series of GPUs, only their sections are parsed
         dfs = [
-            self._parse_section(soup, 'GeForce_10_series', 
+            self._parse_section(r.text, 'GeForce_10_series', 
                                 sel_model_names=[
                                     'GeForce GTX 1080', 
                                     'GeForce GTX 1080 Ti',
@@ -113,7 +110,7 @@ class NvidiaGPUSpecsCrawler(BaseCrawler):
                                     'series': 'GeForce 10 series',
                                     'architecture': 'Pascal',
                                 }),
-            self._parse_section(soup, 'Volta_series', 
+            self._parse_section(r.text, 'Volta_series', 
                                 sel_model_names=[
                                     'Nvidia TITAN V',
                                 ],
@@ -125,7 +122,7 @@ class NvidiaGPUSpecsCrawler(BaseCrawler):
                                     'series': 'Volta series',
                                     'architecture': 'Volta',
                                 }),
-            self._parse_section(soup, 'RTX_20_series', 
+            self._parse_section(r.text, 'RTX_20_series', 
                                 sel_model_names=[
                                     'GeForce RTX 2070',
                                     'GeForce RTX 2080',
@@ -141,7 +138,7 @@ class NvidiaGPUSpecsCrawler(BaseCrawler):
                                     'series': 'GeForce 20 series',
                                     'architecture': 'Turing',
                                 }),
-            self._parse_section(soup, 'RTX_30_series', 
+            self._parse_section(r.text, 'RTX_30_series', 
                                 sel_model_names=[
                                     'GeForce RTX 3070',
                                     'GeForce RTX 3070 Ti',
@@ -158,7 +155,7 @@ class NvidiaGPUSpecsCrawler(BaseCrawler):
                                     'series': 'GeForce 30 series',
                                     'architecture': 'Ampere',
                                 }),
-            self._parse_section(soup, 'RTX_40_series', 
+            self._parse_section(r.text, 'RTX_40_series', 
                                 sel_model_names=[
                                     'GeForce RTX 4070',
                                     'GeForce RTX 4070 Ti',
@@ -173,7 +170,7 @@ class NvidiaGPUSpecsCrawler(BaseCrawler):
                                     'series': 'GeForce 40 series',
                                     'architecture': 'Ada Lovelace',
                                 }),
-            self._parse_section(soup, 'Tesla', 
+            self._parse_section(r.text, 'Tesla', 
                                 sel_model_names=[
                                     'P100 GPU accelerator (mezzanine)',
                                     'P100 GPU accelerator (12 GB card)',
@@ -222,15 +219,15 @@ class NvidiaGPUSpecsCrawler(BaseCrawler):
 
         self.processed_data = df
         
-    def _parse_section(self, soup, header, sel_model_names, append_value_map, column_name_map=COLUMN_NAME_MAP_DESKTOP, series_leads=None):
-        # Find the section by title
-        section = soup.find('span', {'class': 'mw-headline', 'id': header}).parent
+    def _parse_section(self, page_html, header, sel_model_names, append_value_map, column_name_map=COLUMN_NAME_MAP_DESKTOP, series_leads=None):
+        # Parse the section by title, without reference link anchors
+        section = parse_section(page_html, header)
         
         # Find the first table in the section
-        table_html = section.find_next_sibling('table')
+        table_html = find_section_table(section, header)
 
         # Convert the HTML table to a pandas DataFrame
-        table = pd.read_html(str(table_html))[0]
+        table = read_table(table_html)
         
         # Replace all \xa0 characters with a space
         table = table.replace('\xa0', ' ', regex=True)
@@ -358,4 +355,4 @@ if __name__ == "__main__":
     if os.path.exists(output_base):
         shutil.rmtree(output_base)
     # output
-    crawler.export_csv(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
+    crawler.export(f'../data/{crawler._gen_default_export_name()}')
\ No newline at end of file
@@ -0,0 +1,185 @@
+import argparse
+import importlib
+import inspect
+import os
+import pkgutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.crawlers.base_crawler import BaseCrawler, SourceUnchanged, DATA_DIR
+from BogoInsight.crawlers.fetch_service import fetch_service
+from BogoInsight.crawlers.network_policy import Deadline
+from BogoInsight.crawlers.rvd_workbook_reader import rvd_workbook_reader
+from BogoInsight.pipelines.run import run_pipelines
+from BogoInsight.utils.logger import logger
+
+CRAWLERS_PACKAGE = 'BogoInsight.crawlers'
+DEFAULT_MAX_WORKERS = 8
+# seconds for all crawls of a refresh, crawlers still running after it are reported as failed
+DEFAULT_DEADLINE = 1800
+# modules under BogoInsight/crawlers that don't define crawlers
+NON_CRAWLER_MODULES = ['refresh', 'scheduler', 'cron', 'fetch_service', 'html_parser', 'rvd_workbook_reader',
+                       'censtatd_client', 'network_policy']
+
+
+def _is_concrete_crawler(cls):
+    """
+    Checks whether a class is a runnable crawler, i.e. it implements both
+    `crawl` and `process` and can be instantiated without arguments.
+    """
+    if not inspect.isclass(cls) or not issubclass(cls, BaseCrawler) or cls is BaseCrawler:
+        return False
+    if cls.crawl is BaseCrawler.crawl or cls.process is BaseCrawler.process:
+        return False
+    params = list(inspect.signature(cls.__init__).parameters.values())[1:]
+    return all(p.default is not inspect.Parameter.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+               for p in params)
+
+
+def load_crawler_classes(module):
+    """
+    Returns the crawler classes defined in the given module.
+    """
+    return [cls for _, cls in inspect.getmembers(module, _is_concrete_crawler)
+            if cls.__module__ == module.__name__]
+
+
+def discover_crawlers():
+    """
+    Imports every module under BogoInsight/crawlers and returns all BaseCrawler subclasses found.
+    Modules that fail to import (e.g. missing optional dependencies) are logged and skipped.
+    """
+    package = importlib.import_module(CRAWLERS_PACKAGE)
+    crawler_classes = []
+    for module_info in pkgutil.walk_packages(package.__path__, prefix=f'{CRAWLERS_PACKAGE}.'):
+        if module_info.name.rsplit('.', 1)[-1] in NON_CRAWLER_MODULES:
+            continue
+        try:
+            module = importlib.import_module(module_info.name)
+        except Exception as e:
+            logger.error(f"Failed to import crawler module {module_info.name}: {e}")
+            continue
+        crawler_classes += load_crawler_classes(module)
+    return sorted(set(crawler_classes), key=lambda cls: cls.__name__)
+
+
+def _crawl(crawler, deadline):
+    start = time.perf_counter()
+    crawler.start_deadline(deadline)
+    crawler.crawl()
+    return time.perf_counter() - start
+
+
+def _new_report(crawler_cls, topic):
+    return {
+        'crawler': crawler_cls.__name__,
+        'topic': topic,
+        'status': 'success',
+        'crawl_time': None,
+        'process_time': None,
+        'export_path': None,
+        'error': None,
+    }
+
+
+def run_refresh(crawler_classes=None, max_workers=DEFAULT_MAX_WORKERS, data_dir=DATA_DIR, skip_unchanged=True,
+                incremental=False, deadline=DEFAULT_DEADLINE):
+    """
+    Runs `crawl()` of all crawlers concurrently, then `process()` and `export()` of each one as soon as its crawl finishes.
+    Network calls of each crawl are bounded by its crawler's `NETWORK_POLICY`, and all crawls by `deadline` seconds,
+    after which the crawlers still running are reported as failed, or no limit if None.
+    Crawlers whose sources are unchanged since their latest export are skipped, unless `skip_unchanged` is False.
+    With `incremental`, crawlers that support it only fetch data newer than their latest export.
+    Pipeline stages are run afterwards, rebuilding derived artifacts whose inputs have a new version.
+    Returns a list of per-crawler reports.
+    """
+    if crawler_classes is None:
+        crawler_classes = discover_crawlers()
+    reports = []
+    refresh_start = time.perf_counter()
+    # responses and parsed workbooks are only shared within one refresh run
+    fetch_service.clear()
+    rvd_workbook_reader.clear()
+    refresh_deadline = Deadline(deadline)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawler')
+    futures = {}
+    try:
+        for crawler_cls in crawler_classes:
+            try:
+                crawler = crawler_cls()
+            except Exception as e:
+                logger.error(f"Failed to create {crawler_cls.__name__}: {e}")
+                report = _new_report(crawler_cls, None)
+                report['status'] = 'failed'
+                report['error'] = repr(e)
+                reports.append(report)
+                continue
+            crawler.data_dir = data_dir
+            crawler.skip_unchanged = skip_unchanged
+            crawler.incremental = incremental
+            futures[executor.submit(_crawl, crawler, refresh_deadline)] = crawler
+        for future in as_completed(futures, timeout=refresh_deadline.remaining()):
+            crawler = futures.pop(future)
+            report = _new_report(type(crawler), crawler.topic)
+            try:
+                report['crawl_time'] = future.result()
+                start = time.perf_counter()
+                crawler.process()
+                export_path = os.path.join(data_dir, crawler._gen_default_export_name())
+                crawler.export(export_path)
+                report['process_time'] = time.perf_counter() - start
+                report['export_path'] = export_path
+            except SourceUnchanged:
+                report['status'] = 'unchanged'
+            except Exception as e:
+                logger.error(f"Failed to refresh {crawler.topic}: {e}")
+                report['status'] = 'failed'
+                report['error'] = repr(e)
+            reports.append(report)
+    except FuturesTimeoutError:
+        for crawler in futures.values():
+            logger.error(f"Failed to refresh {crawler.topic}: refresh deadline of {deadline}s exceeded")
+            report = _new_report(type(crawler), crawler.topic)
+            report['status'] = 'failed'
+            report['error'] = f"Refresh deadline of {deadline}s exceeded"
+            reports.append(report)
+    finally:
+        # crawls still running stop at their next network call, past the refresh deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+    fetch_service.clear()
+    rvd_workbook_reader.clear()
+    run_pipelines(data_dir)
+    logger.info(f"Refresh finished in {time.perf_counter() - refresh_start:.2f}s.")
+    return reports
+
+
+def print_reports(reports):
+    for report in reports:
+        crawl_time = f"{report['crawl_time']:.2f}s" if report['crawl_time'] is not None else '-'
+        process_time = f"{report['process_time']:.2f}s" if report['process_time'] is not None else '-'
+        print(f"[{report['status']:>9}] {report['crawler']:<32} crawl {crawl_time:>8} | process {process_time:>8}"
+              + (f" | {report['error']}" if report['error'] else ''))
+    counts = {status: len([r for r in reports if r['status'] == status]) for status in ['success', 'unchanged', 'failed']}
+    print(f"{counts['success']} succeeded, {counts['unchanged']} unchanged, {counts['failed']} failed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Refresh all crawled data concurrently.')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='max number of concurrent crawls')
+    parser.add_argument('--only', nargs='*', help='crawler class names to run, e.g. HiborCrawler')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='export directory')
+    parser.add_argument('--force', action='store_true', help='re-export sources even if they are unchanged')
+    parser.add_argument('--incremental', action='store_true', help='only fetch data newer than the latest export where supported')
+    parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE, help='seconds for all crawls, 0 for no limit')
+    args = parser.parse_args()
+
+    crawler_classes = discover_crawlers()
+    if args.only:
+        crawler_classes = [cls for cls in crawler_classes if cls.__name__ in args.only]
+    reports = run_refresh(crawler_classes, max_workers=args.workers, data_dir=args.data_dir,
+                          skip_unchanged=not args.force, incremental=args.incremental, deadline=args.deadline or None)
+    print_reports(reports)
+    sys.exit(1 if any(r['status'] == 'failed' for r in reports) else 0)
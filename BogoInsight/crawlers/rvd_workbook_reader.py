@@ -0,0 +1,153 @@
+"""
+Shared reader of the Rating and Valuation Department (RVD) workbooks.
+
+Several crawlers read sheets of the same `.xls` workbooks, e.g. the take-up and vacancy sheets of
+`private_domestic.xls`. Crawlers subclassing `RVDCrawler` declare the sheets they need with `SHEETS`,
+and the first one to read a workbook opens it once with xlrd and converts every declared sheet of it in one pass.
+The converted cells are cached by the hash of the workbook's content, so the other crawlers only
+apply their own `names`, `usecols`, `skiprows` etc. on them, the same as `pd.read_excel()` would.
+"""
+import datetime
+import hashlib
+import math
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+import xlrd
+from pandas.io.parsers import TextParser
+
+from BogoInsight.crawlers.base_crawler import BaseCrawler
+from BogoInsight.utils.logger import logger
+
+_COLUMN_RANGE = re.compile(r'^([A-Z]+)(?::([A-Z]+))?$')
+
+
+def _column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+def _convert_usecols(usecols):
+    """
+    Converts Excel column letters and ranges, e.g. 'B,F,I:K', into column indices, same as `pd.read_excel()`.
+    Other values are returned as is.
+    """
+    if not isinstance(usecols, str):
+        return usecols
+    indices = []
+    for part in usecols.upper().replace(' ', '').split(','):
+        match = _COLUMN_RANGE.match(part)
+        if match is None:
+            raise ValueError(f"Invalid column range {part} in usecols {usecols}")
+        start = _column_index(match.group(1))
+        end = _column_index(match.group(2)) if match.group(2) else start
+        indices.extend(range(start, end + 1))
+    return indices
+
+def _convert_cell(value, cell_type, datemode):
+    # same conversions as pandas' xlrd reader
+    if cell_type == xlrd.XL_CELL_DATE:
+        try:
+            value = xlrd.xldate.xldate_as_datetime(value, datemode)
+        except OverflowError:
+            return value
+        # dates on the epoch are times only
+        if value.timetuple()[0:3] == ((1904, 1, 1) if datemode else (1899, 12, 31)):
+            value = datetime.time(value.hour, value.minute, value.second, value.microsecond)
+    elif cell_type == xlrd.XL_CELL_ERROR:
+        value = np.nan
+    elif cell_type == xlrd.XL_CELL_BOOLEAN:
+        value = bool(value)
+    elif cell_type == xlrd.XL_CELL_NUMBER and math.isfinite(value) and int(value) == value:
+        value = int(value)
+    return value
+
+def _convert_sheet(sheet, datemode):
+    return [
+        tuple(_convert_cell(value, cell_type, datemode)
+              for value, cell_type in zip(sheet.row_values(i), sheet.row_types(i)))
+        for i in range(sheet.nrows)
+    ]
+
+
+class RVDWorkbookReader:
+    """
+    Opens each workbook once per refresh run, converting all the sheets declared for its URL,
+    and keeps the converted cells by content hash until `clear()` is called.
+    """
+
+    def __init__(self):
+        self._sheet_names = {}
+        self._sheets = {}
+        self._lock = threading.Lock()
+
+    def register(self, url, sheet_names):
+        """
+        Declares the sheets read from the workbook at `url`.
+        """
+        with self._lock:
+            self._sheet_names.setdefault(url, set()).update(sheet_names)
+
+    def read_sheet(self, url, content, sheet_name, names=None, usecols=None, dtype=None, skiprows=None, skipfooter=0):
+        """
+        Reads a sheet of the workbook downloaded from `url` into a DataFrame without header,
+        with the same arguments and result as `pd.read_excel(BytesIO(content), sheet_name, header=None, ...)`.
+        """
+        rows = self._get_sheets(url, content, sheet_name)[sheet_name]
+        if not rows:
+            return pd.DataFrame()
+        with TextParser([list(row) for row in rows], header=None, names=names, usecols=_convert_usecols(usecols),
+                        dtype=dtype, skiprows=skiprows, skipfooter=skipfooter, skip_blank_lines=False) as parser:
+            return parser.read()
+
+    def _get_sheets(self, url, content, sheet_name):
+        content_hash = hashlib.sha1(content).hexdigest()
+        # the lock is held while converting, so that crawlers sharing a workbook wait for the first one
+        with self._lock:
+            sheets = self._sheets.get(content_hash)
+            if sheets is None:
+                sheets = self._sheets[content_hash] = {}
+            sheet_names = (self._sheet_names.get(url, set()) | {sheet_name}) - sheets.keys()
+            if sheet_names:
+                book = xlrd.open_workbook(file_contents=content, on_demand=True)
+                try:
+                    for name in sheet_names:
+                        sheets[name] = _convert_sheet(book.sheet_by_name(name), book.datemode)
+                finally:
+                    book.release_resources()
+                logger.debug(f"Read sheets {sorted(sheet_names)} of {url}")
+        return sheets
+
+    def clear(self):
+        """
+        Drops all converted sheets.
+        """
+        with self._lock:
+            self._sheets.clear()
+
+
+# shared instance for all RVD crawlers
+rvd_workbook_reader = RVDWorkbookReader()
+
+
+class RVDCrawler(BaseCrawler):
+    """
+    Base class for crawlers of RVD workbooks, declaring the sheets they read from `URL` with `SHEETS`.
+    """
+
+    URL = None
+    SHEETS = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.URL and cls.SHEETS:
+            rvd_workbook_reader.register(cls.URL, cls.SHEETS)
+
+    def read_sheet(self, r, sheet_name, **kwargs):
+        """
+        Reads a sheet of the workbook in the response `r` through the shared reader, see `RVDWorkbookReader.read_sheet()`.
+        """
+        return rvd_workbook_reader.read_sheet(self.URL, r.content, sheet_name, **kwargs)
@@ -0,0 +1,225 @@
+import argparse
+import datetime
+import importlib
+import json
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.crawlers.base_crawler import SourceUnchanged, DATA_DIR
+from BogoInsight.crawlers.cron import CronSchedule
+from BogoInsight.crawlers.fetch_service import fetch_service
+from BogoInsight.crawlers.rvd_workbook_reader import rvd_workbook_reader
+from BogoInsight.crawlers.refresh import load_crawler_classes
+from BogoInsight.database.session import init_db
+from BogoInsight.models.data_version import DataVersion
+from BogoInsight.pipelines.run import run_pipelines
+from BogoInsight.services.data_source_service import DataSourceService
+from BogoInsight.utils.logger import logger
+
+# BogoInsight/, the base of `crawl_script_path` and `DataVersion.file_path`
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_PER_SOURCE_LIMIT = 1
+DEFAULT_POLL_INTERVAL = 30
+DEFAULT_RELOAD_INTERVAL = 300
+
+
+def load_crawler_class(crawl_script_path, class_name=None):
+    """
+    Returns the crawler class defined in a crawl script, e.g. `crawlers/hibor_crawler.py`.
+    `class_name` is required if the script defines more than one crawler.
+    """
+    module_path = os.path.splitext(os.path.normpath(crawl_script_path))[0]
+    module_name = 'BogoInsight.' + module_path.replace(os.sep, '.')
+    crawler_classes = load_crawler_classes(importlib.import_module(module_name))
+    if class_name is not None:
+        crawler_classes = [cls for cls in crawler_classes if cls.__name__ == class_name]
+    if len(crawler_classes) != 1:
+        raise ValueError(f"Expected one crawler in {crawl_script_path}, found {len(crawler_classes)}")
+    return crawler_classes[0]
+
+
+def parse_default_args(default_args):
+    """
+    Parses `DataSource.default_args`, a JSON object.
+    The optional `class` key picks the crawler class, other keys are set as crawler attributes, e.g. `{"incremental": true}`.
+    """
+    if not default_args:
+        return {}
+    args = json.loads(default_args)
+    if not isinstance(args, dict):
+        raise ValueError(f"default_args must be a JSON object: {default_args}")
+    return args
+
+
+class Scheduler:
+    """
+    Long-running scheduler that refreshes data sources on their `auto_update_schedule`.
+
+    Data sources are loaded through `DataSourceService`, and reloaded every `reload_interval` seconds
+    so that schedule changes take effect without a restart.
+    Due crawls run on a shared worker pool, at most `per_source_limit` at a time for each source,
+    and each successful export is recorded as a new `DataVersion` and set as the source's latest version.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, per_source_limit=DEFAULT_PER_SOURCE_LIMIT,
+                 poll_interval=DEFAULT_POLL_INTERVAL, reload_interval=DEFAULT_RELOAD_INTERVAL, data_dir=DATA_DIR):
+        self.max_workers = max_workers
+        self.per_source_limit = per_source_limit
+        self.poll_interval = poll_interval
+        self.reload_interval = reload_interval
+        self.data_dir = data_dir
+
+        self.jobs = {}
+        self._semaphores = {}
+        self._stop_event = threading.Event()
+        self._pipeline_lock = threading.Lock()
+        self._last_reload = None
+        # jobs submitted and not finished yet, the in-memory caches are cleared once there are none
+        self._running_jobs = 0
+        self._running_jobs_lock = threading.Lock()
+
+    def load_jobs(self, now=None):
+        """
+        Loads the scheduled data sources, keeping the next run time of unchanged schedules.
+        """
+        now = now or datetime.datetime.now()
+        jobs = {}
+        for data_source in DataSourceService.get_data_sources():
+            if not data_source.auto_update_schedule or not data_source.crawl_script_path:
+                continue
+            try:
+                schedule = CronSchedule(data_source.auto_update_schedule)
+            except ValueError as e:
+                logger.error(f"Invalid schedule for data source {data_source.name}: {e}")
+                continue
+            previous_job = self.jobs.get(data_source.id)
+            if previous_job and previous_job['schedule'].expression == schedule.expression:
+                next_run = previous_job['next_run']
+            else:
+                next_run = schedule.next_after(now)
+            jobs[data_source.id] = {
+                'data_source_id': data_source.id,
+                'name': data_source.name,
+                'crawl_script_path': data_source.crawl_script_path,
+                'default_args': data_source.default_args,
+                'schedule': schedule,
+                'next_run': next_run,
+            }
+            if data_source.id not in self._semaphores:
+                self._semaphores[data_source.id] = threading.BoundedSemaphore(self.per_source_limit)
+        self.jobs = jobs
+        self._last_reload = now
+        logger.info(f"Loaded {len(jobs)} scheduled data sources.")
+        return jobs
+
+    def run_job(self, job):
+        """
+        Crawls, processes and exports one data source, then records the new data version.
+        Returns the new DataVersion, or None if the source is unchanged.
+        """
+        args = parse_default_args(job['default_args'])
+        crawler_cls = load_crawler_class(job['crawl_script_path'], args.pop('class', None))
+        crawler = crawler_cls()
+        crawler.data_dir = self.data_dir
+        crawler.skip_unchanged = True
+        for key, value in args.items():
+            setattr(crawler, key, value)
+        crawler.start_deadline()
+        try:
+            crawler.crawl()
+        except SourceUnchanged:
+            logger.info(f"Data source {job['name']} is unchanged.")
+            return None
+        crawler.process()
+        export_name = crawler._gen_default_export_name()
+        export_path = os.path.join(self.data_dir, export_name)
+        crawler.export(export_path)
+        data_version = DataSourceService.record_version(job['data_source_id'], DataVersion(
+            name=os.path.splitext(os.path.basename(export_name))[0],
+            args=job['default_args'],
+            file_path=os.path.relpath(export_path, APP_DIR),
+        ))
+        logger.info(f"Refreshed data source {job['name']}: {data_version.file_path}")
+        return data_version
+
+    def _run_job_and_release(self, job):
+        try:
+            if self.run_job(job) is not None:
+                with self._pipeline_lock:
+                    run_pipelines(self.data_dir)
+        except Exception as e:
+            logger.error(f"Failed to refresh data source {job['name']}: {e}")
+        finally:
+            self._semaphores[job['data_source_id']].release()
+            self._finish_job()
+
+    def _finish_job(self):
+        with self._running_jobs_lock:
+            self._running_jobs -= 1
+            if self._running_jobs == 0:
+                # responses and parsed workbooks kept in memory are only reused by jobs running together,
+                # and dropped once none are left, never in the middle of a crawl
+                fetch_service.clear()
+                rvd_workbook_reader.clear()
+
+    def submit_due_jobs(self, executor, now=None):
+        """
+        Submits the jobs due at `now`, and schedules their next runs.
+        A job whose source is still running at its limit is skipped until its next run.
+        """
+        now = now or datetime.datetime.now()
+        due_jobs = [job for job in self.jobs.values() if job['next_run'] <= now]
+        submitted = []
+        for job in due_jobs:
+            job['next_run'] = job['schedule'].next_after(now)
+            if not self._semaphores[job['data_source_id']].acquire(blocking=False):
+                logger.warning(f"Data source {job['name']} is still refreshing, skipped until {job['next_run']}.")
+                continue
+            with self._running_jobs_lock:
+                self._running_jobs += 1
+            executor.submit(self._run_job_and_release, job)
+            submitted.append(job)
+        return submitted
+
+    def run(self):
+        """
+        Runs until `stop()` is called, then waits for running jobs to finish.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scheduler') as executor:
+            while not self._stop_event.is_set():
+                now = datetime.datetime.now()
+                if self._last_reload is None or (now - self._last_reload).total_seconds() >= self.reload_interval:
+                    try:
+                        self.load_jobs(now)
+                    except Exception as e:
+                        logger.error(f"Failed to load data sources: {e}")
+                self.submit_due_jobs(executor, now)
+                self._stop_event.wait(self.poll_interval)
+        logger.info("Scheduler stopped.")
+
+    def stop(self, *args):
+        self._stop_event.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Refresh data sources on their auto update schedules.')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='max number of concurrent crawls')
+    parser.add_argument('--per-source', type=int, default=DEFAULT_PER_SOURCE_LIMIT, help='max number of concurrent crawls of each data source')
+    parser.add_argument('--poll', type=float, default=DEFAULT_POLL_INTERVAL, help='seconds between checks for due crawls')
+    parser.add_argument('--reload', type=float, default=DEFAULT_RELOAD_INTERVAL, help='seconds between reloads of data sources')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='export directory')
+    args = parser.parse_args()
+
+    scheduler = Scheduler(max_workers=args.workers, per_source_limit=args.per_source, poll_interval=args.poll,
+                          reload_interval=args.reload, data_dir=args.data_dir)
+    init_db()
+    signal.signal(signal.SIGINT, scheduler.stop)
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    scheduler.run()
@@ -0,0 +1,73 @@
+import os
+from contextlib import asynccontextmanager
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from BogoInsight.database.base import Base
+from BogoInsight.database.session import DATABASE_URL, POOL_SIZE, MAX_OVERFLOW, POOL_RECYCLE
+from BogoInsight.utils.logger import logger
+from BogoInsight.models import (
+    # Import all of your models, so that they are registered on Base.metadata
+    data_source,
+    data_version,
+    topic,
+)
+
+# async drivers of the sync database URLs
+ASYNC_DRIVERS = {
+    'mysql+mysqlconnector': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+def _default_async_database_url():
+    scheme, rest = DATABASE_URL.split('://', 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+# e.g. sqlite+aiosqlite:///bogo_insight.db for local runs and tests, the same database as DATABASE_URL by default
+ASYNC_DATABASE_URL = os.getenv('ASYNC_DATABASE_URL') or _default_async_database_url()
+
+_async_engine = None
+_AsyncSession = None
+
+def get_async_engine(url=None):
+    """
+    Returns the async engine, created on first use.
+    """
+    global _async_engine, _AsyncSession
+    if _async_engine is None:
+        url = url or ASYNC_DATABASE_URL
+        kwargs = {'pool_pre_ping': True}
+        if not url.startswith('sqlite'):
+            kwargs.update(pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_recycle=POOL_RECYCLE)
+        _async_engine = create_async_engine(url, **kwargs)
+        _AsyncSession = async_sessionmaker(bind=_async_engine, expire_on_commit=False)
+    return _async_engine
+
+def AsyncSession():
+    get_async_engine()
+    return _AsyncSession()
+
+@asynccontextmanager
+async def async_session_scope():
+    """
+    Provides an async session for one unit of work, committed on success, rolled back on error, and always closed.
+    """
+    session = AsyncSession()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+async def create_tables_async():
+    async with get_async_engine().begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    logger.info("Database tables created.")
+
+async def dispose_async_engine():
+    global _async_engine, _AsyncSession
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine, _AsyncSession = None, None
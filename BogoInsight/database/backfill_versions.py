@@ -0,0 +1,44 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.services.data_source_service import DataSourceService
+from BogoInsight.services.data_version_service import DataVersionService
+from BogoInsight.utils.catalog import DATA_DIR, load_catalog
+from BogoInsight.utils.logger import logger
+
+# BogoInsight/, the base of `DataVersion.file_path`
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def backfill_versions(data_dir=DATA_DIR):
+    """
+    Registers every exported version in the data catalog as a DataVersion,
+    then points each data source to the latest version of its category.
+    Versions already registered (by file path) are updated, so the backfill can be rerun.
+    """
+    catalog = load_catalog(data_dir)
+    rows = []
+    latest_paths = {}
+    for category, category_entry in catalog['categories'].items():
+        for version, entry in category_entry['versions'].items():
+            file_path = os.path.relpath(os.path.join(data_dir, entry['path']), APP_DIR)
+            rows.append({'name': version, 'file_path': file_path})
+            if version == category_entry['latest']:
+                latest_paths[category] = file_path
+    version_ids = DataVersionService.upsert_data_versions(rows)
+    logger.info(f"Registered {len(version_ids)} data versions.")
+
+    updates = []
+    for data_source in DataSourceService.get_data_sources():
+        category = data_source.name.replace(' ', '_').lower()
+        if category in latest_paths:
+            updates.append({'id': data_source.id, 'latest_version_id': version_ids[latest_paths[category]]})
+    DataSourceService.update_data_sources(updates)
+    logger.info(f"Updated the latest versions of {len(updates)} data sources.")
+    return version_ids
+
+
+if __name__ == "__main__":
+    backfill_versions(sys.argv[1] if len(sys.argv) > 1 else DATA_DIR)
@@ -1,12 +1,14 @@
 # BogoInsight/database/session.py
 import os
-from sqlalchemy import create_engine, event
+import threading
+from contextlib import contextmanager
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
 
 from BogoInsight.database.base import Base  # Import your Base from models
 from BogoInsight.utils.logger import logger
-from BogoInsight.models import ( 
+from BogoInsight.models import (
     # Import all of your models, so that they can be created all at once
     data_source,
     data_version,
@@ -14,17 +16,89 @@ from BogoInsight.models import (
 )
 
 
-DATABASE_URL = f"mysql+mysqlconnector://root:{os.getenv('MYSQL_ROOT_PASSWORD')}@db:3306/bogo_insight"
+def _default_database_url():
+    # the MySQL service of docker-compose if configured, otherwise a local SQLite file
+    if os.getenv('MYSQL_ROOT_PASSWORD'):
+        return f"mysql+mysqlconnector://root:{os.getenv('MYSQL_ROOT_PASSWORD')}@db:3306/bogo_insight"
+    sqlite_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../bogo_insight.db'))
+    return f"sqlite:///{sqlite_path}"
 
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
+# e.g. sqlite:///bogo_insight.db for local runs
+DATABASE_URL = os.getenv('DATABASE_URL') or _default_database_url()
 
-def create_tables():
+# connection pool, shared by all sessions of the process
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+# recycle connections before MySQL's wait_timeout closes them
+POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+# create missing tables when the engine is first used
+AUTO_CREATE_TABLES = os.getenv('DB_AUTO_CREATE_TABLES', 'true').lower() == 'true'
+
+_engine = None
+_session_factory = None
+_init_lock = threading.Lock()
+
+def get_engine():
+    """
+    Returns the engine, creating it and the tables on first use.
+    Nothing connects to the database until then.
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                kwargs = {
+                    # test connections on checkout, so that dropped connections are replaced instead of failing a request
+                    'pool_pre_ping': True,
+                }
+                if not DATABASE_URL.startswith('sqlite'):
+                    kwargs.update(pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_recycle=POOL_RECYCLE)
+                engine = create_engine(DATABASE_URL, **kwargs)
+                if AUTO_CREATE_TABLES:
+                    create_tables(engine)
+                # objects stay readable after their session is closed
+                _session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+                _engine = engine
+    return _engine
+
+def init_db():
+    """
+    Initializes the engine and tables explicitly, e.g. at the start of a long-running process.
+    """
+    return get_engine()
+
+def Session():
+    """
+    Returns a new session, kept for compatibility with `sessionmaker` style callers.
+    """
+    get_engine()
+    return _session_factory()
+
+@contextmanager
+def session_scope():
+    """
+    Provides a session for one unit of work, committed on success, rolled back on error, and always closed.
+    """
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+def create_tables(engine=None):
     try:
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=engine or get_engine())
         logger.info("Database tables created.")
     except OperationalError as e:
         logger.error("Error occurred during Table creation!")
         logger.error(e)
 
-create_tables()
\ No newline at end of file
+def __getattr__(name):
+    # `engine` is created lazily on access
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 # BogoInsight/models/data_source.py
 from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy.orm import relationship
 from BogoInsight.database.base import BaseModel
 
 class DataSource(BaseModel):
@@ -13,4 +14,5 @@ class DataSource(BaseModel):
     tags = Column(String(200))
     default_args = Column(String(200))
     source_desc = Column(String(200))
-    
\ No newline at end of file
+
+    latest_version = relationship('DataVersion')
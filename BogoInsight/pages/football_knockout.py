@@ -11,13 +11,13 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from BogoInsight.configs.access import access_level
 from BogoInsight.utils.data_utils import (
-    get_latest_data_source, load_df,
+    get_latest_data_source, get_data_stamp, load_df, reload_data,
 )
 from BogoInsight.utils.plot_utils import (
     gen_heatmap
 )
 from BogoInsight.utils.router import render_toc
-from BogoInsight.utils.football_utils import get_nation_flag_html
+from BogoInsight.utils.football_utils import get_nation_flag_html, aggregate_matches
 from BogoInsight.utils.streamlit_utils import render_unlock_form
 
 CAT_FOOTBALL_KNOCKOUT = 'football_knockout_matches'
@@ -35,6 +35,16 @@ DEFAULT_SEEDED_TEAMS = {
     "Euro 2020": ["Belgium"],
 }
 
+@st.cache_data
+def get_knockout_stats(path, data_stamp, tournament, seeds):
+    """
+    Aggregates the match stats of a tournament, cached by data version, tournament and seeds.
+    `seeds` is a tuple of `(game, seeded teams)`, in game order.
+    """
+    df = load_df(path)
+    df = df[df['tournament'] == tournament]
+    return aggregate_matches(df, dict(seeds), [game_name for game_name, _ in seeds])
+
 st.set_page_config(
     page_title='Football Knockout Stage Analysis | BogoInsight', 
     page_icon='⚽',
@@ -49,7 +59,7 @@ with st.sidebar:
     render_toc()
     st.divider()
     
-    st.button('Reload data', on_click=lambda: st.cache_data.clear())
+    st.button('Reload data', on_click=reload_data)
 
 # get data
 ds_football_knockout = get_latest_data_source(CAT_FOOTBALL_KNOCKOUT)
@@ -112,58 +122,10 @@ with st.container():
             default_seeds.sort()
             seeded_teams[game_name] = st.multiselect(f'**{game_name}**', teams, key=f'seed_{game_name}', default=default_seeds)
     
-    # iterate and categorize matches
-    # at the same time, construct another df to aggregate the stats
-    df_agg = pd.DataFrame(columns=['game', 'match_category', 'result_category', 'count', 'percentage'])
-    for game_name in game_names:
-        df_cur_game = df_cur_tournament[df_cur_tournament['game'] == game_name]
-        count_underdog_win, count_underdog_seed_draw, count_seed_win = 0, 0, 0
-        count_balanced_no_draw, count_balanced_draw = 0, 0
-        for i, row in df_cur_game.iterrows():
-            home_team, away_team = row['home_team'], row['away_team']
-            home_score, away_score, has_extra_time = row['home_score'], row['away_score'], row['has_extra_time']
-            if home_team in seeded_teams[game_name] and away_team not in seeded_teams[game_name]:
-                if has_extra_time:
-                    count_underdog_seed_draw += 1
-                elif home_score > away_score:
-                    count_seed_win += 1
-                else:
-                    count_underdog_win += 1
-            elif home_team not in seeded_teams[game_name] and away_team in seeded_teams[game_name]:
-                if has_extra_time:
-                    count_underdog_seed_draw += 1
-                elif home_score > away_score:
-                    count_underdog_win += 1
-                else:
-                    count_seed_win += 1
-            else:
-                if has_extra_time:
-                    count_balanced_draw += 1
-                else:
-                    count_balanced_no_draw += 1
-        df_agg = pd.concat([df_agg, pd.DataFrame([
-            {'game': game_name, 'match_category': 'Underdog vs Seed', 'result_category': 'Underdog wins', 'count': count_underdog_win},
-            {'game': game_name, 'match_category': 'Underdog vs Seed', 'result_category': 'Underdog/seed draw', 'count': count_underdog_seed_draw},
-            {'game': game_name, 'match_category': 'Underdog vs Seed', 'result_category': 'Seed wins', 'count': count_seed_win},
-            # {'game': game_name, 'match_category': 'Underdog vs Seed', 'result_category': 'All', 'count': count_underdog_win + count_underdog_seed_draw + count_seed_win},
-            {'game': game_name, 'match_category': 'Balanced', 'result_category': 'Balanced no draw', 'count': count_balanced_no_draw},
-            {'game': game_name, 'match_category': 'Balanced', 'result_category': 'Balanced draw', 'count': count_balanced_draw},
-            # {'game': game_name, 'match_category': 'Balanced', 'result_category': 'All', 'count': count_balanced_no_draw + count_balanced_draw},
-        ])], ignore_index=True)
-        # st.subheader(f'🏆{game_name}')
-        # st.dataframe(df_cur_game[['home_team', 'away_team', 'match_category', 'result_category', 'has_extra_time', 'home_score', 'away_score']])
-    # calculate and append the sum of each result category across all games
-    for category in ['Underdog vs Seed', 'Balanced']:
-        if category == 'Underdog vs Seed':
-            results = ['Underdog wins', 'Underdog/seed draw', 'Seed wins']
-        else:
-            results = ['Balanced no draw', 'Balanced draw']
-        for result in results:
-            df_agg = pd.concat([df_agg, pd.DataFrame([
-                {'game': 'All', 'match_category': category, 'result_category': result, 'count': df_agg[(df_agg['game'] != 'All') & (df_agg['match_category'] == category) & (df_agg['result_category'] == result)]['count'].sum()},
-            ])], ignore_index=True)
-    # add percentage to each row
-    df_agg['percentage'] = df_agg['count'] / df_agg.groupby(['game', 'match_category'])['count'].transform('sum') * 100
+    # categorize matches and aggregate the stats
+    df_agg = get_knockout_stats(
+        ds_football_knockout['path'], get_data_stamp(ds_football_knockout['path']), tournament, 
+        tuple((game_name, tuple(sorted(seeded_teams[game_name]))) for game_name in game_names))
     
     # figures
     match_cat_tabs = st.tabs(['🛡️ Underdog vs Seed', '⚔️ Balanced'])
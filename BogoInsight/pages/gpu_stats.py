@@ -10,12 +10,13 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from BogoInsight.utils.data_utils import (
-    get_latest_data_source, load_df,
+    get_data_stamp, get_latest_data_source, load_df, reload_data,
 )
 from BogoInsight.utils.plot_utils import (
-    update_line_chart, gen_heatmap
+    update_line_chart, gen_heatmap, cached_figure
 )
 from BogoInsight.utils.router import render_toc
+from BogoInsight.utils.streamlit_utils import render_paginated_table
 
 # data category consts
 CAT_NVIDIA_GPU = 'nvidia_gpu_specs'
@@ -36,14 +37,12 @@ with st.sidebar:
     render_toc()
     st.divider()
     
-    st.button('Reload data', on_click=lambda: st.cache_data.clear())
+    st.button('Reload data', on_click=reload_data)
 
 # get data
 ds_nvidia_gpu = get_latest_data_source(CAT_NVIDIA_GPU)
-df_nvidia_gpu = load_df(ds_nvidia_gpu['path'])
-
-# set index
-df_nvidia_gpu.set_index('model', inplace=True)
+df_nvidia_gpu = load_df(ds_nvidia_gpu['path'], index_col='model', parse_dates=['period'])
+data_version = get_data_stamp(ds_nvidia_gpu['path'])
 
 # observe GPU specs
 with st.container():
@@ -90,34 +89,40 @@ with st.container():
         
         show_model_name = st.toggle('Show model name', key='show-gpu', value=True)
     
-    # selected_df.fillna(-1, inplace=True)
-    fig = px.scatter(selected_df,
-                     title='🏅NVIDIA GPU model stats',
-                     x=x_axis_col,
-                     y=y_axis_col,
-                     color='architecture',
-                     size=size_col,
-                     hover_name=selected_df.index,
-                     hover_data=selected_df.columns,
-                     text=selected_df.index if show_model_name else None,
-                     category_orders={'architecture': ['Pascal', 'Volta', 'Turing', 'Ampere', 'Hopper', 'Ada Lovelace']},
-                    )
-    fig.update_traces(textposition="bottom center")
-    fig.update_layout(legend_title_text=f'Architecture', margin=dict(b=0))
-    # fig.update_layout(legend=dict(
-    #     orientation="h",
-    #     yanchor="bottom",
-    #     y=1.02,
-    #     xanchor="right",
-    #     x=1
-    # ))
-    fig.update_xaxes(minor_ticks='inside', showgrid=True)
-    # fab size custom tickvals
-    fab_sizes = [2, 3, 5, 7, 10, 14]
-    if y_axis_col == 'fab (nm)':
-        fig.update_yaxes(tickvals=fab_sizes)
-    if x_axis_col == 'fab (nm)':
-        fig.update_xaxes(tickvals=fab_sizes)
+    def build_stats_chart():
+        # selected_df.fillna(-1, inplace=True)
+        fig = px.scatter(selected_df,
+                         title='🏅NVIDIA GPU model stats',
+                         x=x_axis_col,
+                         y=y_axis_col,
+                         color='architecture',
+                         size=size_col,
+                         hover_name=selected_df.index,
+                         hover_data=selected_df.columns,
+                         text=selected_df.index if show_model_name else None,
+                         category_orders={'architecture': ['Pascal', 'Volta', 'Turing', 'Ampere', 'Hopper', 'Ada Lovelace']},
+                        )
+        fig.update_traces(textposition="bottom center")
+        fig.update_layout(legend_title_text=f'Architecture', margin=dict(b=0))
+        # fig.update_layout(legend=dict(
+        #     orientation="h",
+        #     yanchor="bottom",
+        #     y=1.02,
+        #     xanchor="right",
+        #     x=1
+        # ))
+        fig.update_xaxes(minor_ticks='inside', showgrid=True)
+        # fab size custom tickvals
+        fab_sizes = [2, 3, 5, 7, 10, 14]
+        if y_axis_col == 'fab (nm)':
+            fig.update_yaxes(tickvals=fab_sizes)
+        if x_axis_col == 'fab (nm)':
+            fig.update_xaxes(tickvals=fab_sizes)
+        return fig
+
+    fig = cached_figure('gpu-stats', data_version, build_stats_chart,
+                        x=x_axis_col, y=y_axis_col, size=size_col, focus=focus_select,
+                        architectures=arch_filter, usage=usage_select, show_model_name=show_model_name)
     st.plotly_chart(fig, theme="streamlit")
     st.caption(f'Point size depicts {size_col}.')
     
@@ -129,5 +134,5 @@ with st.container():
             default=False,
         ),
     }
-    st.dataframe(df_nvidia_gpu, column_config=column_config)
+    render_paginated_table(df_nvidia_gpu, 'gpu-raw-data', data_version=data_version, column_config=column_config)
     
\ No newline at end of file
@@ -7,26 +7,17 @@ import pandas as pd
 import numpy as np
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from BogoInsight.utils.data_utils import (
-    get_latest_data_source, load_df,
+from BogoInsight.utils.data_utils import get_catalog, load_df, reload_data
+from BogoInsight.pipelines.hk_house_price_panel import (
+    HOUSE_PRICE_INDEX_COLUMN, build_panel, describe_tendency_ranges, get_inputs_hash, get_panel_path
 )
 from BogoInsight.utils.plot_utils import (
-    update_line_chart, gen_heatmap
+    update_line_chart, gen_heatmap, cached_figure
 )
 from BogoInsight.utils.router import render_toc
+from BogoInsight.utils.streamlit_utils import render_paginated_table
 
 
-# data category consts
-CAT_HOUSE_PRICE = 'hong_kong_house_price_index'
-CAT_HOUSE_RENTAL = 'hong_kong_house_rental_index'
-CAT_HOUSE_VACANCY = 'hong_kong_house_vacancy'
-CAT_HOUSEHOLD = 'hong_kong_household_count'
-CAT_GDP = 'hong_kong_gdp_growth'
-CAT_INTEREST_RATE = 'hong_kong_interest_rate'
-CAT_EXCHANGE_RATE = 'hong_kong_exchange_rate'
-CAT_FOREIGN_INVEST = 'hong_kong_foreign_investment'
-CAT_HIBOR = 'hibor'
-
 # styling consts
 SINGLE_SUBPLOT_HEIGHT = 400
 TOTAL_FACET_ROW_SPACING = 0.15
@@ -86,6 +77,20 @@ TENDENCY_RANGES = [
 ]
 
 
+@st.cache_data
+def _build_panel(inputs_hash):
+    return build_panel()
+
+def load_panel(catalog, inputs_hash):
+    """
+    Loads the precomputed panel in a single read,
+    or builds it in process if it's not exported yet for the latest input versions, identified by `inputs_hash`.
+    """
+    panel_path = get_panel_path(inputs_hash=inputs_hash, catalog=catalog)
+    if panel_path is not None:
+        return load_df(panel_path, index_col='period', parse_dates=['period'])
+    return _build_panel(inputs_hash)
+
 def write_tendency_desc(tr):
     styled_pct_chg = f":red[+{tr['pct_change']:.2f}%]" if tr['tendency'] == 'rise' else f":green[{tr['pct_change']:.2f}%]"
     st.markdown(f"""
@@ -116,132 +121,52 @@ with st.sidebar:
     render_toc()
     st.divider()
     
-    st.button('Reload data', on_click=lambda: st.cache_data.clear())
+    st.button('Reload data', on_click=reload_data)
 
 # get data
-ds_house_price = get_latest_data_source(CAT_HOUSE_PRICE)
-ds_house_rental = get_latest_data_source(CAT_HOUSE_RENTAL)
-ds_gdp = get_latest_data_source(CAT_GDP)
-ds_interest_rate = get_latest_data_source(CAT_INTEREST_RATE)
-ds_exchange_rate = get_latest_data_source(CAT_EXCHANGE_RATE)
-ds_foreign_invest = get_latest_data_source(CAT_FOREIGN_INVEST)
-ds_vacancy = get_latest_data_source(CAT_HOUSE_VACANCY)
-ds_household = get_latest_data_source(CAT_HOUSEHOLD)
-ds_hibor = get_latest_data_source(CAT_HIBOR)
-
-# data preprocessing
 with st.spinner('Data preprocessing...'):
-    # merge useful columns
-    merged_df = load_df(ds_house_price['path']).set_index('period')[
-        [
-            'house price all (idx 1999=100)', 
-            'house price growth all (% rate MoM)'
-        ]]
-    merged_df = merged_df.join(load_df(ds_house_rental['path']).set_index('period')[[
-            'house rental all (idx 1999=100)', 
-            'house rental growth all (% rate MoM)'
-        ]], on='period', how='outer', sort=True)
-    merged_df = merged_df.join(load_df(ds_vacancy['path']).set_index('period')[[
-            'house vacancy all (num)', 
-            'house vacancy all (%)',
-            'house vacancy growth all (% rate YoY)'
-        ]], on='period', how='outer', sort=True)
-    merged_df = merged_df.join(load_df(ds_household['path']).set_index('period')[[
-            'households total (\'000)', 
-            'households private owner-occupiers (%)',
-            'households private owner-occupiers (\'000)',
-            'household growth rate (%)'
-        ]], on='period', how='outer', sort=True)
-    merged_df = merged_df.join(load_df(ds_gdp['path']).set_index('period')[[
-            'GDP chained (2021) (HK$M)', 
-            'GDP seasonally adjusted (% QoQ rate)', 
-            'implicit price deflator (% YoY rate)',
-        ]], on='period', how='outer', sort=True)
-    merged_df = merged_df.join(load_df(ds_interest_rate['path']).set_index('period')[[
-            'best lending rate (% p.a.)', 
-        ]], on='period', how='outer', sort=True)
-    merged_df = merged_df.join(load_df(ds_hibor['path']).set_index('period')[[
-            'HIBOR 1M (% p.a.)', 
-        ]], on='period', how='outer', sort=True)
-    merged_df = merged_df.join(load_df(ds_exchange_rate['path']).set_index('period')[[
-            'exchange rate CNY to HKD', 
-            'exchange rate USD to HKD', 
-        ]], on='period', how='outer', sort=True)
-    merged_df = merged_df.join(load_df(ds_foreign_invest['path']).set_index('period')[[
-            'year end direct investment position all (HK$B)', 
-            'year end direct investment position CN (HK$B)', 
-            'year end direct investment position GB (HK$B)', 
-            'year end direct investment position VG (HK$B)', 
-            'year end direct investment position KY (HK$B)', 
-        ]], on='period', how='outer', sort=True)
-    merged_df.set_index('period', inplace=True)
-    merged_df.index = pd.to_datetime(merged_df.index)
-    merged_df.sort_index(inplace=True)
-    # select data from 1993
-    merged_df = merged_df.loc['1995-01-01':]
-    # additional column calculation
-    merged_df['house total supply (num)'] = (merged_df['house vacancy all (num)'] * 100 / merged_df['house vacancy all (%)']).round()
-    # merged_df['house total supply growth rate (% rate YoY)'] = (merged_df['house total supply (num)'].pct_change() * 100).round(2)
-    merged_df['house occupied all (num)'] = merged_df['house total supply (num)'] - merged_df['house vacancy all (num)']
-    merged_df['house occupied by owners (num)'] = merged_df['households private owner-occupiers (\'000)'] * 1000
-    merged_df['house occupied by owners (num)'] = merged_df['house occupied by owners (num)'].shift(1)
-    merged_df['house occupied by tenants (num)'] = merged_df['house occupied all (num)'] - merged_df['house occupied by owners (num)']
-    merged_df['house occupied by tenants (%)'] = (merged_df['house occupied by tenants (num)'] / merged_df['house total supply (num)'] * 100).round(1)
-    merged_df['house occupied by owners (%)'] = (merged_df['house occupied by owners (num)'] / merged_df['house total supply (num)'] * 100).round(1)
-    merged_df['P plan mortgage rate (% p.a.)'] = merged_df['best lending rate (% p.a.)'] - 1.75
-    merged_df['H plan mortgage rate (% p.a.)'] = merged_df[['best lending rate (% p.a.)', 'HIBOR 1M (% p.a.)']].apply(
-        lambda x: min(x['best lending rate (% p.a.)'] - 1.75, x['HIBOR 1M (% p.a.)'] + 1.3) if pd.notnull(x['best lending rate (% p.a.)']) and pd.notnull(x['HIBOR 1M (% p.a.)']) else np.nan, 
-        axis=1)
-    # rename columns
-    merged_df.rename(columns={
-        'GDP seasonally adjusted (% QoQ rate)': 'GDP growth rate (%)',
-        'implicit price deflator (% YoY rate)': 'inflation rate (%)'
-    }, inplace=True)
+    # version of the panel's inputs, from the cached catalog, cached figures are rebuilt once it changes
+    catalog = get_catalog()
+    panel_version = get_inputs_hash(catalog=catalog)
+    merged_df = load_panel(catalog, panel_version)
     # fill in details for each tendency range
-    house_price_index_column = 'house price all (idx 1999=100)'
-    for idx, tr in enumerate(TENDENCY_RANGES):
-        start_value = merged_df.loc[tr['start'], house_price_index_column]
-        end_value = merged_df.loc[tr['end'], house_price_index_column]
-        tr['idx'] = idx + 1
-        tr['tendency'] = 'rise' if end_value > start_value else 'fall'
-        tr['pct_change'] = (end_value - start_value) / start_value * 100
-        # Calculate the duration in years and months
-        start_date = pd.to_datetime(tr['start'])
-        end_date = pd.to_datetime(tr['end'])
-        years = end_date.year - start_date.year
-        months = end_date.month - start_date.month
-        # Adjust if end month is less than start month
-        if months < 0:
-            years -= 1
-            months += 12
-        tr['duration'] = f'{years} years {months} months' if years > 0 else f'{months} months'
+    TENDENCY_RANGES = describe_tendency_ranges(merged_df, TENDENCY_RANGES)
+    house_price_index_column = HOUSE_PRICE_INDEX_COLUMN
 
 # Observe the rises and falls
 with st.container():
     st.header('📈Overview: the rises & falls of HK house market')
     
     # house price line chart
-    line_chart = px.line(merged_df[[house_price_index_column]], 
-                title='💵HK avg house price index (1999=100)',
-                # x='period', 
-                # y=sel_columns, 
-                markers=False,
-                labels={"period": "time", "value": "price index"},
-                )
-    update_line_chart(line_chart)
-    line_chart.update_layout(showlegend=False, margin=dict(b=0))
-    draw_tendency_rects(line_chart)
+    def build_house_price_chart():
+        line_chart = px.line(merged_df[[house_price_index_column]], 
+                    title='💵HK avg house price index (1999=100)',
+                    # x='period', 
+                    # y=sel_columns, 
+                    markers=False,
+                    labels={"period": "time", "value": "price index"},
+                    )
+        update_line_chart(line_chart)
+        line_chart.update_layout(showlegend=False, margin=dict(b=0))
+        draw_tendency_rects(line_chart)
+        return line_chart
+
+    line_chart = cached_figure('hk-house-price', panel_version, build_house_price_chart)
     
-    rate_chart = px.line(merged_df[['house price growth all (% rate MoM)']], 
-                title='💵HK avg house price growth rate',
-                # x='period', 
-                # y=sel_columns, 
-                markers=False,
-                labels={"period": "time", "value": "%"},
-                )
-    update_line_chart(rate_chart)
-    rate_chart.update_layout(showlegend=False, margin=dict(b=0))
-    draw_tendency_rects(rate_chart)
+    def build_house_price_growth_chart():
+        rate_chart = px.line(merged_df[['house price growth all (% rate MoM)']], 
+                    title='💵HK avg house price growth rate',
+                    # x='period', 
+                    # y=sel_columns, 
+                    markers=False,
+                    labels={"period": "time", "value": "%"},
+                    )
+        update_line_chart(rate_chart)
+        rate_chart.update_layout(showlegend=False, margin=dict(b=0))
+        draw_tendency_rects(rate_chart)
+        return rate_chart
+
+    rate_chart = cached_figure('hk-house-price-growth', panel_version, build_house_price_growth_chart)
     
     st.plotly_chart(line_chart, theme="streamlit")
     st.plotly_chart(rate_chart, theme="streamlit")
@@ -269,24 +194,27 @@ st.subheader('Macro economy factors', divider='grey')
 with gdp_tab:
     st.write('**GDP growth rate is a good indicator when it\'s below zero or spikes**')
     # gdp
-    fig = px.line(merged_df, 
-                 y=['house price all (idx 1999=100)', 'GDP growth rate (%)'], 
-                 title='HK house price 🆚 GPD growth rate',
-                 facet_col="variable",
-                 facet_col_wrap=1,
-                 facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
-                 color=px.NO_COLOR,
-                 height=SINGLE_SUBPLOT_HEIGHT * 2,)
-    update_line_chart(fig)
-    fig.update_yaxes(matches=None)
-    fig.update_layout(showlegend=False, margin=dict(b=0))
-    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
-    draw_tendency_rects(fig, with_annotation=True)
-    # add vacancy as bar
-    # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
-    #                      marker_color='red', opacity=0.5,)
-    # fig.add_trace(vacancy_bar, row=1, col=1)
-    
+    def build_gdp_chart():
+        fig = px.line(merged_df, 
+                     y=['house price all (idx 1999=100)', 'GDP growth rate (%)'], 
+                     title='HK house price 🆚 GPD growth rate',
+                     facet_col="variable",
+                     facet_col_wrap=1,
+                     facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
+                     color=px.NO_COLOR,
+                     height=SINGLE_SUBPLOT_HEIGHT * 2,)
+        update_line_chart(fig)
+        fig.update_yaxes(matches=None)
+        fig.update_layout(showlegend=False, margin=dict(b=0))
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
+        draw_tendency_rects(fig, with_annotation=True)
+        # add vacancy as bar
+        # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
+        #                      marker_color='red', opacity=0.5,)
+        # fig.add_trace(vacancy_bar, row=1, col=1)
+        return fig
+
+    fig = cached_figure('hk-gdp', panel_version, build_gdp_chart)
     st.plotly_chart(fig, theme="streamlit")
     st.markdown("""
         **Note:** GDP growth rate is calculated by quarter and is seasonally adjusted. 
@@ -309,24 +237,27 @@ st.subheader('Supply factors', divider='grey')
 with supply_tab:
     st.write('**House supply increases steadily, making it less correlated with house price**')
     # house supply
-    fig = px.line(merged_df, 
-                 y=['house price all (idx 1999=100)', 'house total supply (num)'], 
-                 title='HK house price 🆚 supply & vacancy',
-                 facet_col="variable",
-                 facet_col_wrap=1,
-                 facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
-                 color=px.NO_COLOR,
-                 height=SINGLE_SUBPLOT_HEIGHT * 2,)
-    update_line_chart(fig)
-    fig.update_yaxes(matches=None)
-    fig.update_layout(showlegend=False, margin=dict(b=0))
-    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
-    draw_tendency_rects(fig, with_annotation=True)
-    # add vacancy as bar
-    # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
-    #                      marker_color='red', opacity=0.5,)
-    # fig.add_trace(vacancy_bar, row=1, col=1)
-    
+    def build_house_supply_chart():
+        fig = px.line(merged_df, 
+                     y=['house price all (idx 1999=100)', 'house total supply (num)'], 
+                     title='HK house price 🆚 supply & vacancy',
+                     facet_col="variable",
+                     facet_col_wrap=1,
+                     facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
+                     color=px.NO_COLOR,
+                     height=SINGLE_SUBPLOT_HEIGHT * 2,)
+        update_line_chart(fig)
+        fig.update_yaxes(matches=None)
+        fig.update_layout(showlegend=False, margin=dict(b=0))
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
+        draw_tendency_rects(fig, with_annotation=True)
+        # add vacancy as bar
+        # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
+        #                      marker_color='red', opacity=0.5,)
+        # fig.add_trace(vacancy_bar, row=1, col=1)
+        return fig
+
+    fig = cached_figure('hk-house-supply', panel_version, build_house_supply_chart)
     st.plotly_chart(fig, theme="streamlit")
     st.markdown("""
         **Note:** the sudden drop for house total supply in 2003 is due to the exclusion of village houses in the calculation. 
@@ -339,25 +270,28 @@ with supply_tab:
 with vacancy_tab:
     st.write('**When house vacancy is high, it negatively correlates with house price**')
     # house supply
-    fig = px.line(merged_df, 
-                 y=['house price all (idx 1999=100)', 'house vacancy all (%)'], 
-                 title='HK house price 🆚 supply & vacancy',
-                 facet_col="variable",
-                 facet_col_wrap=1,
-                 facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
-                 color=px.NO_COLOR,
-                 height=SINGLE_SUBPLOT_HEIGHT * 2,)
-    update_line_chart(fig)
-    fig.update_yaxes(matches=None)
-    fig.update_layout(showlegend=False, margin=dict(b=0))
-    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
-    fig.add_hline(y=5, line_dash="dot", line_color="pink", row=1)
-    draw_tendency_rects(fig, with_annotation=True)
-    # add vacancy as bar
-    # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
-    #                      marker_color='red', opacity=0.5,)
-    # fig.add_trace(vacancy_bar, row=1, col=1)
-    
+    def build_house_vacancy_chart():
+        fig = px.line(merged_df, 
+                     y=['house price all (idx 1999=100)', 'house vacancy all (%)'], 
+                     title='HK house price 🆚 supply & vacancy',
+                     facet_col="variable",
+                     facet_col_wrap=1,
+                     facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
+                     color=px.NO_COLOR,
+                     height=SINGLE_SUBPLOT_HEIGHT * 2,)
+        update_line_chart(fig)
+        fig.update_yaxes(matches=None)
+        fig.update_layout(showlegend=False, margin=dict(b=0))
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
+        fig.add_hline(y=5, line_dash="dot", line_color="pink", row=1)
+        draw_tendency_rects(fig, with_annotation=True)
+        # add vacancy as bar
+        # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
+        #                      marker_color='red', opacity=0.5,)
+        # fig.add_trace(vacancy_bar, row=1, col=1)
+        return fig
+
+    fig = cached_figure('hk-house-vacancy', panel_version, build_house_vacancy_chart)
     st.plotly_chart(fig, theme="streamlit")
     st.markdown("""
         **Note:** the sudden drop for house total supply in 2004 is due to the exclusion of village houses in the calculation. 
@@ -371,35 +305,39 @@ with vacancy_tab:
 
 with st.container():
     # bar graph
-    house_vacancy_df = merged_df[~merged_df['house occupied by tenants (num)'].isnull()]
-    house_vacancy_df.reset_index(drop=False, inplace=True)
-    bar = px.bar(house_vacancy_df,
-                    x='period',
-                    y=['house vacancy all (%)', 'house occupied by tenants (%)', 'house occupied by owners (%)'],
-                    title='See also: HK vacancy & occupied house percentage by year',
-                    labels={
-                        "variable": "category", 
-                        "value": "percentage (%)",
-                        "period": "year",},
-                    text_auto=True,
-                    hover_data={
-                        'house vacancy all (num)': ':,.0f',
-                        'house occupied by tenants (num)': ':,.0f',
-                        'house occupied by owners (num)': ':,.0f',
-                        'period': "|%Y"},
-                    barmode='stack',)
-    bar.update_xaxes(minor_ticks='inside', showgrid=True)
-    bar.update_layout(
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        ),
-        hovermode="x unified",
-        margin=dict(b=0),
-    )
+    def build_house_occupancy_chart():
+        house_vacancy_df = merged_df[~merged_df['house occupied by tenants (num)'].isnull()]
+        house_vacancy_df.reset_index(drop=False, inplace=True)
+        bar = px.bar(house_vacancy_df,
+                        x='period',
+                        y=['house vacancy all (%)', 'house occupied by tenants (%)', 'house occupied by owners (%)'],
+                        title='See also: HK vacancy & occupied house percentage by year',
+                        labels={
+                            "variable": "category", 
+                            "value": "percentage (%)",
+                            "period": "year",},
+                        text_auto=True,
+                        hover_data={
+                            'house vacancy all (num)': ':,.0f',
+                            'house occupied by tenants (num)': ':,.0f',
+                            'house occupied by owners (num)': ':,.0f',
+                            'period': "|%Y"},
+                        barmode='stack',)
+        bar.update_xaxes(minor_ticks='inside', showgrid=True)
+        bar.update_layout(
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            ),
+            hovermode="x unified",
+            margin=dict(b=0),
+        )
+        return bar
+
+    bar = cached_figure('hk-house-occupancy', panel_version, build_house_occupancy_chart)
     st.plotly_chart(bar, theme="streamlit")
 
 
@@ -411,25 +349,28 @@ st.subheader('Demand factors', divider='grey')
 with household_tab:
     st.write('**Household stats doesn\'t say much, as it\'s fairly steady**')
     # household
-    fig = px.line(merged_df, 
-                 y=['house price all (idx 1999=100)', 'households total (\'000)', 'households private owner-occupiers (%)'], 
-                 title='HK house price 🆚 household stats',
-                 facet_col="variable",
-                 facet_col_wrap=1,
-                 facet_row_spacing=TOTAL_FACET_ROW_SPACING / 3,
-                 color=px.NO_COLOR,
-                 height=SINGLE_SUBPLOT_HEIGHT * 3,)
-    update_line_chart(fig)
-    fig.update_yaxes(matches=None)
-    fig.update_layout(showlegend=False, margin=dict(b=0))
-    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
-    # fig.add_hline(y=50, line_dash="dot", line_color="pink", row=1)
-    draw_tendency_rects(fig, with_annotation=True)
-    # add vacancy as bar
-    # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
-    #                      marker_color='red', opacity=0.5,)
-    # fig.add_trace(vacancy_bar, row=1, col=1)
-    
+    def build_household_chart():
+        fig = px.line(merged_df, 
+                     y=['house price all (idx 1999=100)', 'households total (\'000)', 'households private owner-occupiers (%)'], 
+                     title='HK house price 🆚 household stats',
+                     facet_col="variable",
+                     facet_col_wrap=1,
+                     facet_row_spacing=TOTAL_FACET_ROW_SPACING / 3,
+                     color=px.NO_COLOR,
+                     height=SINGLE_SUBPLOT_HEIGHT * 3,)
+        update_line_chart(fig)
+        fig.update_yaxes(matches=None)
+        fig.update_layout(showlegend=False, margin=dict(b=0))
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
+        # fig.add_hline(y=50, line_dash="dot", line_color="pink", row=1)
+        draw_tendency_rects(fig, with_annotation=True)
+        # add vacancy as bar
+        # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
+        #                      marker_color='red', opacity=0.5,)
+        # fig.add_trace(vacancy_bar, row=1, col=1)
+        return fig
+
+    fig = cached_figure('hk-households', panel_version, build_household_chart)
     st.plotly_chart(fig, theme="streamlit")
     st.markdown("""
         **Observation:**
@@ -444,44 +385,39 @@ with interest_rate_tab:
     st.write('**Interest rate gives contradictory signals, therefore is a weak indicator**')
     if st.toggle('Show house price chart', value=False):
         # house price index
-        price_chart = px.line(merged_df[[house_price_index_column]], 
-                    title='💵HK avg house price index (1999=100)',
-                    # x='period', 
-                    # y=sel_columns, 
-                    markers=False,
-                    labels={"period": "time", "value": "price index"},
-                    )
-        update_line_chart(price_chart)
-        price_chart.update_layout(showlegend=False, margin=dict(b=0))
-        draw_tendency_rects(price_chart)
+        price_chart = cached_figure('hk-house-price', panel_version, build_house_price_chart)
         st.plotly_chart(price_chart, theme="streamlit")
     # interest rate
-    ir_df = merged_df[~merged_df['HIBOR 1M (% p.a.)'].isnull()]
-    ir_df.reset_index(drop=False, inplace=True)
-    interest_chart = px.line(ir_df, 
-                title='🏦Various interest rates in HK',
-                x='period', 
-                y=['H plan mortgage rate (% p.a.)', 'P plan mortgage rate (% p.a.)',
-                                        'HIBOR 1M (% p.a.)', 'best lending rate (% p.a.)'], 
-                markers=False,
-                labels={"period": "time", "value": "% p.a."},
-                hover_data={
-                    'period': False,
-                },)
-    update_line_chart(interest_chart)
-    interest_chart.update_layout(
-        showlegend=True, 
-        hovermode="x unified",
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=-0.2,
-            xanchor="right",
-            x=1
-        ), 
-        margin=dict(b=0))
-    draw_tendency_rects(interest_chart)
-    interest_chart.for_each_annotation(lambda a: a.update(text=a.text.replace(" (% p.a.)", "")))
+    def build_interest_rate_chart():
+        ir_df = merged_df[~merged_df['HIBOR 1M (% p.a.)'].isnull()]
+        ir_df.reset_index(drop=False, inplace=True)
+        interest_chart = px.line(ir_df, 
+                    title='🏦Various interest rates in HK',
+                    x='period', 
+                    y=['H plan mortgage rate (% p.a.)', 'P plan mortgage rate (% p.a.)',
+                                            'HIBOR 1M (% p.a.)', 'best lending rate (% p.a.)'], 
+                    markers=False,
+                    labels={"period": "time", "value": "% p.a."},
+                    hover_data={
+                        'period': False,
+                    },)
+        update_line_chart(interest_chart)
+        interest_chart.update_layout(
+            showlegend=True, 
+            hovermode="x unified",
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.2,
+                xanchor="right",
+                x=1
+            ), 
+            margin=dict(b=0))
+        draw_tendency_rects(interest_chart)
+        interest_chart.for_each_annotation(lambda a: a.update(text=a.text.replace(" (% p.a.)", "")))
+        return interest_chart
+
+    interest_chart = cached_figure('hk-interest-rates', panel_version, build_interest_rate_chart)
     st.plotly_chart(interest_chart, theme="streamlit")
    
     st.markdown("""
@@ -501,25 +437,28 @@ with interest_rate_tab:
 with circulation_rate_tab:
     st.write('**Currency in circulation greatly affects house price when in extreme**')
     # exchange rate
-    fig = px.line(merged_df, 
-                 y=['house price all (idx 1999=100)', 'exchange rate USD to HKD'], 
-                 title='HK house price 🆚 exchange rate of USD to HKD',
-                 facet_col="variable",
-                 facet_col_wrap=1,
-                 facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
-                 color=px.NO_COLOR,
-                 height=SINGLE_SUBPLOT_HEIGHT * 2,)
-    update_line_chart(fig)
-    fig.update_yaxes(matches=None)
-    fig.update_layout(showlegend=False, margin=dict(b=0))
-    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
-    fig.add_hline(y=7.8, line_dash="dot", line_color="pink", row=1, annotation_text="baseline rate", annotation_position="bottom right")
-    draw_tendency_rects(fig, with_annotation=True)
-    # add vacancy as bar
-    # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
-    #                      marker_color='red', opacity=0.5,)
-    # fig.add_trace(vacancy_bar, row=1, col=1)
-    
+    def build_currency_circulation_chart():
+        fig = px.line(merged_df, 
+                     y=['house price all (idx 1999=100)', 'exchange rate USD to HKD'], 
+                     title='HK house price 🆚 exchange rate of USD to HKD',
+                     facet_col="variable",
+                     facet_col_wrap=1,
+                     facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
+                     color=px.NO_COLOR,
+                     height=SINGLE_SUBPLOT_HEIGHT * 2,)
+        update_line_chart(fig)
+        fig.update_yaxes(matches=None)
+        fig.update_layout(showlegend=False, margin=dict(b=0))
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
+        fig.add_hline(y=7.8, line_dash="dot", line_color="pink", row=1, annotation_text="baseline rate", annotation_position="bottom right")
+        draw_tendency_rects(fig, with_annotation=True)
+        # add vacancy as bar
+        # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
+        #                      marker_color='red', opacity=0.5,)
+        # fig.add_trace(vacancy_bar, row=1, col=1)
+        return fig
+
+    fig = cached_figure('hk-currency-circulation', panel_version, build_currency_circulation_chart)
     st.plotly_chart(fig, theme="streamlit")
     st.markdown("""
         **Observation:**
@@ -536,25 +475,28 @@ with circulation_rate_tab:
 # Mainland capital
 with mainland_capital_tab:
     st.write('**Mainland capital largely influences HK house market**')
-    fig = px.line(merged_df, 
-                 y=['house price all (idx 1999=100)', 'exchange rate CNY to HKD'], 
-                 title='HK house price 🆚 exchange rate of CNY to HKD',
-                 facet_col="variable",
-                 facet_col_wrap=1,
-                 facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
-                 color=px.NO_COLOR,
-                 height=SINGLE_SUBPLOT_HEIGHT * 2,)
-    update_line_chart(fig)
-    fig.update_yaxes(matches=None)
-    fig.update_layout(showlegend=False, margin=dict(b=0))
-    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
-    fig.add_hline(y=1, line_dash="dot", line_color="pink", row=1, annotation_text="CNY:HKD=1:1", annotation_position="top right")
-    draw_tendency_rects(fig, with_annotation=True)
-    # add vacancy as bar
-    # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
-    #                      marker_color='red', opacity=0.5,)
-    # fig.add_trace(vacancy_bar, row=1, col=1)
-    
+    def build_mainland_capital_chart():
+        fig = px.line(merged_df, 
+                     y=['house price all (idx 1999=100)', 'exchange rate CNY to HKD'], 
+                     title='HK house price 🆚 exchange rate of CNY to HKD',
+                     facet_col="variable",
+                     facet_col_wrap=1,
+                     facet_row_spacing=TOTAL_FACET_ROW_SPACING / 2,
+                     color=px.NO_COLOR,
+                     height=SINGLE_SUBPLOT_HEIGHT * 2,)
+        update_line_chart(fig)
+        fig.update_yaxes(matches=None)
+        fig.update_layout(showlegend=False, margin=dict(b=0))
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", maxsplit=1)[-1]))
+        fig.add_hline(y=1, line_dash="dot", line_color="pink", row=1, annotation_text="CNY:HKD=1:1", annotation_position="top right")
+        draw_tendency_rects(fig, with_annotation=True)
+        # add vacancy as bar
+        # vacancy_bar = go.Bar(name='vacancy', x=merged_df.index, y=merged_df['house vacancy all (num)'], 
+        #                      marker_color='red', opacity=0.5,)
+        # fig.add_trace(vacancy_bar, row=1, col=1)
+        return fig
+
+    fig = cached_figure('hk-mainland-capital', panel_version, build_mainland_capital_chart)
     st.plotly_chart(fig, theme="streamlit")
     st.markdown("""
         **Observation:**
@@ -590,4 +532,4 @@ st.markdown("""
     
 # show raw data
 if st.toggle('Show raw data', value=False):
-    st.dataframe(merged_df)
\ No newline at end of file
+    render_paginated_table(merged_df, 'hk-raw-data', data_version=panel_version)
\ No newline at end of file
@@ -10,12 +10,13 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from BogoInsight.utils.data_utils import (
-    get_latest_data_source, load_df,
+    get_data_stamp, get_latest_data_source, load_df, reload_data,
 )
 from BogoInsight.utils.plot_utils import (
-    update_line_chart, gen_heatmap
+    update_line_chart, gen_heatmap, cached_figure
 )
 from BogoInsight.utils.router import render_toc
+from BogoInsight.utils.streamlit_utils import render_paginated_table
 
 # data category consts
 CAT_LLM = 'llm_specs'
@@ -36,14 +37,12 @@ with st.sidebar:
     render_toc()
     st.divider()
     
-    st.button('Reload data', on_click=lambda: st.cache_data.clear())
+    st.button('Reload data', on_click=reload_data)
 
 # get data
 ds_llm = get_latest_data_source(CAT_LLM)
-df_llm = load_df(ds_llm['path'])
-
-# set index
-df_llm.set_index('name', inplace=True)
+df_llm = load_df(ds_llm['path'], index_col='name', parse_dates=['period'])
+data_version = get_data_stamp(ds_llm['path'])
    
         
 # observe LLMs
@@ -120,47 +119,53 @@ with st.container():
         
         show_model_name = st.toggle('Show model name', key='show-llm-model', value=True)
     
-    # selected_df.fillna(-1, inplace=True)
-    fig = px.scatter(selected_df,
-                     title='🏅Large language model stats',
-                     x=x_axis_col,
-                     y=y_axis_col,
-                     log_y=(y_axis_col in ['input context window (K tkns)', 'max output tokens (K tkns)']),
-                     color='developer',
-                     size=size_col if size_col != 'none' else None,
-                     hover_name=selected_df.index,
-                     hover_data=selected_df.columns,
-                     text=selected_df.index if show_model_name else None,
-                     category_orders={
-                         'developer': ['OpenAI', 'Anthropic', 'Meta', 'Google', 'Aliyun']
-                     },
-                     color_discrete_map={
-                        'OpenAI': 'rgb(153, 153, 153)',
-                        'Anthropic': '#9d755d',
-                        'Meta': 'rgb(131, 201, 255)',
-                        'Google': '#ab63fa',
-                        'Aliyun': '#ffa15a',
-                        'Baidu': 'rgb(125, 139, 161)',
-                        'Huawei': '#d62728',
-                        'Mistral AI': '#eeca3b',
-                        'x.AI': 'rgb(179, 179, 179)',
-                        '01.AI': 'rgb(41, 176, 157)',
-                        'Zhipu AI': '#3366cc',
-                        'Moonshot': '#ff9da6',
-                     }
-                    )
-    fig.update_traces(textposition="bottom center")
-    fig.update_layout(legend_title_text=f'Developer', margin=dict(b=0))
-    # fig.update_layout(legend=dict(
-    #     orientation="h",
-    #     yanchor="bottom",
-    #     y=1.02,
-    #     xanchor="right",
-    #     x=1
-    # ))
-    fig.update_xaxes(minor_ticks='inside', showgrid=True)
-    # if y_axis_col == 'fab (nm)':
-    #     fig.update_yaxes(tickvals=[2, 3, 5, 7, 10, 14])
+    def build_stats_chart():
+        # selected_df.fillna(-1, inplace=True)
+        fig = px.scatter(selected_df,
+                         title='🏅Large language model stats',
+                         x=x_axis_col,
+                         y=y_axis_col,
+                         log_y=(y_axis_col in ['input context window (K tkns)', 'max output tokens (K tkns)']),
+                         color='developer',
+                         size=size_col if size_col != 'none' else None,
+                         hover_name=selected_df.index,
+                         hover_data=selected_df.columns,
+                         text=selected_df.index if show_model_name else None,
+                         category_orders={
+                             'developer': ['OpenAI', 'Anthropic', 'Meta', 'Google', 'Aliyun']
+                         },
+                         color_discrete_map={
+                            'OpenAI': 'rgb(153, 153, 153)',
+                            'Anthropic': '#9d755d',
+                            'Meta': 'rgb(131, 201, 255)',
+                            'Google': '#ab63fa',
+                            'Aliyun': '#ffa15a',
+                            'Baidu': 'rgb(125, 139, 161)',
+                            'Huawei': '#d62728',
+                            'Mistral AI': '#eeca3b',
+                            'x.AI': 'rgb(179, 179, 179)',
+                            '01.AI': 'rgb(41, 176, 157)',
+                            'Zhipu AI': '#3366cc',
+                            'Moonshot': '#ff9da6',
+                         }
+                        )
+        fig.update_traces(textposition="bottom center")
+        fig.update_layout(legend_title_text=f'Developer', margin=dict(b=0))
+        # fig.update_layout(legend=dict(
+        #     orientation="h",
+        #     yanchor="bottom",
+        #     y=1.02,
+        #     xanchor="right",
+        #     x=1
+        # ))
+        fig.update_xaxes(minor_ticks='inside', showgrid=True)
+        # if y_axis_col == 'fab (nm)':
+        #     fig.update_yaxes(tickvals=[2, 3, 5, 7, 10, 14])
+        return fig
+
+    fig = cached_figure('llm-stats', data_version, build_stats_chart,
+                        x=x_axis_col, y=y_axis_col, size=size_col, focus=focus_select, source_access=is_open_source,
+                        developers=company_filter, period_range=(start_period, end_period), show_model_name=show_model_name)
     st.plotly_chart(fig, theme="streamlit")
     if size_col != 'none':
         st.caption(f'Point size depicts {size_col}.')
@@ -246,64 +251,74 @@ with st.container():
                     st.warning('Please select at least 1 model.')
                 else:
                     df_arena_sel = df_arena.loc[models]
-                    # bar chart     
-                    bar_fig = px.bar(
-                        df_arena_sel,
-                        x=df_arena_sel.index,
-                        y=dimensions,
-                        title='Bar chart',
-                        color=df_arena_sel.index,
-                        text_auto=True,
-                        facet_col="variable",
-                        facet_col_wrap=3,
-                        facet_row_spacing=0.1,
-                        facet_col_spacing=0.1,
-                        height=SINGLE_SUBPLOT_HEIGHT * math.ceil(len(dimensions) / 3),
-                    )
-                    bar_fig.update_yaxes(
-                        matches=None,
-                        showticklabels=True,
-                    )
-                    bar_fig.update_xaxes(
-                        # matches=None,
-                        showticklabels=False,
-                        title_text='',
-                    )
-                    bar_fig.update_layout(
-                        showlegend=True, 
-                        margin=dict(b=0),
-                        legend_title_text=f'Model',
-                    )
-                    for d_idx, d in enumerate(dimensions):
-                        if d in RANGE_100_BENCHMARKS:
-                            bar_fig.update_yaxes(range=[0, 101], row=math.ceil(len(dimensions) / 3) - math.floor(d_idx / 3), col=d_idx % 3 + 1)
-                            # bar_fig.update_yaxes(range=[0, 101], row=1, col=1)
-                    bar_fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+                    def build_arena_bar_chart():
+                        # bar chart     
+                        bar_fig = px.bar(
+                            df_arena_sel,
+                            x=df_arena_sel.index,
+                            y=dimensions,
+                            title='Bar chart',
+                            color=df_arena_sel.index,
+                            text_auto=True,
+                            facet_col="variable",
+                            facet_col_wrap=3,
+                            facet_row_spacing=0.1,
+                            facet_col_spacing=0.1,
+                            height=SINGLE_SUBPLOT_HEIGHT * math.ceil(len(dimensions) / 3),
+                        )
+                        bar_fig.update_yaxes(
+                            matches=None,
+                            showticklabels=True,
+                        )
+                        bar_fig.update_xaxes(
+                            # matches=None,
+                            showticklabels=False,
+                            title_text='',
+                        )
+                        bar_fig.update_layout(
+                            showlegend=True, 
+                            margin=dict(b=0),
+                            legend_title_text=f'Model',
+                        )
+                        for d_idx, d in enumerate(dimensions):
+                            if d in RANGE_100_BENCHMARKS:
+                                bar_fig.update_yaxes(range=[0, 101], row=math.ceil(len(dimensions) / 3) - math.floor(d_idx / 3), col=d_idx % 3 + 1)
+                                # bar_fig.update_yaxes(range=[0, 101], row=1, col=1)
+                        bar_fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+                        return bar_fig
+
+                    bar_fig = cached_figure('llm-arena-bar', data_version, build_arena_bar_chart,
+                                            dimensions=dimensions, models=models)
                     st.plotly_chart(bar_fig, theme="streamlit")
                     # radar chart
-                    radar_fig = go.Figure()
-                    for model in models:
-                        radar_fig.add_trace(go.Scatterpolar(
-                            r=df_arena_sel.loc[model].values,
-                            theta=dimensions,
-                            fill='toself',
-                            name=model,
-                        ))
-                    radar_fig.update_layout(
-                        title='Radar chart',
-                        polar=dict(
-                            radialaxis=dict(
-                                visible=True,
-                                # autorange=True,
-                                # showticklabels=False,
-                                showline=False,
-                                ticks='',
-                                range=[0, 100] if idx == 0 and 'LMSYS Arena Elo' not in dimensions else None,
+                    def build_arena_radar_chart():
+                        radar_fig = go.Figure()
+                        for model in models:
+                            radar_fig.add_trace(go.Scatterpolar(
+                                r=df_arena_sel.loc[model].values,
+                                theta=dimensions,
+                                fill='toself',
+                                name=model,
+                            ))
+                        radar_fig.update_layout(
+                            title='Radar chart',
+                            polar=dict(
+                                radialaxis=dict(
+                                    visible=True,
+                                    # autorange=True,
+                                    # showticklabels=False,
+                                    showline=False,
+                                    ticks='',
+                                    range=[0, 100] if idx == 0 and 'LMSYS Arena Elo' not in dimensions else None,
+                                ),
                             ),
-                        ),
-                        margin=dict(b=20),
-                        showlegend=True,
-                    )
+                            margin=dict(b=20),
+                            showlegend=True,
+                        )
+                        return radar_fig
+
+                    radar_fig = cached_figure('llm-arena-radar', data_version, build_arena_radar_chart,
+                                              tab=idx, dimensions=dimensions, models=models)
                     st.plotly_chart(radar_fig, theme="streamlit")
 
     # benchmarks
@@ -468,36 +483,41 @@ with st.container():
             df_bm.dropna(subset=[bm_config['name']], inplace=True)
             df_bm = df_bm.sort_values(by=bm_config['name'], ascending=False)
             df_bm = df_bm.head(10)
-            # df_bm.fillna(-1, inplace=True)
-            # bar chart     
-            bar_fig = px.bar(
-                df_bm,
-                x=df_bm.index,
-                y=[bm_config['name']],
-                title=title,
-                color=df_bm.index,
-                text_auto=True,
-                hover_name=df_bm.index,
-                hover_data=set(df_bm.columns) - set([bm_config['name']]),
-                height=SINGLE_SUBPLOT_HEIGHT * 2,
-            )
-            bar_fig.update_yaxes(
-                matches=None,
-                showticklabels=True,
-                title_text='value' if bm_config['name'] == 'LMSYS Arena Elo' else 'accuracy (%)',
-                range=[0, 101] if bm_config['name'] in RANGE_100_BENCHMARKS else None,
-            )
-            bar_fig.update_xaxes(
-                # matches=None,
-                showticklabels=True,
-                title_text='model',
-            )
-            bar_fig.update_layout(
-                showlegend=False, 
-                margin=dict(b=0),
-                legend_title_text=f'Model'
-            )
-            bar_fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+            def build_benchmark_chart():
+                # df_bm.fillna(-1, inplace=True)
+                # bar chart     
+                bar_fig = px.bar(
+                    df_bm,
+                    x=df_bm.index,
+                    y=[bm_config['name']],
+                    title=title,
+                    color=df_bm.index,
+                    text_auto=True,
+                    hover_name=df_bm.index,
+                    hover_data=set(df_bm.columns) - set([bm_config['name']]),
+                    height=SINGLE_SUBPLOT_HEIGHT * 2,
+                )
+                bar_fig.update_yaxes(
+                    matches=None,
+                    showticklabels=True,
+                    title_text='value' if bm_config['name'] == 'LMSYS Arena Elo' else 'accuracy (%)',
+                    range=[0, 101] if bm_config['name'] in RANGE_100_BENCHMARKS else None,
+                )
+                bar_fig.update_xaxes(
+                    # matches=None,
+                    showticklabels=True,
+                    title_text='model',
+                )
+                bar_fig.update_layout(
+                    showlegend=False, 
+                    margin=dict(b=0),
+                    legend_title_text=f'Model'
+                )
+                bar_fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+                return bar_fig
+
+            bar_fig = cached_figure('llm-benchmark', data_version, build_benchmark_chart,
+                                    benchmark=bm_config['name'], source_access=is_open_source)
             st.plotly_chart(bar_fig, theme="streamlit")
                
     
@@ -524,6 +544,6 @@ with st.container():
             min_value=0,
             max_value=100,
         )
-    st.dataframe(df_llm, column_config=column_config)
+    render_paginated_table(df_llm, 'llm-raw-data', data_version=data_version, column_config=column_config)
     st.caption('\* estimated value')
         
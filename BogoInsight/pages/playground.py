@@ -9,12 +9,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from BogoInsight.utils.logger import logger
 from BogoInsight.utils.data_utils import (
-    get_data_sources, load_df,
+    get_data_sources, get_data_stamp, load_df, reload_data,
 )
 from BogoInsight.utils.plot_utils import (
     update_line_chart, gen_heatmap
 )
+from BogoInsight.utils.correlation import get_correlation_stats
 from BogoInsight.utils.router import render_toc
+from BogoInsight.utils.streamlit_utils import render_paginated_table
 # from BogoInsight.database.session import Session, engine
 
 MAX_DS_SELECTION = 3
@@ -66,7 +68,7 @@ with st.sidebar:
         format_func=lambda d:f"{d['category']} ({d['name']})",
         max_selections=MAX_DS_SELECTION,
     )
-    st.button('Reload data', on_click=lambda: st.cache_data.clear())
+    st.button('Reload data', on_click=reload_data)
 
 if len(sel_data_sources) == 0:
     st.warning('Please select at least 1 data source.', icon='🚨')
@@ -79,9 +81,11 @@ else:
         with tab:
             # get df
             df = dfs[idx]
+            ds_path = sel_data_sources[idx]['path']
+            data_version = (ds_path, get_data_stamp(ds_path))
             
             if st.checkbox('Show raw data', key=f"show_raw_data_{idx}"):
-                st.dataframe(df)
+                render_paginated_table(df, f"raw_data_{idx}", data_version=data_version)
             
             # select columns
             y_columns = [col for col in df.columns if col not in ['period']]
@@ -103,7 +107,7 @@ else:
             update_line_chart(fig)
             
             # heatmap for correlation
-            corr_matrix = df[sel_columns].corr(numeric_only=True)
+            corr_matrix = get_correlation_stats(df, 'data_source', data_version).corr(sel_columns)
             heatmap = gen_heatmap(corr_matrix, 
                                   title='🔥Heatmap for correlation',)
             
@@ -126,8 +130,9 @@ else:
             merged_df = merged_df.join(df, on='period', how='outer', sort=True)
         if 'period' in merged_df.columns:
             merged_df.set_index('period', inplace=True)
+        combined_data_version = tuple((ds['path'], get_data_stamp(ds['path'])) for ds in sel_data_sources)
         if st.checkbox('Show combined raw data'):
-            st.write(merged_df)
+            render_paginated_table(merged_df, 'combined_raw_data', data_version=combined_data_version)
             
         # select columns
         y_columns = [col for col in merged_df.columns if col not in ['period']]
@@ -155,7 +160,8 @@ else:
         update_line_chart(fig)
         
         # heatmap for correlation
-        corr_matrix = selected_df[sel_columns].corr(numeric_only=True)
+        corr_matrix = get_correlation_stats(merged_df, 'combined', combined_data_version).corr_between(
+            start_period, end_period, sel_columns)
         heatmap = gen_heatmap(corr_matrix, 
                             title='🔥Heatmap for correlation',)
 
@@ -0,0 +1,269 @@
+import datetime
+import hashlib
+import json
+import os
+import sys
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.crawlers.base_crawler import DATA_DIR
+from BogoInsight.utils.catalog import get_latest_entry, load_catalog, record_export
+from BogoInsight.utils.data_utils import read_df
+from BogoInsight.utils.derived_metrics import (
+    add, col, compute_metrics, minimum, mul, ratio, round_, shift, sub
+)
+from BogoInsight.utils.logger import logger
+
+PANEL_CATEGORY = 'hong_kong_house_price_panel'
+
+# input categories and the columns used from each, joined in this order
+PANEL_SOURCES = [
+    {
+        'category': 'hong_kong_house_price_index',
+        'columns': [
+            'house price all (idx 1999=100)',
+            'house price growth all (% rate MoM)',
+        ],
+    },
+    {
+        'category': 'hong_kong_house_rental_index',
+        'columns': [
+            'house rental all (idx 1999=100)',
+            'house rental growth all (% rate MoM)',
+        ],
+    },
+    {
+        'category': 'hong_kong_house_vacancy',
+        'columns': [
+            'house vacancy all (num)',
+            'house vacancy all (%)',
+            'house vacancy growth all (% rate YoY)',
+        ],
+    },
+    {
+        'category': 'hong_kong_household_count',
+        'columns': [
+            'households total (\'000)',
+            'households private owner-occupiers (%)',
+            'households private owner-occupiers (\'000)',
+            'household growth rate (%)',
+        ],
+    },
+    {
+        'category': 'hong_kong_gdp_growth',
+        'columns': [
+            'GDP chained (2021) (HK$M)',
+            'GDP seasonally adjusted (% QoQ rate)',
+            'implicit price deflator (% YoY rate)',
+        ],
+    },
+    {
+        'category': 'hong_kong_interest_rate',
+        'columns': [
+            'best lending rate (% p.a.)',
+        ],
+    },
+    {
+        'category': 'hibor',
+        'columns': [
+            'HIBOR 1M (% p.a.)',
+        ],
+    },
+    {
+        'category': 'hong_kong_exchange_rate',
+        'columns': [
+            'exchange rate CNY to HKD',
+            'exchange rate USD to HKD',
+        ],
+    },
+    {
+        'category': 'hong_kong_foreign_investment',
+        'columns': [
+            'year end direct investment position all (HK$B)',
+            'year end direct investment position CN (HK$B)',
+            'year end direct investment position GB (HK$B)',
+            'year end direct investment position VG (HK$B)',
+            'year end direct investment position KY (HK$B)',
+        ],
+    },
+]
+
+# derived columns, computed in order after joining
+PANEL_METRICS = [
+    {
+        'name': 'house total supply (num)',
+        'expr': round_(ratio(col('house vacancy all (num)'), col('house vacancy all (%)'), scale=100)),
+    },
+    {
+        'name': 'house occupied all (num)',
+        'expr': sub(col('house total supply (num)'), col('house vacancy all (num)')),
+    },
+    {
+        'name': 'house occupied by owners (num)',
+        'expr': shift(mul(col('households private owner-occupiers (\'000)'), 1000), 1),
+    },
+    {
+        'name': 'house occupied by tenants (num)',
+        'expr': sub(col('house occupied all (num)'), col('house occupied by owners (num)')),
+    },
+    {
+        'name': 'house occupied by tenants (%)',
+        'expr': round_(ratio(col('house occupied by tenants (num)'), col('house total supply (num)'), scale=100), 1),
+    },
+    {
+        'name': 'house occupied by owners (%)',
+        'expr': round_(ratio(col('house occupied by owners (num)'), col('house total supply (num)'), scale=100), 1),
+    },
+    {
+        'name': 'P plan mortgage rate (% p.a.)',
+        'expr': sub(col('best lending rate (% p.a.)'), 1.75),
+    },
+    {
+        # capped at the P plan rate
+        'name': 'H plan mortgage rate (% p.a.)',
+        'expr': minimum(sub(col('best lending rate (% p.a.)'), 1.75), add(col('HIBOR 1M (% p.a.)'), 1.3)),
+    },
+]
+
+PANEL_START = '1995-01-01'
+
+HOUSE_PRICE_INDEX_COLUMN = 'house price all (idx 1999=100)'
+
+
+def _get_latest_path(data_dir, catalog, category):
+    entry = get_latest_entry(catalog, category)
+    if entry is not None and os.path.exists(os.path.join(data_dir, entry['path'])):
+        return os.path.join(data_dir, entry['path'])
+    # not in the catalog, scan the category folder
+    category_dir = os.path.join(data_dir, category)
+    files = [file for file in os.listdir(category_dir) if file.endswith('.csv')] if os.path.isdir(category_dir) else []
+    if not files:
+        raise FileNotFoundError(f"No data source found in category: {category}")
+    return os.path.join(category_dir, max(files))
+
+
+def get_input_paths(data_dir=DATA_DIR):
+    """
+    Returns the latest version path of each input category.
+    """
+    catalog = load_catalog(data_dir)
+    return {source['category']: _get_latest_path(data_dir, catalog, source['category']) for source in PANEL_SOURCES}
+
+
+def get_inputs_hash(data_dir=DATA_DIR, catalog=None):
+    """
+    Returns a short hash identifying the current input versions, from the catalog, loaded if not given.
+    A version is the latest export of a category, together with the time it was recorded, so that a re-export on the same day counts as a new version.
+    """
+    if catalog is None:
+        catalog = load_catalog(data_dir)
+    versions = []
+    for source in PANEL_SOURCES:
+        entry = get_latest_entry(catalog, source['category'])
+        if entry is None:
+            raise FileNotFoundError(f"No data source found in the catalog for category: {source['category']}")
+        versions.append([source['category'], entry['path'], entry['updated_at']])
+    return hashlib.sha1(json.dumps(versions).encode()).hexdigest()[:12]
+
+
+def get_panel_path(data_dir=DATA_DIR, inputs_hash=None, catalog=None):
+    """
+    Returns the path of the panel built from the current input versions, or None if it is missing or outdated.
+    Looked up in the catalog, loaded if not given. `inputs_hash` is that of `get_inputs_hash()`, computed if not given.
+    """
+    if catalog is None:
+        catalog = load_catalog(data_dir)
+    if inputs_hash is None:
+        inputs_hash = get_inputs_hash(data_dir, catalog)
+    category_entry = catalog['categories'].get(PANEL_CATEGORY)
+    if not category_entry:
+        return None
+    versions = [version for version in category_entry['versions'] if version.endswith(f'_{inputs_hash}')]
+    if not versions:
+        return None
+    panel_path = os.path.join(data_dir, category_entry['versions'][max(versions)]['path'])
+    return panel_path if os.path.exists(panel_path) else None
+
+
+def build_panel(data_dir=DATA_DIR):
+    """
+    Joins the input sources on period and computes the derived columns used by the HK house price page.
+    """
+    input_paths = get_input_paths(data_dir)
+    panel = pd.concat([
+        read_df(input_paths[source['category']], columns=source['columns'],
+                index_col='period', parse_dates=['period'], downcast=True)
+        for source in PANEL_SOURCES
+    ], axis=1, join='outer', sort=True)
+    panel.index.name = 'period'
+    panel = panel.loc[PANEL_START:].copy()
+    panel = compute_metrics(panel, PANEL_METRICS)
+    # rename columns
+    panel.rename(columns={
+        'GDP seasonally adjusted (% QoQ rate)': 'GDP growth rate (%)',
+        'implicit price deflator (% YoY rate)': 'inflation rate (%)'
+    }, inplace=True)
+    return panel
+
+
+def export_panel(data_dir=DATA_DIR, force=False):
+    """
+    Builds and exports the panel to `{data_dir}/hong_kong_house_price_panel/{YYYYMMDD}_{inputs hash}.csv`,
+    plus a Parquet file next to it, unless a panel of the current input versions already exists.
+    Older panels of the same day are removed.
+    Returns the panel path.
+    """
+    catalog = load_catalog(data_dir)
+    inputs_hash = get_inputs_hash(data_dir, catalog)
+    panel_path = get_panel_path(data_dir, inputs_hash, catalog)
+    if panel_path is not None and not force:
+        logger.info(f"Panel {PANEL_CATEGORY} is up to date: {panel_path}")
+        return panel_path
+    panel = build_panel(data_dir)
+    current_date = datetime.datetime.now().strftime("%Y%m%d")
+    panel_dir = os.path.join(data_dir, PANEL_CATEGORY)
+    os.makedirs(panel_dir, exist_ok=True)
+    for file in os.listdir(panel_dir):
+        if file.startswith(f'{current_date}_'):
+            os.remove(os.path.join(panel_dir, file))
+    panel_path = os.path.join(panel_dir, f'{current_date}_{inputs_hash}.csv')
+    panel.to_csv(panel_path)
+    try:
+        panel.to_parquet(f'{os.path.splitext(panel_path)[0]}.parquet')
+    except ImportError as e:
+        logger.warning(f"Skipped Parquet export for {PANEL_CATEGORY}: {e}")
+    record_export(panel_path, panel)
+    logger.info(f"Exported panel {PANEL_CATEGORY}: {panel_path}")
+    return panel_path
+
+
+def describe_tendency_ranges(panel, tendency_ranges):
+    """
+    Returns copies of the given rise & fall time ranges,
+    filled in with their index, tendency, house price change and duration.
+    """
+    described_ranges = []
+    for idx, tr in enumerate(tendency_ranges):
+        tr = dict(tr)
+        start_value = panel.loc[tr['start'], HOUSE_PRICE_INDEX_COLUMN]
+        end_value = panel.loc[tr['end'], HOUSE_PRICE_INDEX_COLUMN]
+        tr['idx'] = idx + 1
+        tr['tendency'] = 'rise' if end_value > start_value else 'fall'
+        tr['pct_change'] = (end_value - start_value) / start_value * 100
+        # Calculate the duration in years and months
+        start_date = pd.to_datetime(tr['start'])
+        end_date = pd.to_datetime(tr['end'])
+        years = end_date.year - start_date.year
+        months = end_date.month - start_date.month
+        # Adjust if end month is less than start month
+        if months < 0:
+            years -= 1
+            months += 12
+        tr['duration'] = f'{years} years {months} months' if years > 0 else f'{months} months'
+        described_ranges.append(tr)
+    return described_ranges
+
+
+if __name__ == "__main__":
+    print(export_panel(force='--force' in sys.argv))
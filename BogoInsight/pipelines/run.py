@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.crawlers.base_crawler import DATA_DIR
+from BogoInsight.pipelines import hk_house_price_panel
+from BogoInsight.utils.logger import logger
+
+# stages run after crawled data is refreshed, each one exports its own artifact
+PIPELINES = [
+    hk_house_price_panel.export_panel,
+]
+
+
+def run_pipelines(data_dir=DATA_DIR, force=False):
+    """
+    Runs all pipeline stages, each one only rebuilds its artifact if its inputs have a new version.
+    Returns a dict of stage name to exported path, or None if the stage failed.
+    """
+    results = {}
+    for stage in PIPELINES:
+        name = f'{stage.__module__}.{stage.__name__}'
+        try:
+            results[name] = stage(data_dir, force=force)
+        except Exception as e:
+            logger.error(f"Pipeline stage {name} failed: {e}")
+            results[name] = None
+    return results
+
+
+if __name__ == "__main__":
+    for name, path in run_pipelines(force='--force' in sys.argv).items():
+        print(f"{name}: {path}")
@@ -0,0 +1,84 @@
+# BogoInsight/services/async_catalog_service.py
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import joinedload
+from BogoInsight.models.data_source import DataSource
+from BogoInsight.models.data_version import DataVersion
+from BogoInsight.database.async_session import async_session_scope
+
+class AsyncDataSourceService:
+    """
+    Asyncio variant of the catalog operations of DataSourceService.
+    """
+
+    @staticmethod
+    async def get_data_source(id):
+        async with async_session_scope() as session:
+            data_source = await session.get(DataSource, id, options=[joinedload(DataSource.latest_version)])
+        return data_source
+
+    @staticmethod
+    async def get_data_sources(limit=None, offset=None):
+        async with async_session_scope() as session:
+            result = await session.scalars(
+                select(DataSource).options(joinedload(DataSource.latest_version)).limit(limit).offset(offset))
+            data_sources = result.unique().all()
+        return data_sources
+
+    @staticmethod
+    async def update_data_source(id, data_source_update):
+        async with async_session_scope() as session:
+            data_source = await session.get(DataSource, id)
+            for key, value in data_source_update.items():
+                setattr(data_source, key, value)
+        return data_source
+
+    @staticmethod
+    async def get_latest_version(category):
+        """
+        Returns the latest DataVersion of the data source whose name matches a data category, or None.
+        """
+        async with async_session_scope() as session:
+            result = await session.scalars(
+                select(DataSource).options(joinedload(DataSource.latest_version)).where(
+                    func.lower(func.replace(DataSource.name, ' ', '_')) == category.lower()
+                ).limit(1))
+            data_source = result.first()
+        return data_source.latest_version if data_source is not None else None
+
+    @staticmethod
+    async def record_version(data_source_id, data_version):
+        """
+        Adds a new DataVersion and sets it as the latest version of the data source, in a single transaction.
+        """
+        async with async_session_scope() as session:
+            session.add(data_version)
+            await session.flush()
+            await session.execute(
+                update(DataSource).where(DataSource.id == data_source_id).values(latest_version_id=data_version.id))
+        return data_version
+
+class AsyncDataVersionService:
+    """
+    Asyncio variant of DataVersionService.
+    """
+
+    @staticmethod
+    async def create_data_version(data_version):
+        async with async_session_scope() as session:
+            session.add(data_version)
+            await session.flush()
+            await session.refresh(data_version)
+        return data_version
+
+    @staticmethod
+    async def get_data_version(id):
+        async with async_session_scope() as session:
+            data_version = await session.get(DataVersion, id)
+        return data_version
+
+    @staticmethod
+    async def get_data_versions(limit=None, offset=None):
+        async with async_session_scope() as session:
+            result = await session.scalars(select(DataVersion).limit(limit).offset(offset))
+            data_versions = result.all()
+        return data_versions
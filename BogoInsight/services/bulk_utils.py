@@ -0,0 +1,81 @@
+# BogoInsight/services/bulk_utils.py
+from contextlib import contextmanager
+from sqlalchemy import insert, select, update
+from BogoInsight.database.session import session_scope
+
+# max number of ids / keys in one IN clause, and of rows in one executemany
+BATCH_SIZE = 500
+
+@contextmanager
+def _use_session(session):
+    """
+    Uses the given session as is, or opens a new session scope.
+    """
+    if session is not None:
+        yield session
+    else:
+        with session_scope() as session:
+            yield session
+
+def _batches(items, batch_size=BATCH_SIZE):
+    for i in range(0, len(items), batch_size):
+        yield items[i:i + batch_size]
+
+def bulk_create(model, rows, session=None):
+    """
+    Inserts rows (dicts of column values) in executemany batches, in a single transaction.
+    Returns the number of inserted rows. Ids are not returned, as MySQL can't return them for batched inserts.
+    """
+    if not rows:
+        return 0
+    with _use_session(session) as session:
+        for batch in _batches(rows):
+            session.execute(insert(model), batch)
+    return len(rows)
+
+def bulk_update(model, rows, session=None):
+    """
+    Updates rows by primary key, each row being a dict with `id` and the columns to update, in a single transaction.
+    Returns the number of updated rows.
+    """
+    if not rows:
+        return 0
+    with _use_session(session) as session:
+        for batch in _batches(rows):
+            session.execute(update(model), batch)
+    return len(rows)
+
+def bulk_upsert(model, rows, key, session=None):
+    """
+    Inserts rows, or updates the existing rows with the same `key` column value, in a single transaction.
+    Returns a dict of key value to id of all given rows.
+    """
+    key_column = getattr(model, key)
+    keys = list(dict.fromkeys(row[key] for row in rows))
+    with _use_session(session) as session:
+        existing_ids = _get_ids_by_keys(session, model, key_column, keys)
+        new_rows = [row for row in rows if row[key] not in existing_ids]
+        updated_rows = [{**row, 'id': existing_ids[row[key]]} for row in rows if row[key] in existing_ids]
+        bulk_create(model, new_rows, session=session)
+        bulk_update(model, updated_rows, session=session)
+        ids = _get_ids_by_keys(session, model, key_column, keys)
+    return ids
+
+def get_by_ids(model, ids, options=(), session=None):
+    """
+    Fetches rows by ids in batched IN queries, returned in the order of the given ids. Missing ids are skipped.
+    """
+    ids = list(dict.fromkeys(ids))
+    objects = {}
+    with _use_session(session) as session:
+        for batch in _batches(ids):
+            for obj in session.scalars(select(model).options(*options).where(model.id.in_(batch))).unique():
+                objects[obj.id] = obj
+    return [objects[id] for id in ids if id in objects]
+
+def _get_ids_by_keys(session, model, key_column, keys):
+    ids = {}
+    for batch in _batches(keys):
+        for key_value, id in session.execute(select(key_column, model.id).where(key_column.in_(batch))):
+            ids[key_value] = id
+    return ids
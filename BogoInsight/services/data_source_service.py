@@ -1,42 +1,122 @@
-# BogoInsight/services/data_source_service.py
+import os
+import threading
+import time
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 from BogoInsight.models.data_source import DataSource
 from BogoInsight.models.data_version import DataVersion
-from BogoInsight.database.session import Session
+from BogoInsight.database.session import session_scope
+from BogoInsight.services.bulk_utils import bulk_create, bulk_update, bulk_upsert, get_by_ids
+
+# seconds a looked up latest version is reused before querying again
+LATEST_VERSION_TTL = int(os.getenv('LATEST_VERSION_TTL', 60))
+
+_latest_version_cache = {}
+_latest_version_cache_lock = threading.Lock()
 
 class DataSourceService:
     @staticmethod
     def create_data_source(data_source):
-        session = Session()
-        session.add(data_source)
-        session.commit()
-        session.refresh(data_source)
+        with session_scope() as session:
+            session.add(data_source)
+            session.flush()
+            session.refresh(data_source)
         return data_source
 
     @staticmethod
     def get_data_source(id):
-        session = Session()
-        data_source = session.query(DataSource).options(joinedload(DataSource.latest_version)).get(id)
+        with session_scope() as session:
+            data_source = session.query(DataSource).options(joinedload(DataSource.latest_version)).get(id)
         return data_source
 
     @staticmethod
     def get_data_sources(limit=None, offset=None):
-        session = Session()
-        data_sources = session.query(DataSource).options(joinedload(DataSource.latest_version)).limit(limit).offset(offset).all()
+        with session_scope() as session:
+            data_sources = session.query(DataSource).options(joinedload(DataSource.latest_version)).limit(limit).offset(offset).all()
         return data_sources
 
     @staticmethod
     def update_data_source(id, data_source_update):
-        session = Session()
-        data_source = session.query(DataSource).get(id)
-        for key, value in data_source_update.items():
-            setattr(data_source, key, value)
-        session.commit()
+        with session_scope() as session:
+            data_source = session.query(DataSource).get(id)
+            for key, value in data_source_update.items():
+                setattr(data_source, key, value)
+        DataSourceService.clear_latest_version_cache()
         return data_source
 
+    @staticmethod
+    def record_version(data_source_id, data_version):
+        """
+        Adds a new DataVersion and sets it as the latest version of the data source, in a single transaction.
+        """
+        with session_scope() as session:
+            session.add(data_version)
+            session.flush()
+            session.query(DataSource).filter(DataSource.id == data_source_id).update(
+                {DataSource.latest_version_id: data_version.id}, synchronize_session=False)
+            session.refresh(data_version)
+        DataSourceService.clear_latest_version_cache()
+        return data_version
+
     @staticmethod
     def delete_data_source(id):
-        session = Session()
-        data_source = session.query(DataSource).get(id)
-        session.delete(data_source)
-        session.commit()
\ No newline at end of file
+        with session_scope() as session:
+            data_source = session.query(DataSource).get(id)
+            session.delete(data_source)
+        DataSourceService.clear_latest_version_cache()
+
+    @staticmethod
+    def get_latest_version(category):
+        """
+        Returns the latest DataVersion of the data source whose name matches a data category,
+        e.g. 'hibor' for 'HIBOR', or None if there is none.
+        Read-through cached in process for LATEST_VERSION_TTL seconds.
+        """
+        now = time.monotonic()
+        with _latest_version_cache_lock:
+            cached = _latest_version_cache.get(category)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        with session_scope() as session:
+            data_source = session.query(DataSource).options(joinedload(DataSource.latest_version)).filter(
+                func.lower(func.replace(DataSource.name, ' ', '_')) == category.lower()
+            ).first()
+            latest_version = data_source.latest_version if data_source is not None else None
+        with _latest_version_cache_lock:
+            _latest_version_cache[category] = (now + LATEST_VERSION_TTL, latest_version)
+        return latest_version
+
+    @staticmethod
+    def clear_latest_version_cache():
+        with _latest_version_cache_lock:
+            _latest_version_cache.clear()
+
+    @staticmethod
+    def create_data_sources(rows):
+        """
+        Inserts data sources from dicts of column values in a single transaction.
+        """
+        return bulk_create(DataSource, rows)
+
+    @staticmethod
+    def upsert_data_sources(rows):
+        """
+        Inserts data sources, or updates the ones with the same `name`, in a single transaction.
+        Returns a dict of `name` to id.
+        """
+        ids = bulk_upsert(DataSource, rows, 'name')
+        DataSourceService.clear_latest_version_cache()
+        return ids
+
+    @staticmethod
+    def update_data_sources(rows):
+        """
+        Updates data sources by id, each row being a dict with `id` and the columns to update, in a single transaction.
+        """
+        count = bulk_update(DataSource, rows)
+        DataSourceService.clear_latest_version_cache()
+        return count
+
+    @staticmethod
+    def get_data_sources_by_ids(ids):
+        return get_by_ids(DataSource, ids, options=[joinedload(DataSource.latest_version)])
@@ -1,40 +1,65 @@
 # BogoInsight/services/data_version_service.py
 from BogoInsight.models.data_version import DataVersion
-from BogoInsight.database.session import Session
+from BogoInsight.database.session import session_scope
+from BogoInsight.services.bulk_utils import bulk_create, bulk_update, bulk_upsert, get_by_ids
 
 class DataVersionService:
     @staticmethod
     def create_data_version(data_version):
-        session = Session()
-        session.add(data_version)
-        session.commit()
-        session.refresh(data_version)
+        with session_scope() as session:
+            session.add(data_version)
+            session.flush()
+            session.refresh(data_version)
         return data_version
 
     @staticmethod
     def get_data_version(id):
-        session = Session()
-        data_version = session.query(DataVersion).get(id)
+        with session_scope() as session:
+            data_version = session.query(DataVersion).get(id)
         return data_version
 
     @staticmethod
     def get_data_versions(limit=None, offset=None):
-        session = Session()
-        data_versions = session.query(DataVersion).limit(limit).offset(offset).all()
+        with session_scope() as session:
+            data_versions = session.query(DataVersion).limit(limit).offset(offset).all()
         return data_versions
 
     @staticmethod
     def update_data_version(id, data_version_update):
-        session = Session()
-        data_version = session.query(DataVersion).get(id)
-        for key, value in data_version_update.items():
-            setattr(data_version, key, value)
-        session.commit()
+        with session_scope() as session:
+            data_version = session.query(DataVersion).get(id)
+            for key, value in data_version_update.items():
+                setattr(data_version, key, value)
         return data_version
 
     @staticmethod
     def delete_data_version(id):
-        session = Session()
-        data_version = session.query(DataVersion).get(id)
-        session.delete(data_version)
-        session.commit()
\ No newline at end of file
+        with session_scope() as session:
+            data_version = session.query(DataVersion).get(id)
+            session.delete(data_version)
+
+    @staticmethod
+    def create_data_versions(rows):
+        """
+        Inserts data versions from dicts of column values in a single transaction.
+        """
+        return bulk_create(DataVersion, rows)
+
+    @staticmethod
+    def upsert_data_versions(rows):
+        """
+        Inserts data versions, or updates the ones with the same `file_path`, in a single transaction.
+        Returns a dict of `file_path` to id.
+        """
+        return bulk_upsert(DataVersion, rows, 'file_path')
+
+    @staticmethod
+    def update_data_versions(rows):
+        """
+        Updates data versions by id, each row being a dict with `id` and the columns to update, in a single transaction.
+        """
+        return bulk_update(DataVersion, rows)
+
+    @staticmethod
+    def get_data_versions_by_ids(ids):
+        return get_by_ids(DataVersion, ids)
@@ -1,40 +1,65 @@
 # BogoInsight/services/topic_service.py
 from BogoInsight.models.topic import Topic
-from BogoInsight.database.session import Session
+from BogoInsight.database.session import session_scope
+from BogoInsight.services.bulk_utils import bulk_create, bulk_update, bulk_upsert, get_by_ids
 
 class TopicService:
     @staticmethod
     def create_topic(topic):
-        session = Session()
-        session.add(topic)
-        session.commit()
-        session.refresh(topic)
+        with session_scope() as session:
+            session.add(topic)
+            session.flush()
+            session.refresh(topic)
         return topic
 
     @staticmethod
     def get_topic(id):
-        session = Session()
-        topic = session.query(Topic).get(id)
+        with session_scope() as session:
+            topic = session.query(Topic).get(id)
         return topic
 
     @staticmethod
     def get_topics(limit=None, offset=None):
-        session = Session()
-        topics = session.query(Topic).limit(limit).offset(offset).all()
+        with session_scope() as session:
+            topics = session.query(Topic).limit(limit).offset(offset).all()
         return topics
 
     @staticmethod
     def update_topic(id, topic_update):
-        session = Session()
-        topic = session.query(Topic).get(id)
-        for key, value in topic_update.items():
-            setattr(topic, key, value)
-        session.commit()
+        with session_scope() as session:
+            topic = session.query(Topic).get(id)
+            for key, value in topic_update.items():
+                setattr(topic, key, value)
         return topic
 
     @staticmethod
     def delete_topic(id):
-        session = Session()
-        topic = session.query(Topic).get(id)
-        session.delete(topic)
-        session.commit()
\ No newline at end of file
+        with session_scope() as session:
+            topic = session.query(Topic).get(id)
+            session.delete(topic)
+
+    @staticmethod
+    def create_topics(rows):
+        """
+        Inserts topics from dicts of column values in a single transaction.
+        """
+        return bulk_create(Topic, rows)
+
+    @staticmethod
+    def upsert_topics(rows):
+        """
+        Inserts topics, or updates the ones with the same `name`, in a single transaction.
+        Returns a dict of `name` to id.
+        """
+        return bulk_upsert(Topic, rows, 'name')
+
+    @staticmethod
+    def update_topics(rows):
+        """
+        Updates topics by id, each row being a dict with `id` and the columns to update, in a single transaction.
+        """
+        return bulk_update(Topic, rows)
+
+    @staticmethod
+    def get_topics_by_ids(ids):
+        return get_by_ids(Topic, ids)
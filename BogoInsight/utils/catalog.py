@@ -0,0 +1,288 @@
+"""
+Persistent index of the exported data, stored in `data/catalog.json`:
+
+{
+    "categories": {
+        "<category>": {
+            "latest": "<version>",
+            "versions": {
+                "<version>": {"path": "<category>/<version>.csv", "rows": ..., "columns": [...],
+                              "start": ..., "end": ..., "updated_at": ...}
+            }
+        }
+    }
+}
+
+Paths are relative to the data directory. Exports update it with `record_export()`,
+and it is rebuilt by scanning the data directory if it's missing or unreadable.
+Exports it's missing, e.g. written with `export_csv()` only or copied in by hand, are added on the next
+`record_export()`, or with `python utils/catalog.py --sync`.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    # no cross-process locking on Windows
+    fcntl = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from BogoInsight.utils.logger import logger
+
+# default data directory, i.e. BogoInsight/data
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data'))
+CATALOG_FILE = 'catalog.json'
+
+_lock = threading.Lock()
+
+
+def get_catalog_path(data_dir=DATA_DIR):
+    return os.path.join(data_dir, CATALOG_FILE)
+
+
+def _get_time_range(df):
+    if not isinstance(df.index, pd.DatetimeIndex) and df.index.name != 'period':
+        return None, None
+    index = pd.to_datetime(df.index, errors='coerce').dropna()
+    if index.empty:
+        return None, None
+    return index.min().strftime('%Y-%m-%d'), index.max().strftime('%Y-%m-%d')
+
+
+def describe_df(df):
+    """
+    Returns the catalog fields describing an exported DataFrame, with its index as the first column.
+    """
+    start, end = _get_time_range(df)
+    return {
+        'rows': len(df),
+        'columns': [df.index.name] + [str(c) for c in df.columns],
+        'start': start,
+        'end': end,
+    }
+
+
+def _read_export(path):
+    parquet_path = f'{os.path.splitext(path)[0]}.parquet'
+    if os.path.exists(parquet_path):
+        try:
+            return pd.read_parquet(parquet_path)
+        except ImportError:
+            pass
+    df = pd.read_csv(path)
+    return df.set_index(df.columns[0])
+
+
+def _make_entry(category, version, df):
+    return {
+        'path': f'{category}/{version}.csv',
+        **describe_df(df),
+        'updated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def _add_entry(catalog, category, version, entry):
+    category_entry = catalog['categories'].setdefault(category, {'latest': None, 'versions': {}})
+    category_entry['versions'][version] = entry
+    if category_entry['latest'] is None or version > category_entry['latest']:
+        category_entry['latest'] = version
+
+
+def scan_data_dir(data_dir=DATA_DIR):
+    """
+    Builds a catalog by reading every exported CSV file in the data directory.
+    """
+    catalog = {'categories': {}}
+    for category in sorted(os.listdir(data_dir)):
+        category_dir = os.path.join(data_dir, category)
+        if not os.path.isdir(category_dir):
+            continue
+        for file in sorted(os.listdir(category_dir)):
+            if not file.endswith('.csv'):
+                continue
+            version = file[:-len('.csv')]
+            try:
+                df = _read_export(os.path.join(category_dir, file))
+            except Exception as e:
+                logger.warning(f"Skipped unreadable export {category}/{file}: {e}")
+                continue
+            _add_entry(catalog, category, version, _make_entry(category, version, df))
+    return catalog
+
+
+def _write_catalog(catalog, data_dir):
+    path = get_catalog_path(data_dir)
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(catalog, f, indent=2)
+    os.replace(f'{path}.tmp', path)
+
+
+class _CatalogLock:
+    """
+    Serializes catalog updates between threads, and between processes where `fcntl` is available.
+    """
+
+    def __init__(self, data_dir):
+        self.lock_path = f'{get_catalog_path(data_dir)}.lock'
+        self.lock_file = None
+
+    def __enter__(self):
+        _lock.acquire()
+        if fcntl is not None:
+            self.lock_file = open(self.lock_path, 'w')
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        if self.lock_file is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+            self.lock_file.close()
+        _lock.release()
+
+
+def _read_catalog(data_dir):
+    with open(get_catalog_path(data_dir), 'r') as f:
+        catalog = json.load(f)
+    if not isinstance(catalog.get('categories'), dict):
+        raise ValueError('Malformed catalog')
+    return catalog
+
+
+def rebuild_catalog(data_dir=DATA_DIR):
+    """
+    Rebuilds the catalog from the data directory and writes it.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    with _CatalogLock(data_dir):
+        catalog = scan_data_dir(data_dir)
+        _write_catalog(catalog, data_dir)
+    logger.info(f"Rebuilt data catalog of {len(catalog['categories'])} categories.")
+    return catalog
+
+
+def load_catalog(data_dir=DATA_DIR):
+    """
+    Returns the catalog, rebuilding it if it's missing or unreadable.
+    """
+    try:
+        return _read_catalog(data_dir)
+    except (FileNotFoundError, ValueError) as e:
+        logger.warning(f"Data catalog unavailable ({e}), rebuilding.")
+        return rebuild_catalog(data_dir)
+
+
+def _list_versions(data_dir):
+    """
+    Returns the versions of the exported CSV files of each category on disk.
+    """
+    versions = {}
+    for category in os.listdir(data_dir):
+        category_dir = os.path.join(data_dir, category)
+        if os.path.isdir(category_dir):
+            versions[category] = {file[:-len('.csv')] for file in os.listdir(category_dir) if file.endswith('.csv')}
+    return versions
+
+
+def _sync_versions(catalog, data_dir):
+    """
+    Adds the exports on disk missing from the catalog and drops those removed from disk.
+    Returns whether the catalog changed.
+    """
+    disk_versions = _list_versions(data_dir)
+    changed = False
+    for category in list(catalog['categories']):
+        if category not in disk_versions:
+            del catalog['categories'][category]
+            changed = True
+    for category, versions in sorted(disk_versions.items()):
+        known_versions = set(catalog['categories'].get(category, {}).get('versions', {}))
+        for version in sorted(versions - known_versions):
+            try:
+                df = _read_export(os.path.join(data_dir, category, f'{version}.csv'))
+            except Exception as e:
+                logger.warning(f"Skipped unreadable export {category}/{version}.csv: {e}")
+                continue
+            _add_entry(catalog, category, version, _make_entry(category, version, df))
+            changed = True
+        if category in catalog['categories'] and known_versions - versions:
+            _prune_category(catalog, category, data_dir)
+            changed = True
+    return changed
+
+
+def sync_catalog(data_dir=DATA_DIR):
+    """
+    Syncs the catalog with the exports on disk, e.g. copied in by hand, and writes it if it changed.
+    Returns the synced catalog.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    with _CatalogLock(data_dir):
+        try:
+            catalog = _read_catalog(data_dir)
+        except (FileNotFoundError, ValueError):
+            catalog = {'categories': {}}
+        if _sync_versions(catalog, data_dir):
+            _write_catalog(catalog, data_dir)
+            logger.info("Synced data catalog with the exports on disk.")
+    return catalog
+
+
+def record_export(path, df):
+    """
+    Records an exported CSV file, i.e. `{data_dir}/{category}/{version}.csv`, with the DataFrame it was exported from.
+    """
+    path = os.path.abspath(path)
+    category_dir = os.path.dirname(path)
+    data_dir = os.path.dirname(category_dir)
+    category = os.path.basename(category_dir)
+    version = os.path.splitext(os.path.basename(path))[0]
+    entry = _make_entry(category, version, df)
+    with _CatalogLock(data_dir):
+        try:
+            catalog = _read_catalog(data_dir)
+        except (FileNotFoundError, ValueError):
+            # build from what's on disk, which already includes this export
+            catalog = scan_data_dir(data_dir)
+        _add_entry(catalog, category, version, entry)
+        # also pick up exports that weren't recorded, and drop removed ones
+        _sync_versions(catalog, data_dir)
+        _write_catalog(catalog, data_dir)
+
+
+def _prune_category(catalog, category, data_dir):
+    # drop versions removed from disk, e.g. by crawlers that only keep their latest export
+    category_entry = catalog['categories'][category]
+    existing_files = set(os.listdir(os.path.join(data_dir, category)))
+    category_entry['versions'] = {
+        version: entry for version, entry in category_entry['versions'].items()
+        if f'{version}.csv' in existing_files
+    }
+    category_entry['latest'] = max(category_entry['versions'], default=None)
+
+
+def get_latest_entry(catalog, category):
+    """
+    Returns the latest version entry of a category, or None if the category is not in the catalog.
+    """
+    category_entry = catalog['categories'].get(category)
+    if not category_entry or not category_entry['latest']:
+        return None
+    return category_entry['versions'][category_entry['latest']]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Rebuild the data catalog, or sync it with the exports on disk.')
+    parser.add_argument('data_dir', nargs='?', default=DATA_DIR, help='data directory')
+    parser.add_argument('--sync', action='store_true', help='only add missing exports and drop removed ones')
+    args = parser.parse_args()
+
+    catalog = sync_catalog(args.data_dir) if args.sync else rebuild_catalog(args.data_dir)
+    for category, category_entry in catalog['categories'].items():
+        print(f"{category}: {len(category_entry['versions'])} versions, latest {category_entry['latest']}")
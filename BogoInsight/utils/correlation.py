@@ -0,0 +1,121 @@
+"""
+Pairwise Pearson correlation from prefix sums.
+
+`CorrelationStats` scans a DataFrame once, keeping for every pair of numeric columns the count, sums,
+sums of squares and cross products of the rows where both are present, as prefix sums over blocks of rows.
+The correlation matrix of any subset of columns over any range of rows is then answered from
+the difference of two prefixes plus the rows of at most two partial blocks, independently of the range's length,
+with the same result as `df.corr()`.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# rows per block of the prefix sums, trading memory for the rows scanned at the ends of a range
+BLOCK_SIZE = 32
+# relative variance below which a column is taken as constant
+VARIANCE_TOLERANCE = 1e-10
+
+
+def _pair_stats(values, present):
+    """
+    Returns the count, sum, sum of squares and sum of products of each pair of columns (x, y),
+    over the rows where both are present. The leading axes, e.g. blocks, are kept.
+    """
+    values_t = np.swapaxes(values, -1, -2)
+    return (
+        np.swapaxes(present, -1, -2) @ present,
+        values_t @ present,
+        (values_t ** 2) @ present,
+        values_t @ values,
+    )
+
+
+class CorrelationStats:
+
+    def __init__(self, df, block_size=BLOCK_SIZE):
+        numeric_df = df.select_dtypes(include=['number', 'bool'])
+        self.index = df.index
+        self.columns = list(numeric_df.columns)
+        self.block_size = block_size
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+
+        values = numeric_df.to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        # centered on the column means, so that the sums stay small and the variance doesn't cancel out
+        self._values = np.where(present, values - numeric_df.mean().to_numpy(dtype=float), 0)
+        self._present = present.astype(float)
+
+        # padded with absent rows to whole blocks
+        num_blocks = -(-len(values) // block_size)
+        padding = ((0, num_blocks * block_size - len(values)), (0, 0))
+        shape = (num_blocks, block_size, len(self.columns))
+        block_stats = _pair_stats(np.pad(self._values, padding).reshape(shape), np.pad(self._present, padding).reshape(shape))
+        # [i, x, y] holds the sum of the blocks before block i
+        self._prefix_stats = [self._prefix_sum(stats) for stats in block_stats]
+
+    @staticmethod
+    def _prefix_sum(stats):
+        prefix = np.zeros((stats.shape[0] + 1,) + stats.shape[1:])
+        np.cumsum(stats, axis=0, out=prefix[1:])
+        return prefix
+
+    def _window_stats(self, column_positions, start, stop):
+        first_block = -(-start // self.block_size)
+        last_block = stop // self.block_size
+        if first_block >= last_block:
+            # within a single block
+            return _pair_stats(self._values[start:stop, column_positions], self._present[start:stop, column_positions])
+        ix = np.ix_(column_positions, column_positions)
+        stats = [prefix[last_block][ix] - prefix[first_block][ix] for prefix in self._prefix_stats]
+        for row_start, row_stop in [(start, first_block * self.block_size), (last_block * self.block_size, stop)]:
+            if row_start < row_stop:
+                rows = _pair_stats(self._values[row_start:row_stop, column_positions],
+                                   self._present[row_start:row_stop, column_positions])
+                stats = [a + b for a, b in zip(stats, rows)]
+        return stats
+
+    def corr(self, columns=None, start=0, stop=None):
+        """
+        Returns the correlation matrix of the rows in positions [start, stop), like `df.iloc[start:stop][columns].corr()`.
+        Non-numeric columns are left out.
+        """
+        if columns is None:
+            columns = self.columns
+        columns = [column for column in columns if column in self._positions]
+        stop = len(self.index) if stop is None else stop
+        count, sum_x, sum_sq_x, sum_prod = self._window_stats([self._positions[column] for column in columns], start, stop)
+        # statistics of y over the same rows are those of the transposed pair
+        sum_y = sum_x.T
+        sum_sq_y = sum_sq_x.T
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = count * sum_prod - sum_x * sum_y
+            var_x = count * sum_sq_x - sum_x ** 2
+            var_y = count * sum_sq_y - sum_y ** 2
+            corr = cov / np.sqrt(var_x * var_y)
+        # columns constant over the window have no correlation, allowing for rounding errors of the sums
+        constant = (var_x <= VARIANCE_TOLERANCE * count * sum_sq_x) | (var_y <= VARIANCE_TOLERANCE * count * sum_sq_y)
+        corr[(count < 1) | constant | ~np.isfinite(corr)] = np.nan
+        corr = np.clip(corr, -1, 1)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+    def corr_between(self, start_label, end_label, columns=None):
+        """
+        Returns the correlation matrix of the rows from `start_label` to `end_label` of a sorted index, both included,
+        like `df.loc[start_label:end_label][columns].corr()`.
+        """
+        window = self.index.slice_indexer(start_label, end_label)
+        return self.corr(columns, window.start or 0, window.stop)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _get_correlation_stats(name, data_version, _df):
+    return CorrelationStats(_df)
+
+def get_correlation_stats(df, name, data_version):
+    """
+    Returns the `CorrelationStats` of a DataFrame, shared by all sessions until its data version changes.
+    `name` identifies the DataFrame, and `data_version` its content, e.g. `get_data_stamp()` of its file.
+    """
+    return _get_correlation_stats(name, data_version, df)
@@ -1,36 +1,212 @@
 import os
+import threading
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from BogoInsight.utils.catalog import get_catalog_path, get_latest_entry, load_catalog
+
+# data folder, relative to the app's working directory
+DATA_DIR = 'data'
+# where latest versions are looked up: 'file' for the data catalog, 'db' for the data source services
+CATALOG_BACKEND = os.getenv('BOGO_CATALOG', 'file')
+
+# last seen stamp of each cached call, so that its entry is evicted once the underlying files change
+_seen_stamps = {}
+_seen_stamps_lock = threading.Lock()
+
+def _stat_stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def get_data_stamp(path):
+    """
+    Returns a version stamp of a data file, changing whenever the file or its Parquet sibling is rewritten.
+    Use it as an argument of cached functions reading the file.
+    """
+    return (_stat_stamp(path), _stat_stamp(f'{os.path.splitext(path)[0]}.parquet'))
+
+def _get_dir_stamp(path):
+    # a directory's mtime changes when files are added or removed
+    return _stat_stamp(path)
+
+def _call_cached(func, stamp, *args):
+    """
+    Calls a cached function with the stamp as its first argument,
+    evicting the entry of the previous stamp of the same arguments if it changed.
+    """
+    key = (func.__name__, repr(args))
+    with _seen_stamps_lock:
+        previous_stamp = _seen_stamps.get(key)
+        _seen_stamps[key] = stamp
+    if previous_stamp is not None and previous_stamp != stamp:
+        func.clear(previous_stamp, *args)
+    return func(stamp, *args)
+
+def _to_data_source(category, version, path):
+    return {
+        'category': category.replace('_', ' ').title(),
+        'name': version,
+        'path': path,
+    }
+
 @st.cache_data
+def _load_catalog(stamp):
+    return load_catalog(DATA_DIR)
+
+def get_catalog():
+    """
+    Returns the data catalog, cached until `catalog.json` is rewritten.
+    """
+    return _call_cached(_load_catalog, _stat_stamp(get_catalog_path(DATA_DIR)))
+
 def get_data_sources():
-    # read data from data/ folder
+    """
+    Lists every version of every category, from the data catalog.
+    """
     data_sources = []
-    for category in os.listdir('data'):
-        for file in os.listdir(f'data/{category}'):
-            if file.endswith('.csv'):
-                data_sources.append({
-                    'category': category.replace('_', ' ').title(),
-                    'name': file.replace('.csv', ''),
-                    'path': f'data/{category}/{file}'
-                })
+    for category, category_entry in sorted(get_catalog()['categories'].items()):
+        for version, entry in sorted(category_entry['versions'].items()):
+            data_sources.append(_to_data_source(category, version, f"{DATA_DIR}/{entry['path']}"))
     return data_sources
 
 @st.cache_data
-def get_latest_data_source(category):
+def _get_latest_data_source(stamp, category):
     data_source = None
-    for file in os.listdir(f'data/{category}'):
+    for file in os.listdir(f'{DATA_DIR}/{category}'):
         if file.endswith('.csv'):
             if data_source is None or file > data_source.get('name', ''):
-                data_source = {
-                    'category': category.replace('_', ' ').title(),
-                    'name': file.replace('.csv', ''),
-                    'path': f'data/{category}/{file}'
-                }
+                data_source = _to_data_source(category, file.replace('.csv', ''), f'{DATA_DIR}/{category}/{file}')
     if not data_source:
         raise FileNotFoundError(f"No data source found in category: {category}")
     return data_source
 
+def _get_latest_db_data_source(category):
+    # imported here, so that pages don't need the database unless it's enabled
+    from BogoInsight.services.data_source_service import DataSourceService
+    latest_version = DataSourceService.get_latest_version(category)
+    if latest_version is None or not os.path.exists(latest_version.file_path):
+        return None
+    return _to_data_source(category, latest_version.name, latest_version.file_path)
+
+def get_latest_data_source(category):
+    """
+    Returns the latest version of a category, looked up in the data catalog, or through the data source services
+    if `BOGO_CATALOG=db` is set, so that app replicas share one catalog.
+    Falls back to scanning the category folder if the catalog doesn't know it, e.g. for files copied in by hand.
+    """
+    if CATALOG_BACKEND == 'db':
+        data_source = _get_latest_db_data_source(category)
+        if data_source is not None:
+            return data_source
+    entry = get_latest_entry(get_catalog(), category)
+    if entry is not None and os.path.exists(f"{DATA_DIR}/{entry['path']}"):
+        return _to_data_source(category, os.path.splitext(os.path.basename(entry['path']))[0], f"{DATA_DIR}/{entry['path']}")
+    return _call_cached(_get_latest_data_source, _get_dir_stamp(f'{DATA_DIR}/{category}'), category)
+
+def reload_data():
+    """
+    Drops the cached data source listings, e.g. for a "Reload data" button.
+    Cached data frames don't need clearing, they are evicted once their files change.
+    """
+    _load_catalog.clear()
+    _get_latest_data_source.clear()
+    if CATALOG_BACKEND == 'db':
+        from BogoInsight.services.data_source_service import DataSourceService
+        DataSourceService.clear_latest_version_cache()
+
+def _downcast(df):
+    """
+    Downcasts numeric columns in place, floats only when no precision is lost.
+    """
+    for col in df.columns:
+        if pd.api.types.is_bool_dtype(df[col]):
+            continue
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        elif pd.api.types.is_float_dtype(df[col]) and df[col].dtype != np.float32:
+            downcast = df[col].astype(np.float32)
+            if ((downcast.astype(np.float64) == df[col]) | df[col].isna()).all():
+                df[col] = downcast
+    return df
+
+def _read_parquet(path, columns):
+    """
+    Reads a Parquet export with its stored index reset to a column, the same as `_read_csv()`.
+    """
+    if columns is not None:
+        # the stored index is always read, and can't be requested as a column
+        stored_index = pd.read_parquet(path, columns=[]).index.name
+        columns = [c for c in columns if c != stored_index]
+    df = pd.read_parquet(path, columns=columns)
+    df.columns.name = None
+    if df.index.name is None:
+        # an unnamed index is read from CSV as 'Unnamed: 0'
+        df.index.name = 'Unnamed: 0'
+    return df.reset_index()
+
+def _read_csv(path, columns):
+    """
+    Reads a CSV export, the first column being the exported index.
+    """
+    if columns is None:
+        return pd.read_csv(path)
+    index_column = pd.read_csv(path, nrows=0).columns[0]
+    return pd.read_csv(path, usecols=[index_column] + [c for c in columns if c != index_column])
+
+def read_df(path, columns=None, index_col=None, parse_dates=None, downcast=False):
+    """
+    Reads a data source as a DataFrame, without caching. Pages should use `load_df()` instead.
+    Prefers the typed Parquet file next to the CSV when present, so dates come back as datetimes.
+    A `period` column is always read as datetimes, so that both files give the same frame.
+    
+    Args:
+        path: path to the CSV file.
+        columns: columns to keep, all columns if None. The exported index is always read.
+        index_col: column to set as index. If None, the exported index is returned as a column.
+        parse_dates: columns to convert to datetime, if not already, besides `period`.
+        downcast: whether to downcast numeric columns to save memory.
+    """
+    read_columns = None
+    if columns is not None:
+        read_columns = list(columns) + ([index_col] if index_col and index_col not in columns else [])
+    df = None
+    parquet_path = f'{os.path.splitext(path)[0]}.parquet'
+    if os.path.exists(parquet_path):
+        try:
+            df = _read_parquet(parquet_path, read_columns)
+        except ImportError:
+            pass
+    if df is None:
+        df = _read_csv(path, read_columns)
+    parse_dates = list(parse_dates or [])
+    if 'period' in df.columns and 'period' not in parse_dates:
+        parse_dates.append('period')
+    for col in parse_dates:
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+    if columns is not None:
+        # the exported index comes first
+        keep = [df.columns[0]] + [c for c in columns if c != df.columns[0]]
+        if index_col is not None and index_col not in keep:
+            keep.append(index_col)
+        df = df[keep]
+    if index_col is not None:
+        df = df.set_index(index_col)
+    if downcast:
+        df = _downcast(df)
+    return df
+
 @st.cache_data
-def load_df(path):
-    return pd.read_csv(path)
\ No newline at end of file
+def _load_df(stamp, path, columns, index_col, parse_dates, downcast):
+    return read_df(path, columns=columns, index_col=index_col, parse_dates=parse_dates, downcast=downcast)
+
+def load_df(path, columns=None, index_col=None, parse_dates=None, downcast=False):
+    """
+    Loads a data source as a DataFrame, see `read_df()` for the arguments.
+    Cached by the file's version stamp, so a rewritten file is reloaded without clearing other caches.
+    """
+    return _call_cached(_load_df, get_data_stamp(path), path, columns, index_col, parse_dates, downcast)
@@ -0,0 +1,73 @@
+"""
+Declarative derived columns.
+
+A metric is a dict of `name` and `expr`, where `expr` is built from the helpers below,
+e.g. `{'name': 'P plan mortgage rate (% p.a.)', 'expr': sub(col('best lending rate (% p.a.)'), 1.75)}`.
+Every expression is evaluated on whole columns, and NaN in any operand gives NaN.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _eval(expr, df):
+    if callable(expr):
+        return expr(df)
+    # plain numbers are constants
+    return expr
+
+def col(name):
+    """
+    An input column, or a metric computed earlier in the same list.
+    """
+    return lambda df: df[name]
+
+def add(a, b):
+    return lambda df: _eval(a, df) + _eval(b, df)
+
+def sub(a, b):
+    return lambda df: _eval(a, df) - _eval(b, df)
+
+def mul(a, b):
+    return lambda df: _eval(a, df) * _eval(b, df)
+
+def ratio(a, b, scale=1):
+    """
+    `a / b * scale`, e.g. `scale=100` for a percentage.
+    """
+    return lambda df: _eval(a, df) / _eval(b, df) * scale
+
+def minimum(*exprs):
+    """
+    Element-wise minimum, NaN if any operand is NaN.
+    """
+    return lambda df: _reduce(np.minimum, exprs, df)
+
+def maximum(*exprs):
+    """
+    Element-wise maximum, NaN if any operand is NaN.
+    """
+    return lambda df: _reduce(np.maximum, exprs, df)
+
+def shift(expr, periods=1):
+    return lambda df: _eval(expr, df).shift(periods)
+
+def round_(expr, decimals=0):
+    return lambda df: _eval(expr, df).round(decimals)
+
+def _reduce(ufunc, exprs, df):
+    result = _eval(exprs[0], df)
+    for expr in exprs[1:]:
+        result = ufunc(result, _eval(expr, df))
+    return result
+
+def compute_metrics(df, metrics):
+    """
+    Returns a copy of `df` with the metrics added as columns, computed in order.
+    """
+    df = df.copy()
+    for metric in metrics:
+        values = _eval(metric['expr'], df)
+        if not isinstance(values, pd.Series):
+            values = pd.Series(values, index=df.index)
+        df[metric['name']] = values
+    return df
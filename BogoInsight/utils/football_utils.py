@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+
 NATION_CODE_MAP = {
     # Europe
     'England': 'gb-eng',
@@ -74,4 +77,54 @@ def get_nation_flag_html(nation):
     <div style="width: 50px; height: 50px; border-radius: 100%; overflow: hidden; display: inline-block; margin: 2px; box-shadow: 0 0 0 2px rgba(0, 0, 0, .08);">
         <img src="{url}" alt="{nation}" style="width: 100%; height: 100%; object-fit: cover; object-position: center;" />
     </div>
-    '''
\ No newline at end of file
+    '''
+
+# result categories of each match category, in display order
+MATCH_CATEGORY_RESULTS = {
+    'Underdog vs Seed': ['Underdog wins', 'Underdog/seed draw', 'Seed wins'],
+    'Balanced': ['Balanced no draw', 'Balanced draw'],
+}
+
+def classify_matches(df, seeded_teams):
+    """
+    Returns a copy of the matches with `match_category` and `result_category` columns,
+    given the seeded teams of each game, i.e. `{game: [team, ...]}`.
+    Only the result after regular time is considered, so a match with extra time counts as a draw.
+    """
+    seed_pairs = pd.MultiIndex.from_tuples(
+        [(game, team) for game, teams in seeded_teams.items() for team in teams], names=['game', 'team'])
+    home_is_seed = pd.MultiIndex.from_arrays([df['game'], df['home_team']]).isin(seed_pairs)
+    away_is_seed = pd.MultiIndex.from_arrays([df['game'], df['away_team']]).isin(seed_pairs)
+    is_underdog_vs_seed = home_is_seed != away_is_seed
+    has_extra_time = df['has_extra_time'].astype(bool).to_numpy()
+    home_wins = (df['home_score'] > df['away_score']).to_numpy()
+    seed_wins = np.where(home_is_seed, home_wins, ~home_wins)
+    
+    df = df.copy()
+    df['match_category'] = np.where(is_underdog_vs_seed, 'Underdog vs Seed', 'Balanced')
+    df['result_category'] = np.select(
+        [is_underdog_vs_seed & has_extra_time, is_underdog_vs_seed & seed_wins, is_underdog_vs_seed, has_extra_time],
+        ['Underdog/seed draw', 'Seed wins', 'Underdog wins', 'Balanced draw'],
+        'Balanced no draw')
+    return df
+
+def aggregate_matches(df, seeded_teams, game_names=None):
+    """
+    Counts the results of each match category per game, plus the sums across games as game 'All',
+    and the percentage of each result within its game and match category.
+    Every game has a row for each result category, with zero counts included.
+    """
+    if game_names is None:
+        game_names = df['game'].unique()
+    df = classify_matches(df, seeded_teams)
+    categories = [(match_cat, result_cat) for match_cat, result_cats in MATCH_CATEGORY_RESULTS.items() for result_cat in result_cats]
+    counts = df.groupby(['game', 'result_category']).size()
+    df_agg = pd.DataFrame(
+        [(game, match_cat, result_cat) for game in game_names for match_cat, result_cat in categories],
+        columns=['game', 'match_category', 'result_category'])
+    df_agg['count'] = counts.reindex(pd.MultiIndex.from_frame(df_agg[['game', 'result_category']]), fill_value=0).to_numpy()
+    df_all = df_agg.groupby(['match_category', 'result_category'], sort=False, as_index=False)['count'].sum()
+    df_all.insert(0, 'game', 'All')
+    df_agg = pd.concat([df_agg, df_all], ignore_index=True)
+    df_agg['percentage'] = df_agg['count'] / df_agg.groupby(['game', 'match_category'])['count'].transform('sum') * 100
+    return df_agg
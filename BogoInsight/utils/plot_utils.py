@@ -1,13 +1,88 @@
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+import streamlit as st
 
-def update_line_chart(fig):
+# width of a chart in pixels, i.e. Streamlit's default content width,
+# more points per trace than this can't be told apart
+DEFAULT_CHART_WIDTH = 700
+
+# per-point trace attributes, selected together with x and y when downsampling
+POINT_ATTRIBUTES = ['x', 'y', 'customdata', 'text', 'hovertext']
+
+# max number of cached figures, each combination of data version and inputs taking one entry
+MAX_CACHED_FIGURES = 256
+
+@st.cache_data(max_entries=MAX_CACHED_FIGURES, show_spinner=False)
+def _build_figure(name, data_version, inputs, _build_fn):
+    return _build_fn()
+
+def cached_figure(name, data_version, build_fn, **inputs):
+    """
+    Returns the figure built by `build_fn()`, reusing the cached one while the data version and inputs are unchanged.
+    `name` identifies the figure within the app, `data_version` is e.g. `get_data_stamp()` of the data it shows,
+    and `inputs` must hold every widget value `build_fn` depends on.
+    The figure is a copy, so it can be changed by the caller without affecting the cache.
+    """
+    return _build_figure(name, data_version, inputs, build_fn)
+
+def minmax_downsample_indices(y, max_points):
+    """
+    Returns the sorted indices of the points to keep, at most `max_points`:
+    the min and max of each of `max_points // 2` equal buckets, so that peaks and troughs are kept,
+    plus the first and last points.
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    num_buckets = max(1, (max_points - 2) // 2)
+    buckets = np.arange(n) * num_buckets // n
+    # sort by value within each bucket, the first is the min and the last is the max
+    order = np.lexsort((y, buckets))
+    bucket_starts = np.searchsorted(buckets[order], np.arange(num_buckets))
+    bucket_ends = np.append(bucket_starts[1:], n) - 1
+    return np.unique(np.concatenate([[0, n - 1], order[bucket_starts], order[bucket_ends]]))
+
+def downsample_traces(fig, max_points=DEFAULT_CHART_WIDTH):
+    """
+    Reduces line traces to at most `max_points` points each with min/max bucketing.
+    Missing values are dropped first for traces that connect gaps anyway.
+    Traces already short enough, or with non-numeric values, e.g. of text columns, are left as is.
+    """
+    for trace in fig.data:
+        if trace.type not in ['scatter', 'scattergl'] or trace.x is None or trace.y is None:
+            continue
+        if len(trace.y) <= max_points or len(trace.y) != len(trace.x):
+            continue
+        try:
+            y = np.asarray(trace.y, dtype=float)
+        except (TypeError, ValueError):
+            continue
+        valid = ~np.isnan(y)
+        if not valid.all() and not trace.connectgaps:
+            continue
+        indices = np.flatnonzero(valid)
+        indices = indices[minmax_downsample_indices(y[indices], max_points)]
+        if len(indices) == len(y):
+            continue
+        updates = {}
+        for attribute in POINT_ATTRIBUTES:
+            values = trace[attribute]
+            if values is not None and not isinstance(values, str) and len(values) == len(y):
+                updates[attribute] = np.asarray(values)[indices]
+        trace.update(updates)
+    return fig
+
+def update_line_chart(fig, max_points=DEFAULT_CHART_WIDTH):
     # add minor ticks and grid
     fig.update_xaxes(minor_ticks='inside', showgrid=True)
     # highlight yaxis at 0
     fig.update_yaxes(zeroline=True, zerolinewidth=2, zerolinecolor='LightPink')
     # connect gaps
     fig.update_traces(connectgaps=True)
+    # keep about one point per pixel, set max_points to None for full resolution
+    if max_points:
+        downsample_traces(fig, max_points)
     
 def gen_heatmap(corr_matrix, title):
     heatmap = px.imshow(corr_matrix, 
@@ -1,6 +1,14 @@
+import math
+import numpy as np
+import pandas as pd
 import streamlit as st
 from BogoInsight.configs.access import access_level
 
+# rows sent to the browser per page of a paginated table
+DEFAULT_PAGE_SIZE = 100
+# option of the sort & filter selectors standing for the index
+INDEX_OPTION = '(index)'
+
 
 def render_unlock_form():
     def handle_unlock():
@@ -16,4 +24,69 @@ def render_unlock_form():
    
     with st.form('unlock_form', border=False):
         pin = st.text_input('Please enter the secret pin!', type='password', key='unlock_pin')
-        submitted = st.form_submit_button('Unlock', on_click=handle_unlock)
\ No newline at end of file
+        submitted = st.form_submit_button('Unlock', on_click=handle_unlock)
+
+
+def _get_values(df, column):
+    # values of a column or the index, indexed by row position
+    values = df.index if column == INDEX_OPTION else df[column]
+    return pd.Series(np.asarray(values), copy=False)
+
+def _find_row_positions(df, filter_column, filter_text, sort_column, ascending):
+    """
+    Returns the positions of the rows whose `filter_column` contains `filter_text` (case-insensitive),
+    ordered by `sort_column` with missing values last.
+    """
+    positions = np.arange(len(df))
+    if filter_text:
+        mask = _get_values(df, filter_column).astype(str).str.contains(filter_text, case=False, regex=False)
+        positions = positions[mask.to_numpy()]
+    if sort_column is not None:
+        values = _get_values(df, sort_column).iloc[positions]
+        try:
+            values = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+        except TypeError:
+            # mixed types, e.g. numbers and strings in an object column
+            values = values.astype(str).sort_values(ascending=ascending, kind='stable')
+        positions = values.index.to_numpy()
+    return positions
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _get_row_positions(name, data_version, _df, filter_column, filter_text, sort_column, ascending):
+    return _find_row_positions(_df, filter_column, filter_text, sort_column, ascending)
+
+def render_paginated_table(df, key, data_version=None, page_size=DEFAULT_PAGE_SIZE, **dataframe_kwargs):
+    """
+    Shows a DataFrame one page of rows at a time, filtered and sorted on the server,
+    so that only the current page is sent to the browser.
+    `data_version` identifies the content of `df`, e.g. `get_data_stamp()` of its file,
+    and caches the filtered and sorted rows, which are otherwise recomputed on each run.
+    Other keyword arguments are passed to `st.dataframe`, e.g. `column_config`.
+    """
+    options = [INDEX_OPTION] + list(df.columns)
+    filter_col, text_col, sort_col, order_col = st.columns([2, 2, 2, 1])
+    filter_column = filter_col.selectbox('Filter by', options, format_func=str, key=f'{key}-filter-column')
+    filter_text = text_col.text_input('Containing', key=f'{key}-filter-text').strip()
+    sort_column = sort_col.selectbox('Sort by', [None] + options, format_func=lambda c: 'none' if c is None else str(c),
+                                     key=f'{key}-sort-column')
+    ascending = order_col.selectbox('Order', [True, False], format_func=lambda a: 'asc' if a else 'desc',
+                                    key=f'{key}-sort-order')
+
+    if data_version is None:
+        positions = _find_row_positions(df, filter_column, filter_text, sort_column, ascending)
+    else:
+        positions = _get_row_positions(key, data_version, df, filter_column, filter_text, sort_column, ascending)
+
+    page_count = max(math.ceil(len(positions) / page_size), 1)
+    page_key = f'{key}-page'
+    # the page may be out of range after filtering
+    if st.session_state.get(page_key, 1) > page_count:
+        st.session_state[page_key] = page_count
+    table = st.container()
+    page_col, caption_col = st.columns([1, 3])
+    page = page_col.number_input('Page', min_value=1, max_value=page_count, step=1, key=page_key)
+    start = (page - 1) * page_size
+    end = min(start + page_size, len(positions))
+    table.dataframe(df.iloc[positions[start:end]], **dataframe_kwargs)
+    caption_col.caption(f'Rows {start + 1 if end else 0}-{end} of {len(positions)}'
+                        + (f' (filtered from {len(df)})' if len(positions) != len(df) else ''))